@@ -1,20 +1,24 @@
 import streamlit as st
-import os
 import json
-import base64
-import io
-import pandas as pd
-import docx
-import PyPDF2
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import openai
-from datetime import datetime
-import re
-import csv
+import hashlib
+import html
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from llm_cache import LLMCache
+from meeting_history import MeetingHistory, guess_meeting_date, meeting_key
+from email_outbox import EmailOutbox, OutboxSender
+from live_meeting import LiveMeeting
+import meeting_analysis
+from meeting_analysis import extract_tasks_and_assign, stream_meeting_summary
+from meeting_files import get_file_extension, read_participants_bytes, read_transcript_bytes
+from roster_index import RosterIndex
+from email_templates import build_participant_email, group_recipients
+from gmail_auth import CredentialStore, is_token_unusable
+from gmail_delivery import DEFAULT_MAX_WORKERS, build_gmail_service, build_raw_message
+import telemetry
+from telemetry import span
 
 # Set page configuration
 st.set_page_config(
@@ -86,6 +90,14 @@ SCOPES = ['https://www.googleapis.com/auth/gmail.readonly',
           'https://www.googleapis.com/auth/gmail.send']
 CREDENTIALS_FILE = "credentials.json"
 TOKEN_FILE = "token.json"
+LLM_CACHE_FILE = "llm_cache.sqlite3"
+HISTORY_FILE = "meeting_history.sqlite3"
+OUTBOX_FILE = "email_outbox.sqlite3"
+# How long the Send Emails tab follows a send before leaving it to the background sender
+OUTBOX_WATCH_SECONDS = 600
+# Tracing is on by default; MEETING_TELEMETRY=off disables it, MEETING_TRACE_FILE moves
+# the trace file, and METRICS_PORT serves Prometheus metrics at http://127.0.0.1:<port>/metrics
+TRACE_FILE = os.environ.get("MEETING_TRACE_FILE", "traces.jsonl")
 
 # Initialize session state variables
 if 'authenticated' not in st.session_state:
@@ -104,12 +116,91 @@ if 'participants' not in st.session_state:
     st.session_state.participants = None
 if 'summary' not in st.session_state:
     st.session_state.summary = None
+if 'summary_error' not in st.session_state:
+    st.session_state.summary_error = None
 if 'tasks' not in st.session_state:
     st.session_state.tasks = None
+if 'analysis_timings' not in st.session_state:
+    st.session_state.analysis_timings = None
+if 'transcript_name' not in st.session_state:
+    st.session_state.transcript_name = None
+if 'meeting_id' not in st.session_state:
+    st.session_state.meeting_id = None
+if 'live_meeting' not in st.session_state:
+    st.session_state.live_meeting = None
+if 'uploader_generation' not in st.session_state:
+    st.session_state.uploader_generation = 0
+
+# LLM backend: the OpenAI API by default. LLM_BASE_URL, LLM_MODEL and LLM_MAX_CONCURRENCY
+# (environment or secrets) point it at another OpenAI-compatible server, such as
+# llm_stub_server.py for offline load tests. openai is only imported, and the
+# client only built, the first time an analysis runs. The one backend is shared by
+# every session: its connection pool and concurrency cap are process-wide, and
+# attendees analyzing the same transcript at once share its calls (LLM_COALESCE=off
+# turns that off).
+@st.cache_resource
+def get_llm_backend():
+    from llm_backend import backend_from_env
+    settings = {
+        name: st.secrets[name]
+        for name in ("LLM_BASE_URL", "LLM_MODEL", "LLM_MAX_CONCURRENCY", "LLM_COALESCE") if name in st.secrets
+    }
+    return backend_from_env(api_key=st.secrets.get("key"), environ={**settings, **os.environ})
+
+# Shared across all sessions so repeat analyses of the same meeting skip the API
+@st.cache_resource
+def get_llm_cache():
+    return LLMCache(LLM_CACHE_FILE)
+
+llm_cache = get_llm_cache()
+
+# Every analyzed meeting is kept here, so past results reopen without calling the model
+@st.cache_resource
+def get_meeting_history():
+    return MeetingHistory(HISTORY_FILE)
+
+meeting_history = get_meeting_history()
+
+def open_saved_meeting(meeting_id):
+    meeting = meeting_history.load_meeting(meeting_id)
+    if meeting is None:
+        return False
+    st.session_state.transcript_content = meeting['transcript']
+    st.session_state.transcript_name = meeting['title']
+    st.session_state.participants = meeting['participants']
+    st.session_state.summary = meeting['summary']
+    st.session_state.summary_error = None
+    st.session_state.tasks = meeting['tasks']
+    st.session_state.analysis_timings = None
+    st.session_state.meeting_id = meeting['id']
+    # New uploader keys empty the upload widgets, so files still sitting in them
+    # can't overwrite the opened meeting's transcript and participants on a rerun
+    st.session_state.uploader_generation += 1
+    return True
 
-# OpenAI API key setup (use a more secure approach in production)
-openai_api_key = st.secrets["key"]
-client = openai.OpenAI(api_key=openai_api_key)
+# Start and end timestamps for the history tab's period filter
+def period_bounds(period):
+    now = datetime.now()
+    if period == "Last 7 days":
+        return (now - timedelta(days=7)).timestamp(), None
+    if period == "Last 30 days":
+        return (now - timedelta(days=30)).timestamp(), None
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if period == "This month":
+        return month_start.timestamp(), None
+    if period == "Last month":
+        previous_start = (month_start - timedelta(days=1)).replace(day=1)
+        return previous_start.timestamp(), month_start.timestamp()
+    return None, None
+
+# Configured once per process; the metrics server, if any, lives as long as the app
+@st.cache_resource
+def setup_telemetry():
+    telemetry.configure(trace_path=TRACE_FILE)
+    metrics_port = os.environ.get("METRICS_PORT")
+    return telemetry.start_metrics_server(int(metrics_port)) if metrics_port else None
+
+setup_telemetry()
 
 # Gmail API credentials
 gmail_credentials = {
@@ -131,6 +222,8 @@ def save_credentials():
 
 # Modified authentication function to use the Streamlit UI
 def start_auth_flow():
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    
     save_credentials()
     # Create a flow instance with the redirect URI set to localhost:8501
     flow = InstalledAppFlow.from_client_secrets_file(
@@ -140,10 +233,11 @@ def start_auth_flow():
     )
     
     # Generate the authorization URL
-    auth_url, _ = flow.authorization_url(
-        access_type='offline',
-        include_granted_scopes='true'
-    )
+    with span("oauth.authorization_url"):
+        auth_url, _ = flow.authorization_url(
+            access_type='offline',
+            include_granted_scopes='true'
+        )
     
     # Store the flow in the session state
     st.session_state.flow = flow
@@ -175,51 +269,45 @@ def complete_auth_flow(code):
             st.error("Authentication flow not initialized. Please start authentication process again.")
             return None
             
-        st.session_state.flow.fetch_token(code=code)
+        with span("oauth.exchange_code"):
+            st.session_state.flow.fetch_token(code=code)
         creds = st.session_state.flow.credentials
         
         # Save the credentials for future use
-        with open(TOKEN_FILE, "w") as token:
-            token.write(creds.to_json())
+        get_credential_store().save(creds)
         
         return creds
     except Exception as e:
         st.error(f"Error completing authentication: {str(e)}")
         return None
 
-# Check if token exists and is valid
+# One credential store per process, so every session shares the parsed token
+# and refreshes happen once rather than per session
+@st.cache_resource
+def get_credential_store():
+    return CredentialStore(TOKEN_FILE, SCOPES)
+
+# Check if token exists and is valid, refreshing it with the stored refresh token if needed
 def get_credentials():
-    if os.path.exists(TOKEN_FILE):
-        try:
-            creds = Credentials.from_authorized_user_info(
-                json.loads(open(TOKEN_FILE).read())
-            )
-            if not creds.expired:
-                return creds
-        except Exception as e:
-            st.error(f"Error loading credentials: {str(e)}")
-            if os.path.exists(TOKEN_FILE):
-                os.remove(TOKEN_FILE)
+    try:
+        return get_credential_store().get()
+    except Exception as e:
+        st.error(f"Error loading credentials: {str(e)}")
+        # Network errors and the like are temporary, so only an unusable token is removed
+        if is_token_unusable(e):
+            get_credential_store().clear()
     return None
 
 # Get Gmail service
 def get_gmail_service():
     creds = get_credentials()
     if creds:
-        return build('gmail', 'v1', credentials=creds)
+        return build_gmail_service(creds)
     return None
 
 # Send an email
 def send_email(service, to, subject, body_html):
-    message = MIMEMultipart('alternative')
-    message['to'] = to
-    message['subject'] = subject
-    
-    # Create HTML part
-    html_part = MIMEText(body_html, 'html')
-    message.attach(html_part)
-    
-    raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
+    raw_message = build_raw_message(to, subject, body_html)
     
     try:
         sent_message = service.users().messages().send(
@@ -230,373 +318,97 @@ def send_email(service, to, subject, body_html):
     except Exception as e:
         return False, str(e)
 
+# Each delivery worker thread needs its own Gmail client, since they aren't thread-safe
+def get_gmail_service_factory():
+    creds = get_credentials()
+    if creds:
+        return (lambda: build_gmail_service(creds)), DEFAULT_MAX_WORKERS
+    # Without stored credentials fall back to the session's client on a single worker
+    service = st.session_state.service
+    return (lambda: service), 1
+
+# Emails go through a durable outbox drained by one background sender per process, so
+# a rerun, a closed tab or a restart never loses or duplicates a message
+@st.cache_resource
+def get_email_outbox():
+    return EmailOutbox(OUTBOX_FILE)
+
+# Started with the stored credentials, if any, so messages left over from before a
+# restart are sent without waiting for someone to click Send again
+@st.cache_resource
+def get_outbox_sender():
+    creds = get_credentials()
+    service_factory = (lambda: build_gmail_service(creds)) if creds else None
+    sender = OutboxSender(get_email_outbox(), service_factory, max_workers=DEFAULT_MAX_WORKERS).start()
+    sender.wake()
+    return sender
+
+email_outbox = get_email_outbox()
+outbox_sender = get_outbox_sender()
+
+# Parsed uploads are memoized by content hash, so reruns don't re-parse the same file
+PARSE_CACHE_ENTRIES = 32
+
+# Return the extension, content hash and raw bytes of an uploaded file
+def get_upload_info(uploaded_file):
+    data = uploaded_file.getvalue()
+    file_extension = get_file_extension(uploaded_file.name)
+    return file_extension, hashlib.sha256(data).hexdigest(), data
+
+# The leading underscore keeps Streamlit from hashing the bytes; content_hash is the key
+@st.cache_data(max_entries=PARSE_CACHE_ENTRIES, show_spinner=False)
+def parse_transcript(file_extension, content_hash, _data):
+    return read_transcript_bytes(file_extension, _data)
+
 # Function to read transcript from uploaded file
 def read_transcript(uploaded_file):
     if uploaded_file is None:
         return None
     
-    file_extension = uploaded_file.name.split('.')[-1].lower()
-    content = ""
-    
     try:
-        if file_extension == 'txt':
-            content = uploaded_file.getvalue().decode('utf-8')
-        elif file_extension == 'docx':
-            doc = docx.Document(io.BytesIO(uploaded_file.getvalue()))
-            content = "\n".join([para.text for para in doc.paragraphs])
-        elif file_extension == 'pdf':
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(uploaded_file.getvalue()))
-            for page_num in range(len(pdf_reader.pages)):
-                content += pdf_reader.pages[page_num].extract_text() + "\n"
-        else:
-            return None
-        
-        return content
+        return parse_transcript(*get_upload_info(uploaded_file))
     except Exception as e:
         st.error(f"Error reading file: {str(e)}")
         return None
 
+# Format problems raise ValueError with a message meant for the user
+@st.cache_data(max_entries=PARSE_CACHE_ENTRIES, show_spinner=False)
+def parse_participants(file_extension, content_hash, _data):
+    return read_participants_bytes(file_extension, _data)
+
 # Function to read participants from uploaded file - FIXED to properly handle CSV parsing
 def read_participants(uploaded_file):
     if uploaded_file is None:
         return None
     
-    file_extension = uploaded_file.name.split('.')[-1].lower()
-    participants = []
-    
     try:
-        if file_extension == 'csv':
-            # Read CSV data and skip any initial blank rows
-            csv_data = uploaded_file.getvalue().decode('utf-8').splitlines()
-            # Use Python's CSV reader for more robust parsing
-            reader = csv.DictReader(csv_data)
-            
-            required_columns = ['name', 'email', 'expertise']
-            
-            # Check if all required columns are present (case-insensitive)
-            header_lower = [col.lower() for col in reader.fieldnames]
-            if not all(col.lower() in header_lower for col in required_columns):
-                st.error("CSV file must contain 'name', 'email', and 'expertise' columns")
-                return None
-            
-            # Map actual column names to expected column names (handling case differences)
-            col_mapping = {}
-            for req_col in required_columns:
-                for actual_col in reader.fieldnames:
-                    if actual_col.lower() == req_col.lower():
-                        col_mapping[req_col] = actual_col
-            
-            # Convert CSV rows to list of dictionaries
-            for row in reader:
-                if any(row.values()):  # Skip completely empty rows
-                    participant = {
-                        'name': row[col_mapping['name']].strip(),
-                        'email': row[col_mapping['email']].strip(),
-                        'expertise': row[col_mapping['expertise']].strip()
-                    }
-                    participants.append(participant)
-                
-        elif file_extension == 'txt':
-            content = uploaded_file.getvalue().decode('utf-8')
-            lines = content.split('\n')
-            for line in lines:
-                if line.strip():  # Skip empty lines
-                    parts = line.split(',')
-                    if len(parts) >= 3:
-                        participants.append({
-                            'name': parts[0].strip(),
-                            'email': parts[1].strip(),
-                            'expertise': parts[2].strip()
-                        })
-                    else:
-                        st.error(f"Invalid format in line: {line}. Expected 'name, email, expertise'")
-                        return None
-                        
-        elif file_extension == 'docx':
-            doc = docx.Document(io.BytesIO(uploaded_file.getvalue()))
-            for para in doc.paragraphs:
-                if para.text.strip():  # Skip empty lines
-                    parts = para.text.split(',')
-                    if len(parts) >= 3:
-                        participants.append({
-                            'name': parts[0].strip(),
-                            'email': parts[1].strip(),
-                            'expertise': parts[2].strip()
-                        })
-                    else:
-                        st.error(f"Invalid format in line: {para.text}. Expected 'name, email, expertise'")
-                        return None
-        else:
-            return None
-        
-        return participants
+        return parse_participants(*get_upload_info(uploaded_file))
+    except ValueError as e:
+        st.error(str(e))
+        return None
     except Exception as e:
         st.error(f"Error reading participants file: {str(e)}")
         return None
-# Modified functions for improved meeting transcript analysis
+# Rendered emails are cached per (summary, tasks, recipient) so reruns don't rebuild them
+EMAIL_RENDER_CACHE_ENTRIES = 2000
 
-def generate_meeting_summary(transcript):
-    if not transcript:
-        return "No transcript provided for summarization."
-    
-    try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a professional assistant that creates concise yet comprehensive summaries of meeting transcripts."},
-                {"role": "user", "content": f"Please provide a summarized version of this meeting transcript that captures the key points, decisions, and overall purpose:\n\n{transcript}"}
-            ],
-            max_tokens=500
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        return f"Error generating meeting summary: {str(e)}"
+@st.cache_data(max_entries=EMAIL_RENDER_CACHE_ENTRIES, show_spinner=False)
+def render_participant_email(summary, tasks, person_name):
+    return build_participant_email(summary, tasks, person_name)
 
-# Modified task extraction to avoid creating artificial tasks
-def extract_tasks_and_assign(transcript, participants):
-    if not transcript or not participants:
-        return {"tasks": []}
-    
-    # Create a set of lowercase participant names for strict matching
-    participant_names = {p['name'].lower() for p in participants}
-    
-    # Create a mapping of name to email and expertise
-    participant_info = ""
-    name_to_email = {}
-    name_to_expertise = {}
-    
-    for p in participants:
-        name_lower = p['name'].lower()
-        name_to_email[name_lower] = p['email']
-        name_to_expertise[name_lower] = p['expertise']
-        participant_info += f"- {p['name']}: {p['expertise']}, Email: {p['email']}\n"
-    
-    try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": """You are a professional assistant that identifies ONLY explicitly mentioned tasks from meeting transcripts.
-                
-                STRICT RULES:
-                1. ONLY extract tasks that are EXPLICITLY mentioned in the transcript.
-                2. NEVER invent, infer, or create tasks that aren't clearly stated in the transcript.
-                3. ONLY assign tasks to people who are EXPLICITLY mentioned as responsible in the transcript AND appear in the provided participant list.
-                4. If a task exists but has no clear assignee, mark it as 'Unassigned'.
-                5. If no tasks are mentioned at all, return an empty tasks array.
-                6. Do not try to be helpful by creating tasks - only report what's in the transcript."""},
-                
-                {"role": "user", "content": f"""Based on the meeting transcript below, identify ONLY explicitly mentioned tasks and action items.
-                
-                IMPORTANT CONSTRAINTS:
-                - Task extraction should be CONSERVATIVE - only include tasks with clear action verbs and deliverables.
-                - A person can only be assigned a task if they are EXPLICITLY mentioned as responsible AND they appear in the team member list below.
-                - Return a COMPLETELY EMPTY tasks array if no explicit tasks are mentioned.
-                
-                Format your response as a JSON object with a 'tasks' array. Each task should include:
-                - 'task': The specific action item mentioned (verbatim from transcript when possible)
-                - 'assignee': The person explicitly assigned (must match a name in team list) or 'Unassigned'
-                - 'due_date': Only if explicitly mentioned with a specific date, otherwise 'Not specified'
-                - 'context': Short quote from transcript showing where task was mentioned
-                
-                Meeting Transcript:
-                {transcript}
-                
-                Team Members (ONLY these people can be assigned tasks):
-                {participant_info}
-                
-                If someone is mentioned in the transcript but isn't in this team list, DO NOT assign tasks to them."""}
-            ],
-            max_tokens=1000,
-            response_format={"type": "json_object"}
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        
-        # Ensure we have a "tasks" property that is a list
-        if "tasks" not in result or not isinstance(result["tasks"], list):
-            result = {"tasks": []}
-        
-        # Validation step: only keep tasks assigned to actual participants
-        validated_tasks = []
-        for task in result["tasks"]:
-            # Convert assignee to lowercase for comparison
-            assignee_lower = task.get("assignee", "").lower()
-            
-            # Check if:
-            # 1. The task has actual content
-            # 2. Either the assignee is "Unassigned" or matches someone in our participant list
-            if task.get("task", "").strip() and (
-                assignee_lower == "unassigned" or assignee_lower in participant_names
-            ):
-                # Add email based on participant list
-                if assignee_lower in name_to_email:
-                    task["email"] = name_to_email[assignee_lower]
-                else:
-                    task["email"] = ""
-                
-                validated_tasks.append(task)
-        
-        return {"tasks": validated_tasks}
-    
-    except Exception as e:
-        print(f"Error extracting tasks: {str(e)}")
-        return {"tasks": []}
-
-# Function to generate email with tasks
-def generate_task_email(summary, tasks, person_name):
-    html = f"""
-    <html>
-    <head>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 650px;
-                margin: 0 auto;
-            }}
-            .header {{
-                background-color: #1E40AF;
-                color: white;
-                padding: 20px;
-                text-align: center;
-                border-radius: 5px 5px 0 0;
-            }}
-            .content {{
-                padding: 20px;
-                background-color: #f9f9f9;
-                border: 1px solid #ddd;
-            }}
-            .summary {{
-                background-color: #EFF6FF;
-                padding: 15px;
-                border-left: 5px solid #3B82F6;
-                margin-bottom: 20px;
-            }}
-            .task {{
-                background-color: #F3F4F6;
-                padding: 15px;
-                margin-bottom: 10px;
-                border-left: 5px solid #6B7280;
-            }}
-            .footer {{
-                text-align: center;
-                padding: 15px;
-                font-size: 0.8em;
-                color: #666;
-                border-top: 1px solid #ddd;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h2>Meeting Summary & Action Items</h2>
-        </div>
-        <div class="content">
-            <p>Hello {person_name},</p>
-            
-            <p>Below you'll find a summary of our recent meeting and your assigned action items.</p>
-            
-            <h3>Meeting Summary</h3>
-            <div class="summary">
-                {summary.replace('\n', '<br>')}
-            </div>
-            
-            <h3>Your Action Items</h3>
-            """
-    
-    # Add tasks to email
-    if tasks:
-        for task in tasks:
-            due_date = task.get('due_date', 'Not specified')
-            task_desc = task.get('task', 'No description')
-            
-            html += f"""
-            <div class="task">
-                <strong>Task:</strong> {task_desc}<br>
-                <strong>Due Date:</strong> {due_date}
-            </div>
-            """
-    else:
-        html += "<p>No specific action items were assigned to you from this meeting.</p>"
-    
-    # Close HTML
-    html += f"""
-            <p>Best regards,<br>Meeting Coordinator</p>
-        </div>
-        <div class="footer">
-            This email was automatically generated by the Meeting Minutes Analyzer.
-        </div>
-    </body>
-    </html>
-    """
-    
-    return html
-
-# Keeping the original summary-only email function intact
-def generate_summary_email(summary, person_name):
-    html = f"""
-    <html>
-    <head>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 650px;
-                margin: 0 auto;
-            }}
-            .header {{
-                background-color: #1E40AF;
-                color: white;
-                padding: 20px;
-                text-align: center;
-                border-radius: 5px 5px 0 0;
-            }}
-            .content {{
-                padding: 20px;
-                background-color: #f9f9f9;
-                border: 1px solid #ddd;
-            }}
-            .summary {{
-                background-color: #EFF6FF;
-                padding: 15px;
-                border-left: 5px solid #3B82F6;
-                margin-bottom: 20px;
-            }}
-            .footer {{
-                text-align: center;
-                padding: 15px;
-                font-size: 0.8em;
-                color: #666;
-                border-top: 1px solid #ddd;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h2>Meeting Summary</h2>
-        </div>
-        <div class="content">
-            <p>Hello {person_name},</p>
-            
-            <p>Below you'll find a summary of our recent meeting.</p>
-            
-            <h3>Meeting Summary</h3>
-            <div class="summary">
-                {summary.replace('\n', '<br>')}
-            </div>
-            
-            <p>Best regards,<br>Meeting Coordinator</p>
-        </div>
-        <div class="footer">
-            This email was automatically generated by the Meeting Minutes Analyzer.
-        </div>
-    </body>
-    </html>
-    """
-    
-    return html
+# The task table and its aggregates are cached per task list and day, so reruns
+# (every filter change or edit) don't rebuild them. pandas is only imported the
+# first time tasks are shown.
+TASK_TABLE_CACHE_ENTRIES = 50
+
+def tasks_hash(tasks):
+    return hashlib.sha256(json.dumps(tasks, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+@st.cache_data(max_entries=TASK_TABLE_CACHE_ENTRIES, show_spinner=False)
+def task_analytics(content_hash, meeting_date, today, _tasks):
+    from task_table import task_stats, tasks_frame
+    frame = tasks_frame(_tasks, meeting_date)
+    return frame, task_stats(frame, today)
 
 # Check for auth code in URL - FIXED with st.query_params
 auth_code_from_url = check_url_for_auth_code()
@@ -608,7 +420,7 @@ if auth_code_from_url and not st.session_state.authenticated:
         
         creds = complete_auth_flow(auth_code_from_url)
         if creds:
-            st.session_state.service = build('gmail', 'v1', credentials=creds)
+            st.session_state.service = build_gmail_service(creds)
             st.session_state.authenticated = True
             # Clear the URL parameters - FIXED
             st.query_params.clear()
@@ -641,7 +453,7 @@ with st.sidebar:
                 with st.spinner("Completing authentication..."):
                     creds = complete_auth_flow(auth_code)
                     if creds:
-                        st.session_state.service = build('gmail', 'v1', credentials=creds)
+                        st.session_state.service = build_gmail_service(creds)
                         st.session_state.authenticated = True
                         st.success("Authentication successful!")
                         st.rerun()
@@ -653,14 +465,45 @@ with st.sidebar:
     else:
         st.markdown('<div class="success-box">✅ Connected to Gmail</div>', unsafe_allow_html=True)
         if st.button("Logout"):
-            if os.path.exists(TOKEN_FILE):
-                os.remove(TOKEN_FILE)
+            get_credential_store().clear()
             st.session_state.authenticated = False
             st.session_state.service = None
             st.session_state.auth_url = None
             st.session_state.flow = None
             st.rerun()
     
+    st.markdown("---")
+    cache_stats = llm_cache.stats()
+    st.caption(
+        f"Analysis cache: {cache_stats['entries']} entries, "
+        f"{cache_stats['hit_rate']:.0%} hit rate ({cache_stats['hits']} hits / {cache_stats['misses']} misses)"
+    )
+    
+    if telemetry.telemetry.enabled:
+        with st.expander("Diagnostics"):
+            diagnostics = telemetry.telemetry.snapshot()
+            if not diagnostics['spans']:
+                st.caption("Nothing traced yet in this process.")
+            for name, stats in diagnostics['spans'].items():
+                st.caption(
+                    f"**{name}**: {stats['count']} calls, {stats['mean_seconds'] * 1000:.0f} ms mean, "
+                    f"{stats['max_seconds'] * 1000:.0f} ms max" + (f", {stats['errors']} errors" if stats['errors'] else "")
+                )
+            for model, counts in diagnostics['tokens'].items():
+                st.caption(
+                    f"**{model}**: {counts['prompt']:,} prompt + {counts['completion']:,} completion tokens "
+                    f"over {counts['calls']} calls"
+                )
+            # The backend is shared by every session, so identical analyses share its calls
+            backend_stats = getattr(meeting_analysis.client, "stats", None)
+            if backend_stats:
+                coalesced = backend_stats()
+                st.caption(
+                    f"**LLM coalescing**: {coalesced['coalesced_analyses']} analyses and "
+                    f"{coalesced['coalesced_requests'] + coalesced['coalesced_streams']} requests "
+                    f"shared another session's call"
+                )
+
     st.markdown("---")
     st.markdown("### About This App")
     st.markdown("""
@@ -675,7 +518,7 @@ with st.sidebar:
     """)
 
 # Main area
-tab1, tab2, tab3 = st.tabs(["📤 Upload Files", "📋 Analysis & Tasks", "📬 Send Emails"])
+tab1, tab2, tab3, tab4 = st.tabs(["📤 Upload Files", "📋 Analysis & Tasks", "📬 Send Emails", "🗂️ History"])
 
 # Upload Files Tab
 with tab1:
@@ -685,12 +528,16 @@ with tab1:
     
     with col1:
         st.subheader("Meeting Transcript")
-        transcript_file = st.file_uploader("Upload meeting transcript", type=["txt", "docx", "pdf"], key="transcript_uploader")
+        transcript_file = st.file_uploader("Upload meeting transcript", type=["txt", "docx", "pdf"], key=f"transcript_uploader_{st.session_state.uploader_generation}")
         
         if transcript_file is not None:
             transcript_content = read_transcript(transcript_file)
             if transcript_content:
+                # The saved meeting, if any, belongs to the previous transcript
+                if transcript_content != st.session_state.transcript_content:
+                    st.session_state.meeting_id = None
                 st.session_state.transcript_content = transcript_content
+                st.session_state.transcript_name = transcript_file.name
                 st.success(f"Successfully read transcript: {transcript_file.name}")
                 with st.expander("Preview Transcript"):
                     st.text_area("Transcript Content", transcript_content, height=300)
@@ -701,9 +548,10 @@ with tab1:
         Upload a file with participant information in the format:
         - CSV: columns named 'name', 'email', 'expertise'
         - TXT/DOCX: each line with 'name, email, expertise'
+        - DOCX tables: one row per person with name, email and expertise cells
         """)
         
-        participants_file = st.file_uploader("Upload participants list", type=["csv", "txt", "docx"], key="participants_uploader")
+        participants_file = st.file_uploader("Upload participants list", type=["csv", "txt", "docx"], key=f"participants_uploader_{st.session_state.uploader_generation}")
         
         if participants_file is not None:
             participants = read_participants(participants_file)
@@ -749,19 +597,156 @@ with tab2:
     
     # Check if both transcript and participants are loaded
     if st.session_state.transcript_content and st.session_state.participants:
+        # Same transcript analyzed before: offer the stored results instead of new LLM calls
+        if not st.session_state.summary:
+            saved_id = meeting_history.find_by_transcript(st.session_state.transcript_content)
+            if saved_id and st.button("Open saved analysis of this transcript"):
+                open_saved_meeting(saved_id)
+                st.rerun()
+        
         if st.button("Analyze Meeting Transcript"):
-            with st.spinner("Analyzing meeting transcript and extracting tasks..."):
-                # Generate summary
-                summary = generate_meeting_summary(st.session_state.transcript_content)
-                st.session_state.summary = summary
+            meeting_analysis.configure(get_llm_backend(), llm_cache)
+            start = time.perf_counter()
+            
+            # Extract tasks in the background while the summary streams in below
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                def extract_tasks_timed(transcript, participants):
+                    tasks_start = time.perf_counter()
+                    return extract_tasks_and_assign(transcript, participants), time.perf_counter() - tasks_start
+                
+                tasks_future = executor.submit(
+                    extract_tasks_timed,
+                    st.session_state.transcript_content,
+                    st.session_state.participants
+                )
                 
-                # Extract and assign tasks
-                tasks_result = extract_tasks_and_assign(st.session_state.transcript_content, st.session_state.participants)
-                st.session_state.tasks = tasks_result
+                summary_metrics = {}
+                streaming_area = st.empty()
+                with streaming_area.container():
+                    st.subheader("Meeting Summary")
+                    summary = st.write_stream(stream_meeting_summary(
+                        st.session_state.transcript_content,
+                        metrics=summary_metrics
+                    ))
                 
+                with st.spinner("Extracting tasks..."):
+                    tasks_result, tasks_seconds = tasks_future.result()
+            
+            # The summary box below shows the final text from now on
+            streaming_area.empty()
+            # A failed summary (possibly half-written) is neither kept, saved nor emailed
+            summary_error = summary_metrics.get("error")
+            st.session_state.summary = None if summary_error else summary
+            st.session_state.summary_error = summary_error
+            st.session_state.tasks = tasks_result
+            st.session_state.analysis_timings = {
+                "summary": summary_metrics["total"],
+                "summary_first_token": summary_metrics["first_token"],
+                "tasks": tasks_seconds,
+                "total": time.perf_counter() - start
+            }
+            if not summary_error and "error" not in tasks_result:
+                st.session_state.meeting_id = meeting_history.save_meeting(
+                    st.session_state.transcript_content,
+                    st.session_state.participants,
+                    summary,
+                    tasks_result,
+                    title=st.session_state.transcript_name
+                )
+            
+            if not summary_error:
                 st.success("Analysis complete!")
         
+        # Live mode: re-upload the transcript as the meeting goes on and only the new
+        # part is analyzed, updating the summary and tasks in place
+        with st.expander("Live meeting (analyze a transcript that is still growing)"):
+            live = st.session_state.live_meeting
+            if live is not None and live.participants != st.session_state.participants:
+                live = st.session_state.live_meeting = None
+            if live is not None:
+                st.caption(
+                    f"{live.processed_offset:,} characters analyzed in {live.updates} updates, "
+                    f"{len(live.open_tasks())} open tasks"
+                )
+            live_col1, live_col2 = st.columns(2)
+            process_clicked = live_col1.button("Process new transcript text")
+            finish_clicked = live_col2.button("Finish live meeting", disabled=live is None)
+            if process_clicked or finish_clicked:
+                meeting_analysis.configure(get_llm_backend(), llm_cache)
+                if live is None:
+                    live = st.session_state.live_meeting = LiveMeeting(st.session_state.participants)
+                try:
+                    live.sync(st.session_state.transcript_content)
+                except ValueError:
+                    st.warning("The transcript changed earlier on, so the live analysis was restarted.")
+                    live = st.session_state.live_meeting = LiveMeeting(st.session_state.participants)
+                    live.sync(st.session_state.transcript_content)
+                with st.spinner("Updating the live analysis..."):
+                    delta = live.process(final=finish_clicked)
+                if delta.get("error"):
+                    st.error(f"Live update failed, the new text will be retried: {delta['error']}")
+                st.session_state.summary = live.summary or None
+                st.session_state.summary_error = None
+                st.session_state.tasks = live.tasks_result()
+                st.session_state.analysis_timings = None
+                if delta["calls"] == 0 and not delta.get("error"):
+                    st.info("Not enough new transcript text yet.")
+                for task in delta["added"]:
+                    st.markdown(f"➕ **{task['assignee']}**: {task['task']}")
+                for change in delta["updated"]:
+                    fields = ", ".join(f"{field}: {value}" for field, value in change["changes"].items() if field != "email")
+                    st.markdown(f"✏️ Task {change['id']} updated ({fields})")
+                if finish_clicked and not delta.get("error"):
+                    st.session_state.meeting_id = meeting_history.save_meeting(
+                        st.session_state.transcript_content,
+                        st.session_state.participants,
+                        live.summary,
+                        live.tasks_result(),
+                        title=st.session_state.transcript_name
+                    )
+                    st.session_state.live_meeting = None
+                    st.success("Live meeting finished and saved to History.")
+        
+        if st.session_state.analysis_timings:
+            timings = st.session_state.analysis_timings
+            st.caption(
+                f"Analysis took {timings['total']:.1f}s "
+                f"(summary {timings['summary']:.1f}s with first words after {timings['summary_first_token']:.1f}s, "
+                f"tasks {timings['tasks']:.1f}s, run concurrently)"
+            )
+        
+        roster_stats = (st.session_state.tasks or {}).get("roster")
+        if roster_stats:
+            st.caption(
+                f"Task extraction included {roster_stats['included']} of {roster_stats['participants']} participants "
+                f"mentioned in the transcript (~{roster_stats['tokens_saved']:,} prompt tokens saved)"
+            )
+        
+        transcript_stats = (st.session_state.tasks or {}).get("transcript")
+        if transcript_stats and transcript_stats["prefiltered"]:
+            st.caption(
+                f"Task extraction read {transcript_stats['tokens_sent']:,} of ~{transcript_stats['tokens']:,} "
+                f"transcript tokens (turns without action items were skipped)"
+            )
+
+        output_stats = (st.session_state.tasks or {}).get("output")
+        if output_stats and output_stats["truncated"]:
+            st.warning(
+                "The task list was too long to extract completely; the tasks shown are the ones "
+                "the model returned before running out of output space."
+            )
+        elif output_stats and output_stats["continuations"]:
+            st.caption(
+                f"The task list was long, so it was extracted in {output_stats['continuations'] + 1} parts"
+            )
+
+        duplicates_merged = (st.session_state.tasks or {}).get("duplicates_merged")
+        if duplicates_merged:
+            st.caption(f"Merged {duplicates_merged} repeated mention(s) of the same task")
+
         # Display results if available
+        if st.session_state.summary_error:
+            st.error(f"Error generating meeting summary: {st.session_state.summary_error}. Analyze the transcript again.")
         if st.session_state.summary:
             st.subheader("Meeting Summary")
             st.markdown(f'<div class="summary-box">{st.session_state.summary}</div>', unsafe_allow_html=True)
@@ -771,25 +756,72 @@ with tab2:
                 st.info("No explicit tasks or action items were identified in this meeting transcript.")
             else:
                 st.subheader("Task Assignments")
+                from task_table import UNASSIGNED, filter_tasks, reassign_tasks
+                
+                tasks = st.session_state.tasks["tasks"]
+                today = datetime.now().date()
+                tasks_key = tasks_hash(tasks)
+                task_frame, task_summary = task_analytics(
+                    tasks_key, guess_meeting_date(st.session_state.transcript_content), today, tasks
+                )
+                
+                metric1, metric2, metric3, metric4 = st.columns(4)
+                metric1.metric("Tasks", task_summary["tasks"])
+                metric2.metric("People", task_summary["people"])
+                metric3.metric("Overdue", task_summary["overdue"])
+                metric4.metric("Unassigned", f"{task_summary['unassigned_ratio']:.0%}")
+                with st.expander("Tasks per person"):
+                    st.dataframe(
+                        task_summary["per_person"],
+                        hide_index=True,
+                        column_config={"next_due": st.column_config.DateColumn("Next due")}
+                    )
                 
-                # Group tasks by assignee
-                tasks_by_assignee = {}
-                for task in st.session_state.tasks["tasks"]:
-                    assignee = task.get("assignee", "Unassigned")
-                    if assignee not in tasks_by_assignee:
-                        tasks_by_assignee[assignee] = []
-                    tasks_by_assignee[assignee].append(task)
+                filter1, filter2, filter3 = st.columns([3, 3, 1])
+                with filter1:
+                    shown_assignees = st.multiselect("Assignees", list(task_summary["per_person"]["assignee"]))
+                with filter2:
+                    task_search = st.text_input("Search tasks", placeholder="Filter by task or context", key="task_table_search")
+                with filter3:
+                    overdue_only = st.checkbox("Overdue only")
+                shown = filter_tasks(task_frame, shown_assignees, task_search, overdue_only, today)
                 
-                # Display tasks by assignee
-                for assignee, tasks in tasks_by_assignee.items():
-                    with st.expander(f"{assignee} - {len(tasks)} tasks"):
-                        for task in tasks:
-                            st.markdown(f"""
-                            <div class="task-box">
-                                <strong>Task:</strong> {task.get('task', 'No description')}<br>
-                                <strong>Due Date:</strong> {task.get('due_date', 'Not specified')}
-                            </div>
-                            """, unsafe_allow_html=True)
+                # One table for every task: sortable by any column, with the assignee
+                # editable from the roster. Edits go back into the task list, so the
+                # emails and the saved meeting pick them up.
+                assignee_options = [UNASSIGNED] + sorted({p['name'] for p in st.session_state.participants or [] if p.get('name')})
+                edited = st.data_editor(
+                    shown[["assignee", "task", "due_date", "due", "context", "mentions"]],
+                    hide_index=True,
+                    column_config={
+                        "assignee": st.column_config.SelectboxColumn("Assignee", options=assignee_options, required=True),
+                        "task": st.column_config.TextColumn("Task", width="large"),
+                        "due_date": "Due (as said)",
+                        "due": st.column_config.DateColumn("Due date"),
+                        "context": "Context",
+                        "mentions": "Mentions"
+                    },
+                    disabled=["task", "due_date", "due", "context", "mentions"],
+                    # A new key whenever the rows change (an edit, a new analysis or another
+                    # meeting, a filter), so pending edits never land on the wrong row
+                    key=f"task_table_{tasks_key}_{shown_assignees}_{task_search}_{overdue_only}"
+                )
+                st.caption(f"Showing {len(shown)} of {len(task_frame)} tasks")
+                
+                reassigned = edited["assignee"][edited["assignee"] != shown["assignee"]]
+                if len(reassigned):
+                    tasks, changed = reassign_tasks(tasks, reassigned.to_dict(), RosterIndex(st.session_state.participants))
+                    if changed:
+                        st.session_state.tasks = {**st.session_state.tasks, "tasks": tasks}
+                        if st.session_state.meeting_id is not None:
+                            st.session_state.meeting_id = meeting_history.save_meeting(
+                                st.session_state.transcript_content,
+                                st.session_state.participants,
+                                st.session_state.summary,
+                                st.session_state.tasks,
+                                title=st.session_state.transcript_name
+                            )
+                        st.rerun()
     else:
         st.info("Please upload both a meeting transcript and participants list in the Upload Files tab.")
 # The error is occurring because we're trying to enumerate tasks_by_email before it's fully defined
@@ -805,97 +837,161 @@ with tab3:
     elif st.session_state.summary and st.session_state.participants:
         st.subheader("Preview and Send Emails")
         
-        # Initialize these variables properly
-        tasks_by_email = {}
-        email_to_name = {}
-        
-        # Create a mapping of all participants' emails
-        for participant in st.session_state.participants:
-            email = participant.get("email", "")
-            name = participant.get("name", "")
-            
-            if email and "@" in email:
-                email_to_name[email] = name
-        
-        # Group tasks by assignee email if tasks exist
-        if st.session_state.tasks and "tasks" in st.session_state.tasks and st.session_state.tasks["tasks"]:
-            for task in st.session_state.tasks["tasks"]:
-                email = task.get("email", "")
-                
-                # Skip if email is empty or invalid
-                if not email or "@" not in email:
-                    continue
-                    
-                if email not in tasks_by_email:
-                    tasks_by_email[email] = []
-                tasks_by_email[email].append(task)
+        # Everyone with a valid email gets a message; tasks are grouped by assignee email
+        email_to_name, tasks_by_email = group_recipients(st.session_state.participants, st.session_state.tasks)
         
         # Check if we have any valid participants
         if email_to_name:
-            # Create tabs for all participants
-            email_tabs = st.tabs([f"{name} ({email})" for email, name in email_to_name.items()])
+            # Only the selected recipient's preview is rendered, however many participants there are
+            recipients = list(email_to_name.items())
+            search = st.text_input("Search recipients", placeholder="Filter by name or email")
+            if search:
+                needle = search.strip().lower()
+                recipients = [(email, name) for email, name in recipients if needle in email.lower() or needle in name.lower()]
             
-            for i, (email, name) in enumerate(email_to_name.items()):
-                with email_tabs[i]:
-                    # Check if this participant has tasks
-                    if email in tasks_by_email and tasks_by_email[email]:
-                        # They have tasks, show task email
-                        email_content = generate_task_email(st.session_state.summary, tasks_by_email[email], name)
-                        st.markdown("### Email Preview (with Tasks)")
-                    else:
-                        # No tasks, show summary-only email
-                        email_content = generate_summary_email(st.session_state.summary, name)
-                        st.markdown("### Email Preview (Summary Only)")
-                    
-                    st.components.v1.html(email_content, height=500, scrolling=True)
+            if recipients:
+                selected_email, selected_name = st.selectbox(
+                    f"Preview email for ({len(recipients)} of {len(email_to_name)} recipients)",
+                    recipients,
+                    format_func=lambda recipient: f"{recipient[1]} ({recipient[0]})" + (" - tasks" if recipient[0] in tasks_by_email else "")
+                )
+                
+                _, email_content = render_participant_email(
+                    st.session_state.summary,
+                    tasks_by_email.get(selected_email, []),
+                    selected_name
+                )
+                if tasks_by_email.get(selected_email):
+                    st.markdown("### Email Preview (with Tasks)")
+                else:
+                    st.markdown("### Email Preview (Summary Only)")
+                
+                st.components.v1.html(email_content, height=500, scrolling=True)
+            else:
+                st.info("No recipients match your search.")
             
             # Add info text explaining what will happen
             st.info(f"All {len(email_to_name)} participants will receive an email. {len(tasks_by_email)} will receive task details, and {len(email_to_name) - len(tasks_by_email)} will receive just the meeting summary.")
             
-            # Send all emails button
+            outbox_key = meeting_key(st.session_state.transcript_content)
+            
+            # Send all emails button. Messages are queued under an idempotency key, so
+            # clicking again only sends what hasn't been sent for this content yet.
             if st.button("Send All Emails"):
-                success_count = 0
-                error_count = 0
+                # Render every email up front, then queue them for the background sender
+                messages = []
+                with span("email.render", recipients=len(email_to_name)):
+                    for email, name in email_to_name.items():
+                        # Task email if they have tasks, otherwise summary only
+                        subject, email_content = render_participant_email(
+                            st.session_state.summary,
+                            tasks_by_email.get(email, []),
+                            name
+                        )
+                        messages.append({'to': email, 'subject': subject, 'html': email_content})
+                
+                queued = email_outbox.enqueue(outbox_key, messages)
+                if queued['duplicates']:
+                    st.info(f"{queued['duplicates']} of these emails were already queued or sent and won't be sent again.")
+                service_factory, max_workers = get_gmail_service_factory()
+                outbox_sender.wake(service_factory, max_workers)
                 
                 with st.spinner(f"Sending emails to {len(email_to_name)} participants..."):
                     progress_bar = st.progress(0)
+                    start = time.perf_counter()
                     
-                    # Send emails to ALL participants
-                    for i, (email, name) in enumerate(email_to_name.items()):
-                        try:
-                            # Choose email type based on whether they have tasks
-                            if email in tasks_by_email and tasks_by_email[email]:
-                                email_content = generate_task_email(st.session_state.summary, tasks_by_email[email], name)
-                                subject = "Meeting Action Items"
-                            else:
-                                email_content = generate_summary_email(st.session_state.summary, name)
-                                subject = "Meeting Summary"
-                            
-                            success, result = send_email(
-                                st.session_state.service, 
-                                email, 
-                                subject, 
-                                email_content
-                            )
-                            
-                            if success:
-                                success_count += 1
-                            else:
-                                error_count += 1
-                                st.error(f"Failed to send email to {email}: {result}")
-                        except Exception as e:
-                            error_count += 1
-                            st.error(f"Error sending to {email}: {str(e)}")
-                        
-                        # Update progress bar
-                        progress_bar.progress((i + 1) / len(email_to_name))
-                    
-                    if success_count > 0:
-                        st.success(f"✅ Successfully sent {success_count} emails")
-                    
-                    if error_count > 0:
-                        st.error(f"❌ Failed to send {error_count} emails")
+                    # Follow the sender's progress; leaving the page doesn't stop it
+                    while True:
+                        counts = email_outbox.status(outbox_key)
+                        total = sum(counts.values())
+                        progress_bar.progress((counts['sent'] + counts['failed']) / total if total else 1.0)
+                        if not counts['pending'] and not counts['sending']:
+                            break
+                        if time.perf_counter() - start > OUTBOX_WATCH_SECONDS:
+                            st.info("Sending continues in the background; check back here for its status.")
+                            break
+                        time.sleep(0.5)
+            
+            # Delivery state of this meeting's emails, kept across reruns and restarts
+            outbox_counts = email_outbox.status(outbox_key)
+            if any(outbox_counts.values()):
+                if outbox_counts['sent']:
+                    st.success(f"✅ {outbox_counts['sent']} emails sent for this meeting")
+                if outbox_counts['pending'] or outbox_counts['sending']:
+                    st.info(f"📤 {outbox_counts['pending'] + outbox_counts['sending']} emails waiting to be sent")
+                if outbox_counts['failed']:
+                    st.error(f"❌ Failed to send {outbox_counts['failed']} emails")
+                    for failure in email_outbox.failures(outbox_key):
+                        st.markdown(f"- {failure['to']}: {failure['error']}")
+                    if st.button("Retry failed emails"):
+                        email_outbox.retry_failed(outbox_key)
+                        service_factory, max_workers = get_gmail_service_factory()
+                        outbox_sender.wake(service_factory, max_workers)
+                        st.rerun()
         else:
             st.warning("No valid participant email addresses found. Please check your participants file.")
     else:
         st.info("Please upload a participant list and analyze the meeting transcript before sending emails.")
+
+# Meeting History Tab
+with tab4:
+    st.header("Meeting History")
+    
+    history_notice = st.session_state.pop("history_notice", None)
+    if history_notice:
+        st.success(history_notice)
+    
+    history_stats = meeting_history.stats()
+    if not history_stats['meetings']:
+        st.info("Analyzed meetings are saved here automatically.")
+    else:
+        st.caption(f"{history_stats['meetings']} meetings and {history_stats['tasks']} tasks saved")
+        
+        col1, col2, col3 = st.columns([3, 2, 2])
+        with col1:
+            query = st.text_input("Search tasks", placeholder="e.g. budget forecast")
+        with col2:
+            assignee_options = [None] + meeting_history.assignees()
+            assignee = st.selectbox(
+                "Assignee",
+                assignee_options,
+                format_func=lambda person: "Everyone" if person is None else f"{person['name']} ({person['tasks']})"
+            )
+        with col3:
+            period = st.selectbox("Meetings from", ["Any time", "Last 7 days", "Last 30 days", "This month", "Last month"])
+        
+        since, until = period_bounds(period)
+        results = meeting_history.search_tasks(
+            query,
+            assignee=(assignee['email'] or assignee['name']) if assignee else None,
+            since=since,
+            until=until
+        )
+        
+        if query or assignee or since:
+            st.subheader(f"Tasks ({len(results)})")
+            if not results:
+                st.info("No saved tasks match.")
+            for result in results:
+                analyzed = datetime.fromtimestamp(result['analyzed_at']).strftime("%Y-%m-%d")
+                st.markdown(
+                    f'<div class="task-box"><strong>{html.escape(result["task"])}</strong><br>'
+                    f'{html.escape(result["assignee"] or "Unassigned")} · Due: {html.escape(result["due_date"] or "Not specified")}<br>'
+                    f'<em>{html.escape(result["title"])}</em> ({analyzed})'
+                    + (f'<br><small>"{html.escape(result["context"])}"</small>' if result["context"] else "")
+                    + '</div>',
+                    unsafe_allow_html=True
+                )
+        
+        st.subheader("Recent Meetings")
+        for meeting in meeting_history.list_meetings(limit=20):
+            analyzed = datetime.fromtimestamp(meeting['analyzed_at']).strftime("%Y-%m-%d %H:%M")
+            col1, col2 = st.columns([5, 1])
+            with col1:
+                st.markdown(f"**{meeting['title']}** · {meeting['task_count']} tasks · analyzed {analyzed}")
+            with col2:
+                if st.button("Open", key=f"open_meeting_{meeting['id']}"):
+                    open_saved_meeting(meeting['id'])
+                    # The other tabs were already drawn with the old meeting in this run
+                    st.session_state.history_notice = f"Opened {meeting['title']}. See the Analysis & Tasks tab."
+                    st.rerun()
@@ -0,0 +1,297 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import meeting_analysis
+import telemetry
+from email_templates import build_participant_email, group_recipients
+from gmail_delivery import (DEFAULT_MAX_WORKERS, DEFAULT_SEND_BURST, DEFAULT_SEND_RATE, FakeGmailService,
+                            TokenBucket, build_gmail_service, deliver_messages)
+from llm_backend import create_backend
+from llm_cache import LLMCache
+from meeting_history import MeetingHistory, meeting_key
+from email_outbox import EmailOutbox, OutboxSender
+from meeting_analysis import analyze_meeting
+from meeting_files import get_file_extension, read_participants_bytes, read_transcript_bytes
+from telemetry import span
+
+# Headless batch runner for a directory or manifest of meetings.
+#
+#   python batch.py meetings/ --participants team.csv --out results/
+#   python batch.py --manifest meetings.jsonl --out results/ --llm fake --emails send --gmail fake
+#   python batch.py meetings/ --participants team.csv --out results/ --llm stub
+#   python batch.py meetings/ --participants team.csv --out results/ --emails send --outbox outbox.sqlite3
+#
+# A manifest is a JSON-lines file with "transcript", "participants" and an optional
+# "id" per meeting; relative paths are resolved against the manifest's directory.
+# Each meeting gets <out>/<id>/result.json (and emails.json when emails are queued),
+# and <out>/index.json lists the status of every meeting in the run.
+# With --outbox, sent emails are recorded in a durable outbox (the app's
+# email_outbox.sqlite3 works too), so re-running an interrupted batch only sends
+# the emails that didn't go out the first time.
+
+TRANSCRIPT_EXTENSIONS = {'txt', 'docx', 'pdf'}
+
+
+def read_file(path, reader):
+    with open(path, 'rb') as f:
+        data = f.read()
+    result = reader(get_file_extension(path), data)
+    if result is None:
+        raise ValueError(f"Unsupported file type: {path}")
+    return result
+
+
+def load_manifest(path):
+    base = os.path.dirname(os.path.abspath(path))
+    meetings = []
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if 'transcript' not in entry or 'participants' not in entry:
+                raise ValueError(f"{path}:{line_number}: each meeting needs 'transcript' and 'participants'")
+            transcript = os.path.join(base, entry['transcript'])
+            meetings.append({
+                'id': entry.get('id') or os.path.splitext(os.path.basename(transcript))[0],
+                'transcript': transcript,
+                'participants': os.path.join(base, entry['participants'])
+            })
+    return meetings
+
+
+# Every transcript file in the directory, all sharing one participant roster
+def discover_meetings(directory, participants_path):
+    roster = os.path.abspath(participants_path)
+    meetings = []
+    for filename in sorted(os.listdir(directory)):
+        path = os.path.abspath(os.path.join(directory, filename))
+        if path == roster or not os.path.isfile(path):
+            continue
+        if get_file_extension(filename) in TRANSCRIPT_EXTENSIONS:
+            meetings.append({
+                'id': os.path.splitext(filename)[0],
+                'transcript': path,
+                'participants': roster
+            })
+    return meetings
+
+
+# Meeting ids become directory names, so make them unique
+def assign_unique_ids(meetings):
+    seen = {}
+    for meeting in meetings:
+        base = meeting['id']
+        count = seen.get(base, 0)
+        seen[base] = count + 1
+        if count:
+            meeting['id'] = f"{base}-{count + 1}"
+    return meetings
+
+
+# --llm stub starts a local stub server, so the run goes through real HTTP without network access
+def build_llm_backend(args):
+    stub_server = None
+    base_url = args.llm_base_url
+    kind = args.llm
+    if kind == 'stub':
+        from llm_stub_server import start_stub_server
+        stub_server = start_stub_server(latency=args.fake_latency)
+        base_url, kind = stub_server.base_url, 'openai'
+    elif kind == 'openai' and not base_url and not os.environ.get('OPENAI_API_KEY'):
+        raise SystemExit("OPENAI_API_KEY must be set to use --llm openai")
+
+    backend = create_backend(
+        kind, base_url=base_url, api_key=os.environ.get('OPENAI_API_KEY'), model=args.llm_model,
+        max_concurrency=args.max_llm_concurrency, fake_latency=args.fake_latency
+    )
+    return backend, stub_server
+
+
+# Returns a per-thread Gmail service factory and the worker count to use with it
+def build_gmail_factory(args):
+    if args.gmail == 'fake':
+        service = FakeGmailService(latency=args.fake_latency)
+        return (lambda: service), DEFAULT_MAX_WORKERS
+
+    from google.oauth2.credentials import Credentials
+    creds = Credentials.from_authorized_user_file(args.gmail_token)
+    return (lambda: build_gmail_service(creds)), DEFAULT_MAX_WORKERS
+
+
+def build_messages(summary, tasks_result, participants):
+    email_to_name, tasks_by_email = group_recipients(participants, tasks_result)
+    messages = []
+    with span("email.render", recipients=len(email_to_name)):
+        for email, name in email_to_name.items():
+            subject, html = build_participant_email(summary, tasks_by_email.get(email, []), name)
+            messages.append({'to': email, 'subject': subject, 'html': html})
+    return messages
+
+
+def write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def process_meeting(meeting, args, sender, history=None):
+    start = time.perf_counter()
+    result = {'id': meeting['id'], 'transcript': meeting['transcript'], 'participants': meeting['participants']}
+    meeting_dir = os.path.join(args.out, meeting['id'])
+    os.makedirs(meeting_dir, exist_ok=True)
+
+    try:
+        transcript = read_file(meeting['transcript'], read_transcript_bytes)
+        participants = read_file(meeting['participants'], read_participants_bytes)
+        summary_metrics = {}
+        summary, tasks_result, timings = analyze_meeting(transcript, participants, summary_metrics=summary_metrics)
+
+        result.update({
+            'status': 'error' if 'error' in summary_metrics or 'error' in tasks_result else 'ok',
+            'summary': summary,
+            'tasks': tasks_result['tasks'],
+            'roster': tasks_result.get('roster'),
+            'transcript_stats': tasks_result.get('transcript'),
+            'timings': timings
+        })
+        if 'error' in summary_metrics:
+            result['error'] = f"Summary failed: {summary_metrics['error']}"
+        elif 'error' in tasks_result:
+            result['error'] = f"Task extraction failed: {tasks_result['error']}"
+
+        if history is not None and result['status'] == 'ok':
+            result['history_id'] = history.save_meeting(
+                transcript, participants, summary, tasks_result, title=meeting['id']
+            )
+
+        if args.emails != 'none' and result['status'] == 'ok':
+            messages = build_messages(summary, tasks_result, participants)
+            if args.emails == 'write':
+                write_json(os.path.join(meeting_dir, 'emails.json'), messages)
+                result['emails'] = {'queued': len(messages)}
+            else:
+                report = sender(messages, meeting_key(transcript))
+                result['emails'] = {
+                    'sent': report.sent,
+                    'failed': report.failed,
+                    'errors': report.errors,
+                    'messages_per_second': report.throughput
+                }
+    except Exception as e:
+        result.update({'status': 'error', 'error': str(e)})
+
+    result['seconds'] = time.perf_counter() - start
+    write_json(os.path.join(meeting_dir, 'result.json'), result)
+    return result
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Analyze a batch of meeting transcripts without the Streamlit UI.")
+    parser.add_argument('directory', nargs='?', help="directory of transcript files (.txt, .docx, .pdf)")
+    parser.add_argument('--participants', help="participant roster shared by every transcript in the directory")
+    parser.add_argument('--manifest', help="JSON-lines manifest of meetings instead of a directory")
+    parser.add_argument('--out', required=True, help="directory to write results to")
+    parser.add_argument('--workers', type=int, default=4, help="meetings processed at once")
+    parser.add_argument('--max-llm-concurrency', type=int, default=8, help="LLM requests in flight across all meetings")
+    parser.add_argument('--llm', choices=['openai', 'fake', 'stub'], default='openai',
+                        help="LLM backend: the OpenAI API, the in-process fake, or a local stub server")
+    parser.add_argument('--llm-base-url', help="OpenAI-compatible endpoint to use with --llm openai")
+    parser.add_argument('--llm-model', help="model to use for every LLM call")
+    parser.add_argument('--cache', help="path of an LLM result cache to reuse between runs")
+    parser.add_argument('--history', help="meeting history database to save results into (the app's meeting_history.sqlite3)")
+    parser.add_argument('--emails', choices=['none', 'write', 'send'], default='none',
+                        help="write rendered emails to emails.json, or send them")
+    parser.add_argument('--gmail', choices=['gmail', 'fake'], default='gmail', help="Gmail backend for --emails send")
+    parser.add_argument('--gmail-token', default='token.json', help="authorized user token for --gmail gmail")
+    parser.add_argument('--outbox', help="email outbox database; emails already sent from it are not sent again")
+    parser.add_argument('--no-telemetry', action='store_true',
+                        help="skip tracing; otherwise traces.jsonl and metrics.prom are written to --out")
+    parser.add_argument('--fake-latency', type=float, default=0.0, help="seconds of simulated latency per fake or stub call")
+    args = parser.parse_args(argv)
+
+    if bool(args.directory) == bool(args.manifest):
+        parser.error("give either a directory or --manifest")
+    if args.directory and not args.participants:
+        parser.error("--participants is required with a directory")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.manifest:
+        meetings = load_manifest(args.manifest)
+    else:
+        meetings = discover_meetings(args.directory, args.participants)
+    assign_unique_ids(meetings)
+    os.makedirs(args.out, exist_ok=True)
+    if args.no_telemetry:
+        telemetry.configure(enabled=False)
+    else:
+        telemetry.configure(enabled=True, trace_path=os.path.join(args.out, 'traces.jsonl'))
+
+    cache = LLMCache(args.cache) if args.cache else None
+    history = MeetingHistory(args.history) if args.history else None
+    backend, stub_server = build_llm_backend(args)
+    meeting_analysis.configure(backend, cache)
+
+    sender = None
+    if args.emails == 'send':
+        service_factory, max_workers = build_gmail_factory(args)
+        # One rate limiter for the whole run, since every send counts against the same Gmail user
+        rate_limiter = TokenBucket(DEFAULT_SEND_RATE, DEFAULT_SEND_BURST)
+
+        if args.outbox:
+            outbox = EmailOutbox(args.outbox)
+            outbox_sender = OutboxSender(outbox, service_factory, max_workers=max_workers, rate_limiter=rate_limiter)
+
+            def send_messages(messages, key):
+                outbox.enqueue(key, messages)
+                return outbox_sender.drain(key)
+        else:
+            def send_messages(messages, key):
+                return deliver_messages(messages, service_factory, max_workers=max_workers, rate_limiter=rate_limiter)
+        sender = send_messages
+
+    start = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = [executor.submit(process_meeting, meeting, args, sender, history) for meeting in meetings]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"[{len(results)}/{len(meetings)}] {result['id']}: {result['status']} ({result['seconds']:.1f}s)")
+
+    failed = sum(1 for result in results if result['status'] != 'ok')
+    index = {
+        'meetings': sorted(
+            ({'id': r['id'], 'status': r['status'], 'seconds': r['seconds'], 'error': r.get('error')} for r in results),
+            key=lambda r: r['id']
+        ),
+        'processed': len(results),
+        'failed': failed,
+        'seconds': time.perf_counter() - start
+    }
+    if cache:
+        index['cache'] = cache.stats()
+    if stub_server:
+        index['llm_stub'] = stub_server.state.stats()
+        stub_server.shutdown()
+    if not args.no_telemetry:
+        telemetry.telemetry.flush()
+        index['telemetry'] = telemetry.telemetry.snapshot()
+        with open(os.path.join(args.out, 'metrics.prom'), 'w', encoding='utf-8') as f:
+            f.write(telemetry.telemetry.prometheus_text())
+    write_json(os.path.join(args.out, 'index.json'), index)
+    print(f"Processed {len(results)} meetings in {index['seconds']:.1f}s, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
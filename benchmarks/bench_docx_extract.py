@@ -0,0 +1,44 @@
+import argparse
+import io
+import time
+
+import docx
+
+from benchmarks.synthetic import build_docx, generate_transcript
+from docx_extract import extract_docx_text
+
+# Compare python-docx (the old read_transcript path) with the streaming
+# iterparse extractor on synthetic DOCX transcripts.
+# Run from the repository root: python -m benchmarks.bench_docx_extract
+
+
+def python_docx_extract(data):
+    doc = docx.Document(io.BytesIO(data))
+    return "\n".join([para.text for para in doc.paragraphs])
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DOCX transcript extraction")
+    parser.add_argument("--words", type=int, nargs="+", default=[20000, 100000, 500000])
+    args = parser.parse_args()
+
+    print(f"{'words':>8} {'python-docx s':>14} {'streaming s':>12} {'speedup':>8}")
+    for words in args.words:
+        data = build_docx(generate_transcript(words).split("\n"))
+        baseline_text, baseline_seconds = time_call(python_docx_extract, data)
+        streaming_text, streaming_seconds = time_call(extract_docx_text, data)
+        assert baseline_text == streaming_text, "streaming extraction changed the output"
+        print(
+            f"{words:>8} {baseline_seconds:>14.2f} {streaming_seconds:>12.2f} "
+            f"{baseline_seconds / streaming_seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import time
+
+from email_templates import render_summary_block, render_summary_email, render_task_email
+
+# Per-recipient cost of rendering meeting emails, with the summary block shared
+# across recipients versus re-rendered for each one.
+# Run from the repository root: python -m benchmarks.bench_email_render
+
+
+def build_meeting(recipients, summary_words, tasks_per_recipient):
+    summary = " ".join(["Decision <about> budget & timeline."] * (summary_words // 5))
+    tasks_by_recipient = {
+        f"Person {i}": [
+            {"task": f"Prepare item {j} for <Person {i}>", "due_date": "Friday"}
+            for j in range(tasks_per_recipient if i % 2 == 0 else 0)
+        ]
+        for i in range(recipients)
+    }
+    return summary, tasks_by_recipient
+
+
+def render_all(summary, tasks_by_recipient, shared):
+    summary_block = render_summary_block(summary)
+    for name, tasks in tasks_by_recipient.items():
+        if not shared:
+            summary_block = render_summary_block.__wrapped__(summary)
+        if tasks:
+            render_task_email(summary_block, tasks, name)
+        else:
+            render_summary_email(summary_block, name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark email rendering")
+    parser.add_argument("--recipients", type=int, default=1000)
+    parser.add_argument("--summary-words", type=int, default=400)
+    parser.add_argument("--tasks", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    summary, tasks_by_recipient = build_meeting(args.recipients, args.summary_words, args.tasks)
+    for label, shared in (("per-recipient summary", False), ("shared summary block", True)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            render_summary_block.cache_clear()
+            start = time.perf_counter()
+            render_all(summary, tasks_by_recipient, shared)
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:>22}: {best * 1000:8.1f} ms total, {best / args.recipients * 1e6:7.1f} us per recipient")
+
+
+if __name__ == "__main__":
+    main()
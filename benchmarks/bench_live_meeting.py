@@ -0,0 +1,75 @@
+import argparse
+import json
+import time
+
+import meeting_analysis
+from benchmarks.bench_task_prefilter import build_roster
+from benchmarks.synthetic import generate_meeting
+from fake_llm import FakeLLMClient
+from live_meeting import LiveMeeting
+from meeting_analysis import estimate_tokens
+
+# Cost of keeping a meeting's summary and tasks current while it is running.
+# The transcript grows by --step-words at a time; after each step the live mode
+# sends only the new text plus its rolling state, while re-analyzing from scratch
+# would send the whole transcript again. Prompt tokens per update should stay
+# flat for live mode and grow linearly for the full re-analysis.
+# Run from the repository root: python -m benchmarks.bench_live_meeting
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental live-meeting updates")
+    parser.add_argument("--words", type=int, default=30000, help="length of the whole meeting")
+    parser.add_argument("--step-words", type=int, default=500, help="words added between updates")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    meeting_analysis.configure(FakeLLMClient())
+    text, actions = generate_meeting(args.words, seed=7)
+    lines = text.split("\n")
+    live = LiveMeeting(build_roster())
+
+    rows = []
+    received, words_in_step = 0, 0
+    for line in lines:
+        received += len(line) + 1
+        words_in_step += len(line.split())
+        if words_in_step < args.step_words and received < len(text):
+            continue
+        words_in_step = 0
+        calls_before = len(live.prompt_tokens)
+        start = time.perf_counter()
+        live.sync((text + "\n")[:received])
+        delta = live.process(final=received >= len(text))
+        rows.append({
+            "transcript_tokens": estimate_tokens(text[:received]),
+            "live_prompt_tokens": sum(live.prompt_tokens[calls_before:]),
+            "calls": delta["calls"],
+            "seconds": time.perf_counter() - start
+        })
+
+    report = {
+        "updates": len(rows),
+        "planted_actions": len(actions),
+        "live_tasks": len(live.tasks),
+        "live_total_prompt_tokens": sum(live.prompt_tokens),
+        "rescan_total_prompt_tokens": sum(row["transcript_tokens"] for row in rows),
+        "live_max_prompt_tokens": max(live.prompt_tokens) if live.prompt_tokens else 0,
+        "rescan_max_prompt_tokens": rows[-1]["transcript_tokens"] if rows else 0,
+        "rows": rows
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{'transcript tokens':>17} {'live prompt tokens':>18} {'calls':>5} {'ms':>7}")
+    for row in rows[::max(1, len(rows) // 15)]:
+        print(f"{row['transcript_tokens']:>17} {row['live_prompt_tokens']:>18} {row['calls']:>5} {row['seconds'] * 1000:>7.1f}")
+    print(
+        f"{report['updates']} updates: live mode sent {report['live_total_prompt_tokens']:,} prompt tokens "
+        f"(max {report['live_max_prompt_tokens']:,} per call), re-analyzing each time would send "
+        f"{report['rescan_total_prompt_tokens']:,} ({report['rescan_total_prompt_tokens'] / max(1, report['live_total_prompt_tokens']):.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import meeting_analysis
+from benchmarks.synthetic import generate_meeting, generate_roster
+from llm_backend import create_backend
+from meeting_analysis import analyze_meeting
+
+# Several attendees analyzing the same meeting at the same moment, against one
+# shared backend with request coalescing on and off. Reports upstream LLM calls
+# and wall time; with coalescing every session should get the same result for
+# the calls of one analysis.
+# Run from the repository root: python -m benchmarks.bench_llm_coalescing
+
+
+def run(sessions, transcript, roster, latency, coalesce):
+    backend = create_backend('fake', fake_latency=latency, coalesce=coalesce)
+    meeting_analysis.configure(backend)
+    upstream = backend.client.chat.completions.create
+    calls = []
+
+    def counting_create(*args, **kwargs):
+        calls.append(1)
+        return upstream(*args, **kwargs)
+    backend.client.chat.completions.create = counting_create
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        results = list(executor.map(lambda _: analyze_meeting(transcript, roster), range(sessions)))
+    return {
+        'coalesce': coalesce,
+        'upstream_calls': len(calls),
+        'seconds': time.perf_counter() - start,
+        'identical_results': all(result[:2] == results[0][:2] for result in results),
+        'backend': backend.stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LLM request coalescing across sessions")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per fake LLM call")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    transcript = generate_meeting(args.words, seed=1)[0]
+    roster = generate_roster(20)
+    rows = [run(args.sessions, transcript, roster, args.latency, coalesce) for coalesce in (False, True)]
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    for row in rows:
+        print(
+            f"coalescing {'on ' if row['coalesce'] else 'off'}: {row['upstream_calls']:>4} upstream calls, "
+            f"{row['seconds']:.2f}s for {args.sessions} sessions, identical results: {row['identical_results']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
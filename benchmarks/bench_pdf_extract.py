@@ -0,0 +1,55 @@
+import argparse
+import io
+import time
+
+import PyPDF2
+
+from benchmarks.synthetic import build_pdf, generate_transcript
+from pdf_extract import extract_pdf_text, iter_pdf_pages
+
+# Compare serial PyPDF2 extraction (the old read_transcript loop) with the
+# page-parallel extractor on synthetic PDFs.
+# Run from the repository root: python -m benchmarks.bench_pdf_extract
+
+
+def serial_extract(data):
+    content = ""
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+    for page_num in range(len(pdf_reader.pages)):
+        content += pdf_reader.pages[page_num].extract_text() + "\n"
+    return content
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def time_first_page(data):
+    start = time.perf_counter()
+    next(iter_pdf_pages(data))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF transcript extraction")
+    parser.add_argument("--words", type=int, nargs="+", default=[20000, 100000, 300000])
+    args = parser.parse_args()
+
+    print(f"{'words':>8} {'pages':>6} {'serial s':>9} {'parallel s':>11} {'speedup':>8} {'first page s':>13}")
+    for words in args.words:
+        data = build_pdf(generate_transcript(words))
+        pages = len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
+        serial_text, serial_seconds = time_call(serial_extract, data)
+        parallel_text, parallel_seconds = time_call(extract_pdf_text, data)
+        assert serial_text == parallel_text, "parallel extraction changed the output"
+        first_page_seconds = time_first_page(data)
+        print(
+            f"{words:>8} {pages:>6} {serial_seconds:>9.2f} {parallel_seconds:>11.2f} "
+            f"{serial_seconds / parallel_seconds:>7.1f}x {first_page_seconds:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
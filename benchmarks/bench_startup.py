@@ -0,0 +1,67 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Cold-start cost of the Streamlit app: how long a fresh interpreter takes to
+# import Streamlit and render the first page, and which heavy dependencies that
+# first render pulls in. Every sample runs in a new process so nothing is warm.
+# Run from the repository root: python -m benchmarks.bench_startup
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+HEAVY_MODULES = ["openai", "pandas", "PyPDF2", "docx", "googleapiclient.discovery", "google_auth_oauthlib.flow"]
+
+SAMPLE_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+app = AppTest.from_file({app_path!r}, default_timeout=60)
+for key in ("key", "id", "project_id", "sec"):
+    app.secrets[key] = "benchmark"
+app.run()
+rendered = time.perf_counter()
+print(json.dumps({{
+    "import_seconds": imported - start,
+    "first_render_seconds": rendered - imported,
+    "exceptions": len(app.exception),
+    "heavy_modules_loaded": [name for name in {heavy!r} if name in sys.modules]
+}}))
+"""
+
+
+def run_sample(cwd):
+    script = SAMPLE_SCRIPT.format(app_path=APP_PATH, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=cwd, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app import and first-render time")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    samples = [run_sample(os.path.dirname(APP_PATH)) for _ in range(args.samples)]
+    result = {
+        "samples": args.samples,
+        "import_seconds_median": statistics.median(s["import_seconds"] for s in samples),
+        "first_render_seconds_median": statistics.median(s["first_render_seconds"] for s in samples),
+        "heavy_modules_loaded": samples[-1]["heavy_modules_loaded"],
+        "exceptions": max(s["exceptions"] for s in samples)
+    }
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"streamlit import:  {result['import_seconds_median']:.3f}s (median of {args.samples})")
+        print(f"first page render: {result['first_render_seconds_median']:.3f}s")
+        print(f"heavy modules loaded on first render: {', '.join(result['heavy_modules_loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import meeting_analysis
+from benchmarks.synthetic import (build_docx, build_pdf, generate_meeting, generate_roster, roster_csv, roster_docx,
+                                  roster_txt)
+from email_templates import build_participant_email, group_recipients
+from fake_llm import FakeLLMClient
+from gmail_delivery import FakeGmailService, deliver_messages
+from meeting_analysis import analyze_meeting
+from meeting_files import read_participants_bytes, read_transcript_bytes
+
+# End-to-end benchmark suite: transcript and roster parsing in every supported
+# format, email rendering, the Gmail send loop and the whole pipeline, all
+# against the fake LLM and Gmail backends so nothing touches the network.
+# Results are written as JSON and can be compared against a stored baseline;
+# a case counts as a regression when its median time grows by more than
+# --threshold (and by more than --min-delta seconds, to ignore timer noise).
+# Run from the repository root:
+#
+#   python -m benchmarks.bench_suite --quick --save-baseline benchmarks/baseline.json
+#   python -m benchmarks.bench_suite --quick --baseline benchmarks/baseline.json --json results.json
+
+TRANSCRIPT_WORDS = [1000, 10000, 100000, 500000]
+ROSTER_ROWS = [10, 1000, 10000, 100000]
+EMAIL_RECIPIENTS = [10, 1000, 10000]
+SEND_MESSAGES = [100, 1000]
+QUICK_TRANSCRIPT_WORDS = [1000, 10000]
+QUICK_ROSTER_ROWS = [10, 1000]
+QUICK_EMAIL_RECIPIENTS = [10, 1000]
+QUICK_SEND_MESSAGES = [100]
+PIPELINE_WORDS, PIPELINE_ROWS = 10000, 100
+
+TRANSCRIPT_FORMATS = {
+    'txt': lambda text: text.encode('utf-8'),
+    'docx': lambda text: build_docx(text.split("\n")),
+    'pdf': build_pdf
+}
+ROSTER_FORMATS = {'csv': roster_csv, 'txt': roster_txt, 'docx': roster_docx}
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA = 0.005
+
+
+# Measures the Gmail engine itself, not Gmail's quota
+class UnlimitedRate:
+    def acquire(self):
+        pass
+
+
+def time_case(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples, units, unit_name):
+    median = statistics.median(samples)
+    return {
+        'median_seconds': median,
+        'min_seconds': min(samples),
+        'samples': len(samples),
+        'units': units,
+        'unit': unit_name,
+        'units_per_second': units / median if median else None
+    }
+
+
+# Tasks for every other participant, as the LLM would return them
+def build_tasks_result(roster):
+    tasks = [
+        {'task': f"Prepare item {i}", 'assignee': person['name'], 'email': person['email'], 'due_date': "Friday"}
+        for i, person in enumerate(roster) if i % 2 == 0
+    ]
+    return {'tasks': tasks}
+
+
+def build_messages(summary, tasks_result, roster):
+    email_to_name, tasks_by_email = group_recipients(roster, tasks_result)
+    messages = []
+    for email, name in email_to_name.items():
+        subject, html = build_participant_email(summary, tasks_by_email.get(email, []), name)
+        messages.append({'to': email, 'subject': subject, 'html': html})
+    return messages
+
+
+def transcript_cases(sizes):
+    for words in sizes:
+        text = generate_meeting(words, seed=words)[0]
+        for fmt, build in TRANSCRIPT_FORMATS.items():
+            data = build(text)
+
+            def read(fmt=fmt, data=data):
+                read_transcript_bytes(fmt, data)
+            yield f"read_transcript[{fmt}-{words}w]", read, words, 'words'
+
+
+def roster_cases(sizes):
+    for rows in sizes:
+        roster = generate_roster(rows, seed=rows)
+        for fmt, build in ROSTER_FORMATS.items():
+            data = build(roster)
+
+            def read(fmt=fmt, data=data):
+                read_participants_bytes(fmt, data)
+            yield f"read_participants[{fmt}-{rows}r]", read, rows, 'rows'
+
+
+def email_cases(sizes):
+    summary = " ".join(["Decision <about> budget & timeline."] * 80)
+    for recipients in sizes:
+        roster = generate_roster(recipients)
+        tasks_result = build_tasks_result(roster)
+
+        def render(roster=roster, tasks_result=tasks_result):
+            build_messages(summary, tasks_result, roster)
+        yield f"render_emails[{recipients}]", render, recipients, 'emails'
+
+
+def send_cases(sizes):
+    for count in sizes:
+        messages = [
+            {'to': f"person{i}@example.com", 'subject': "Meeting Summary", 'html': "<p>Summary</p>" * 50}
+            for i in range(count)
+        ]
+
+        def send(messages=messages):
+            report = deliver_messages(messages, lambda: FakeGmailService(), rate_limiter=UnlimitedRate())
+            assert report.sent == len(messages)
+        yield f"send_loop[{count}]", send, count, 'messages'
+
+
+# Read both files, analyze with the fake LLM, render and send every email
+def pipeline_cases(words, rows):
+    transcript_data = generate_meeting(words, seed=1)[0].encode('utf-8')
+    roster_data = roster_csv(generate_roster(rows))
+
+    def run():
+        meeting_analysis.configure(FakeLLMClient())
+        transcript = read_transcript_bytes('txt', transcript_data)
+        roster = read_participants_bytes('csv', roster_data)
+        summary, tasks_result, _ = analyze_meeting(transcript, roster)
+        messages = build_messages(summary, tasks_result, roster)
+        report = deliver_messages(messages, lambda: FakeGmailService(), rate_limiter=UnlimitedRate())
+        assert report.sent == len(messages)
+    yield f"pipeline[{words}w-{rows}r]", run, words, 'words'
+
+
+def run_suite(quick=False, repeat=3, only=None, log=None):
+    cases = [
+        transcript_cases(QUICK_TRANSCRIPT_WORDS if quick else TRANSCRIPT_WORDS),
+        roster_cases(QUICK_ROSTER_ROWS if quick else ROSTER_ROWS),
+        email_cases(QUICK_EMAIL_RECIPIENTS if quick else EMAIL_RECIPIENTS),
+        send_cases(QUICK_SEND_MESSAGES if quick else SEND_MESSAGES),
+        pipeline_cases(PIPELINE_WORDS, PIPELINE_ROWS)
+    ]
+    results = {}
+    for group in cases:
+        for name, func, units, unit_name in group:
+            if only and not any(pattern in name for pattern in only):
+                continue
+            results[name] = summarize(time_case(func, repeat), units, unit_name)
+            if log:
+                log(name, results[name])
+    return results
+
+
+# Compare median times case by case; cases missing on either side are listed, not judged
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA):
+    comparison = {'regressions': [], 'improvements': [], 'unchanged': [], 'new': [], 'missing': []}
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            comparison['new'].append(name)
+            continue
+        before, after = previous['median_seconds'], current['median_seconds']
+        entry = {'case': name, 'baseline_seconds': before, 'seconds': after, 'ratio': after / before if before else None}
+        if after > before * (1 + threshold) and after - before > min_delta:
+            comparison['regressions'].append(entry)
+        elif before > after * (1 + threshold) and before - after > min_delta:
+            comparison['improvements'].append(entry)
+        else:
+            comparison['unchanged'].append(entry)
+    comparison['missing'] = sorted(set(baseline) - set(results))
+    return comparison
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds')
+    }
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def print_case(name, result):
+    line = f"{name:<36} {result['median_seconds'] * 1000:>10.1f} ms"
+    if result['units_per_second']:
+        line += f"  {result['units_per_second']:>14,.0f} {result['unit']}/s"
+    print(line, file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end benchmark suite with fake LLM and Gmail backends")
+    parser.add_argument('--quick', action='store_true', help="small sizes only, for CI")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per case; the median is reported")
+    parser.add_argument('--only', nargs='+', help="run only cases whose name contains one of these strings")
+    parser.add_argument('--json', help="write results to this file ('-' for stdout)")
+    parser.add_argument('--baseline', help="compare against results saved with --save-baseline")
+    parser.add_argument('--save-baseline', help="store these results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown that counts as a regression")
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA,
+                        help="ignore differences smaller than this many seconds")
+    args = parser.parse_args(argv)
+
+    report = {
+        'environment': environment(),
+        'settings': {'quick': args.quick, 'repeat': args.repeat},
+        'results': run_suite(args.quick, args.repeat, args.only, log=print_case)
+    }
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['comparison'] = compare(report['results'], baseline['results'], args.threshold, args.min_delta)
+        for entry in report['comparison']['regressions']:
+            print(f"REGRESSION {entry['case']}: {entry['baseline_seconds'] * 1000:.1f} ms -> "
+                  f"{entry['seconds'] * 1000:.1f} ms ({entry['ratio']:.2f}x)", file=sys.stderr)
+        for entry in report['comparison']['improvements']:
+            print(f"improved   {entry['case']}: {entry['baseline_seconds'] * 1000:.1f} ms -> "
+                  f"{entry['seconds'] * 1000:.1f} ms ({entry['ratio']:.2f}x)", file=sys.stderr)
+
+    if args.json == '-':
+        print(json.dumps(report, indent=2))
+    elif args.json:
+        write_json(args.json, report)
+    if args.save_baseline:
+        write_json(args.save_baseline, report)
+
+    return 1 if report.get('comparison', {}).get('regressions') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
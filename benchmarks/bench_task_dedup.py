@@ -0,0 +1,89 @@
+import argparse
+import json
+import random
+import time
+
+from benchmarks.synthetic import generate_roster
+from task_dedup import merge_duplicate_tasks
+
+# Near-duplicate task merging on batch-sized task lists. Each distinct action item
+# is planted once and then restated a few times with other wording and deadlines,
+# the way a long meeting repeats it; the merge should collapse every group back to
+# one task per action item and stay in milliseconds for thousands of tasks.
+# Run from the repository root: python -m benchmarks.bench_task_dedup
+
+ACTIONS = [
+    "prepare the financial projections", "share the campaign budget with the team",
+    "coordinate with marketing on the launch", "send the updated roadmap", "review the hiring plan",
+    "summarize the customer feedback survey", "book the venue for the offsite", "draft the press release",
+    "fix the login timeout bug", "update the onboarding checklist", "schedule interviews for the designer role",
+    "audit the vendor contracts"
+]
+PROJECTS = [
+    "Atlas", "Beacon", "Cobalt", "Delta", "Ember", "Falcon", "Granite", "Harbor", "Indigo", "Juniper",
+    "Keystone", "Lantern", "Meridian", "Nimbus", "Orchid", "Pioneer", "Quartz", "Redwood", "Summit", "Tundra"
+]
+RESTATEMENTS = ["{name} will {action}", "{name}, we need you to {action}", "Please {action}", "Make sure to {action} ASAP"]
+DUE_DATES = ["Not specified", "next week", "Friday", "May 12"]
+
+
+# Returns the tasks and how many distinct action items they contain. About
+# --tasks-per-person tasks go to each person, as in a batch of many meetings.
+def generate_tasks(count, seed=0, tasks_per_person=10, repeats=3):
+    rng = random.Random(seed)
+    # Enough people that each can take a distinct set of actions
+    roster = generate_roster(max(count // tasks_per_person, count // len(ACTIONS) + 1), seed)
+    tasks, planted = [], set()
+    while len(tasks) < count:
+        person = rng.choice(roster)
+        verb = rng.choice(ACTIONS)
+        # Lexical similarity can't tell "projections for Atlas" from "projections for Beacon"
+        # when both go to the same person, so each person gets each action once
+        if (person["email"], verb) in planted:
+            continue
+        planted.add((person["email"], verb))
+        action = f"{verb} for {rng.choice(PROJECTS)}"
+        for mention in range(rng.randint(1, repeats)):
+            tasks.append({
+                "task": rng.choice(RESTATEMENTS).format(name=person["name"].split()[0], action=action),
+                "assignee": person["name"],
+                "email": person["email"],
+                "due_date": rng.choice(DUE_DATES),
+                "context": f"Mentioned {mention + 1} time(s)",
+                "action": action
+            })
+    rng.shuffle(tasks)
+    tasks = tasks[:count]
+    return tasks, len({(task["email"], task["action"]) for task in tasks})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate task merging")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--tasks-per-person", type=int, default=10)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rows = []
+    for count in args.tasks:
+        tasks, distinct = generate_tasks(count, tasks_per_person=args.tasks_per_person)
+        start = time.perf_counter()
+        merged, merged_count = merge_duplicate_tasks(tasks)
+        rows.append({
+            "tasks": count,
+            "distinct_actions": distinct,
+            "after_merge": len(merged),
+            "merged": merged_count,
+            "ms": (time.perf_counter() - start) * 1000
+        })
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'tasks':>7} {'distinct':>8} {'after merge':>11} {'ms':>8}")
+    for row in rows:
+        print(f"{row['tasks']:>7} {row['distinct_actions']:>8} {row['after_merge']:>11} {row['ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
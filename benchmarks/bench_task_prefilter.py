@@ -0,0 +1,98 @@
+import argparse
+import json
+import time
+
+import meeting_analysis
+from benchmarks.synthetic import FIRST_NAMES, LAST_NAMES, generate_meeting
+from fake_llm import FakeLLMClient
+from meeting_analysis import estimate_tokens, extract_tasks_and_assign
+from roster_index import RosterIndex
+from transcript_model import prefilter_transcript
+
+# Recall and cost of the action-item pre-filter against the full-transcript path.
+# Recall is the share of planted action sentences that survive the pre-filter,
+# and the share of tasks the (fake) model finds in the full transcript that it
+# also finds in the pre-filtered one. Token counts use the same ~4 chars/token
+# estimate as the app; latency uses a fake model that charges per input token.
+# Run from the repository root: python -m benchmarks.bench_task_prefilter
+
+
+# Fake client whose latency grows with prompt size, like a real model's prefill
+class TokenPricedClient(FakeLLMClient):
+    def __init__(self, seconds_per_1k_tokens):
+        super().__init__()
+        self.seconds_per_1k_tokens = seconds_per_1k_tokens
+
+    def create(self, model, messages, **kwargs):
+        tokens = sum(estimate_tokens(message["content"]) for message in messages)
+        time.sleep(tokens / 1000 * self.seconds_per_1k_tokens)
+        return super().create(model, messages, **kwargs)
+
+
+def build_roster():
+    return [
+        {"name": f"{first} {last}", "email": f"{first.lower()}@example.com", "expertise": "Planning"}
+        for first, last in zip(FIRST_NAMES, LAST_NAMES)
+    ]
+
+
+def task_keys(result):
+    return {(task["task"].lower(), task["assignee"]) for task in result["tasks"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the task-extraction pre-filter")
+    parser.add_argument("--words", type=int, nargs="+", default=[5000, 50000, 200000])
+    parser.add_argument("--action-rate", type=float, default=0.05)
+    parser.add_argument("--seconds-per-1k-tokens", type=float, default=0.002)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    participants = build_roster()
+    roster_index = RosterIndex(participants)
+    meeting_analysis.configure(TokenPricedClient(args.seconds_per_1k_tokens))
+
+    rows = []
+    for words in args.words:
+        text, actions = generate_meeting(words, action_rate=args.action_rate)
+
+        start = time.perf_counter()
+        candidate_text = prefilter_transcript(text, roster_index)
+        prefilter_seconds = time.perf_counter() - start
+        kept = sum(1 for action in actions if action in candidate_text)
+
+        start = time.perf_counter()
+        full = extract_tasks_and_assign(text, participants, roster_index, prefilter=False)
+        full_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        filtered = extract_tasks_and_assign(text, participants, roster_index, prefilter=True)
+        filtered_seconds = time.perf_counter() - start
+
+        full_tasks = task_keys(full)
+        rows.append({
+            "words": words,
+            "planted_actions": len(actions),
+            "action_recall": kept / len(actions) if actions else 1.0,
+            "task_recall": len(full_tasks & task_keys(filtered)) / len(full_tasks) if full_tasks else 1.0,
+            "tokens_full": estimate_tokens(text),
+            "tokens_prefiltered": estimate_tokens(candidate_text),
+            "prefilter_seconds": prefilter_seconds,
+            "extract_seconds_full": full_seconds,
+            "extract_seconds_prefiltered": filtered_seconds
+        })
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'words':>7} {'actions':>7} {'recall':>7} {'task recall':>11} {'tokens':>16} {'reduction':>9} {'latency s':>15}")
+    for row in rows:
+        print(
+            f"{row['words']:>7} {row['planted_actions']:>7} {row['action_recall']:>7.1%} {row['task_recall']:>11.1%} "
+            f"{row['tokens_full']:>7} -> {row['tokens_prefiltered']:>6} "
+            f"{row['tokens_full'] / row['tokens_prefiltered']:>8.1f}x "
+            f"{row['extract_seconds_full']:>6.2f} -> {row['extract_seconds_prefiltered']:>5.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import io
+import random
+import zipfile
+
+# Synthetic meeting documents for benchmarks. Everything is generated from a
+# seed so runs are repeatable, and files are built with the standard library only.
+
+FIRST_NAMES = ["John", "Sarah", "Ahmed", "Alex", "Maria", "Wei", "Priya", "Tom", "Fatima", "Lucas"]
+LAST_NAMES = ["Smith", "Johnson", "Khan", "Garcia", "Chen", "Patel", "Brown", "Ali", "Silva", "Novak"]
+FILLER_WORDS = (
+    "we need to review the budget forecast and align on the launch timeline before the next "
+    "planning session while keeping the customer feedback and hiring plan in mind for the quarter"
+).split()
+ACTION_SENTENCES = [
+    "I'll prepare the financial projections by Wednesday.",
+    "Can you share the campaign budget with the team by Friday?",
+    "{name}, please coordinate with marketing on the launch.",
+    "I will send the updated roadmap before Monday's meeting.",
+]
+
+
+# Build a transcript of roughly `words` words as speaker turns.
+# Returns the text and the action-item sentences planted in it.
+def generate_meeting(words, seed=0, speakers=8, action_rate=0.15):
+    rng = random.Random(seed)
+    names = [FIRST_NAMES[i % len(FIRST_NAMES)] for i in range(speakers)]
+    lines = ["Meeting Title: Synthetic Planning Session", "Date: May 4, 2023", ""]
+    actions = []
+    count = 0
+    while count < words:
+        speaker = rng.choice(names)
+        turn = rng.choices(FILLER_WORDS, k=rng.randint(15, 60))
+        sentence = " ".join(turn)
+        sentence = f"{sentence[0].upper()}{sentence[1:]}."
+        if rng.random() < action_rate:
+            action = rng.choice(ACTION_SENTENCES).format(name=rng.choice(names))
+            actions.append(action)
+            sentence = f"{sentence} {action}"
+        lines.append(f"{speaker}: {sentence}")
+        count += len(sentence.split()) + 1
+    return "\n".join(lines), actions
+
+
+def generate_transcript(words, seed=0, speakers=8):
+    return generate_meeting(words, seed, speakers)[0]
+
+
+EXPERTISE = ["Marketing", "Finance", "Engineering", "Design", "Sales", "Legal", "Operations", "Research"]
+
+
+# Build a roster of `rows` participants with unique names and emails
+def generate_roster(rows, seed=0):
+    rng = random.Random(seed)
+    roster = []
+    for i in range(rows):
+        first = FIRST_NAMES[i % len(FIRST_NAMES)]
+        last = f"{LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]}{i // (len(FIRST_NAMES) * len(LAST_NAMES)) or ''}"
+        roster.append({
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}@example.com",
+            "expertise": rng.choice(EXPERTISE)
+        })
+    return roster
+
+
+# Serialize a roster in each format read_participants_bytes accepts
+def roster_csv(roster):
+    lines = ["name,email,expertise"] + [f"{p['name']},{p['email']},{p['expertise']}" for p in roster]
+    return "\n".join(lines).encode("utf-8")
+
+
+def roster_txt(roster):
+    return "\n".join(f"{p['name']}, {p['email']}, {p['expertise']}" for p in roster).encode("utf-8")
+
+
+def roster_docx(roster):
+    rows = [["Name", "Email", "Expertise"]] + [[p["name"], p["email"], p["expertise"]] for p in roster]
+    return build_docx([], rows)
+
+
+def _escape_pdf_text(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+# Wrap text into lines no longer than `width` characters
+def _wrap(text, width):
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            if line and len(line) + len(word) + 1 > width:
+                lines.append(line)
+                line = word
+            else:
+                line = f"{line} {word}" if line else word
+        lines.append(line)
+    return lines
+
+
+# Build a text-only PDF with one Helvetica page per 60 wrapped lines
+def build_pdf(text, lines_per_page=60, width=95):
+    lines = _wrap(text, width)
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[""]]
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page_lines in pages:
+        stream = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(
+            f"({_escape_pdf_text(line)}) Tj T*" for line in page_lines
+        ) + " ET"
+        stream_bytes = stream.encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream_bytes), stream_bytes))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(output)
+
+
+def _escape_xml(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _docx_paragraph(text):
+    return f'<w:p><w:r><w:t xml:space="preserve">{_escape_xml(text)}</w:t></w:r></w:p>'
+
+
+# Build a minimal DOCX from paragraphs and, optionally, a table of rows
+def build_docx(paragraphs, table_rows=None):
+    body = [_docx_paragraph(text) for text in paragraphs]
+    if table_rows:
+        rows = "".join(
+            "<w:tr>" + "".join(f"<w:tc>{_docx_paragraph(cell)}</w:tc>" for cell in row) + "</w:tr>"
+            for row in table_rows
+        )
+        body.append(f"<w:tbl>{rows}</w:tbl>")
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{"".join(body)}</w:body></w:document>'
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'
+    )
+    rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", content_types)
+        archive.writestr("_rels/.rels", rels)
+        archive.writestr("word/document.xml", document)
+    return output.getvalue()
@@ -0,0 +1,94 @@
+import io
+import xml.etree.ElementTree as ET
+import zipfile
+
+# Streaming DOCX text extraction.
+# Reads word/document.xml straight out of the zip with iterparse instead of
+# building python-docx's object model. Body paragraphs and table rows are yielded
+# in document order, and finished elements are cleared as we go, so memory stays
+# bounded by the largest single table rather than the whole document.
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+
+# Yield ('paragraph', text) for body paragraphs and ('row', [cell texts]) for table rows.
+# Nested tables are flattened into the text of the cell that contains them.
+def iter_docx_blocks(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive, archive.open("word/document.xml") as xml:
+        body = None
+        table_depth = 0
+        fallback_depth = 0
+        row = None
+        cell = None
+        # Paragraphs can nest (text boxes), so keep one buffer per open paragraph
+        paragraphs = []
+
+        for event, elem in ET.iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+
+            if event == "start":
+                if tag == W + "body":
+                    body = elem
+                elif tag == MC_FALLBACK:
+                    # Fallback content duplicates the preferred AlternateContent choice
+                    fallback_depth += 1
+                elif fallback_depth:
+                    continue
+                elif tag == W + "p":
+                    paragraphs.append([])
+                elif tag == W + "tbl":
+                    table_depth += 1
+                elif tag == W + "tr" and table_depth == 1:
+                    row = []
+                elif tag == W + "tc" and table_depth == 1:
+                    cell = []
+                continue
+
+            if tag == MC_FALLBACK:
+                fallback_depth -= 1
+                elem.clear()
+                continue
+            if fallback_depth:
+                continue
+
+            if tag == W + "t":
+                if paragraphs:
+                    paragraphs[-1].append(elem.text or "")
+            elif tag == W + "tab":
+                if paragraphs:
+                    paragraphs[-1].append("\t")
+            elif tag in (W + "br", W + "cr"):
+                if paragraphs:
+                    paragraphs[-1].append("\n")
+            elif tag == W + "p":
+                text = "".join(paragraphs.pop())
+                if paragraphs:
+                    paragraphs[-1].append("\n" + text)
+                elif cell is not None:
+                    cell.append(text)
+                else:
+                    yield "paragraph", text
+                elem.clear()
+            elif tag == W + "tc" and table_depth == 1:
+                row.append("\n".join(cell).strip())
+                cell = None
+            elif tag == W + "tr" and table_depth == 1:
+                yield "row", row
+                row = None
+                elem.clear()
+            elif tag == W + "tbl":
+                table_depth -= 1
+                elem.clear()
+
+            # Drop finished top-level blocks so the tree never grows with the document
+            if body is not None and not paragraphs and table_depth == 0 and len(body):
+                body.clear()
+
+
+# Document text with one line per paragraph and table cells separated by tabs
+def extract_docx_text(data):
+    lines = []
+    for kind, value in iter_docx_blocks(data):
+        lines.append(value if kind == "paragraph" else "\t".join(value))
+    return "\n".join(lines)
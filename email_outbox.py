@@ -0,0 +1,289 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from gmail_delivery import (DEFAULT_MAX_WORKERS, DEFAULT_SEND_BURST, DEFAULT_SEND_RATE, DeliveryReport, TokenBucket,
+                            deliver_messages)
+from telemetry import span
+
+# Durable outbox for participant emails.
+# Every rendered email is recorded before anything is sent, under an idempotency
+# key built from the meeting, the recipient and the content. Enqueuing the same
+# email again is a no-op, so clicking "Send All Emails" twice, or re-running a
+# batch, never sends it twice. An OutboxSender drains the outbox on a background
+# thread, independent of Streamlit reruns and browser sessions, and picks up
+# whatever is left after a crash or restart.
+#
+# A message is claimed for a lease before it is sent. If the process dies after
+# Gmail accepted the message but before it was marked sent, the lease runs out
+# and the message is claimed again; it carries a Message-ID derived from its key,
+# so the sender first asks Gmail whether it is already in Sent instead of
+# sending it blind. When that can't be checked it is marked failed for a manual
+# retry, never re-sent automatically. Only such interrupted sends are looked up:
+# messages that failed with an answer from Gmail, or that a user chose to retry,
+# are simply sent again.
+# Same connection-per-operation SQLite approach as llm_cache.LLMCache.
+
+OUTBOX_BATCH_SIZE = 50
+# Long enough for a batch to go out at Gmail's rate limit, with room for retries
+OUTBOX_LEASE_SECONDS = 300
+# The background sender also wakes up this often to pick up expired leases
+OUTBOX_POLL_SECONDS = 15
+MESSAGE_ID_DOMAIN = "meeting-monitor"
+UNKNOWN_DELIVERY_ERROR = "Interrupted while sending and Gmail could not confirm delivery; retry to send again"
+
+
+def content_hash(subject, html):
+    return hashlib.sha256(f"{subject}\0{html}".encode('utf-8')).hexdigest()
+
+
+# Idempotency key of one email: same meeting, recipient and content means same key
+def message_key(meeting_key, recipient, subject, html):
+    payload = f"{meeting_key}\0{recipient.strip().lower()}\0{content_hash(subject, html)}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# Message-ID header for a key, without the angle brackets (the form Gmail's rfc822msgid: search takes)
+def message_id_for(key):
+    return f"{key}@{MESSAGE_ID_DOMAIN}"
+
+
+# Gmail id of a message already in the mailbox with this Message-ID, or None
+def find_sent_message(service, message_id):
+    result = service.users().messages().list(userId='me', q=f"rfc822msgid:{message_id}").execute()
+    messages = result.get('messages') or []
+    return messages[0].get('id') if messages else None
+
+
+class EmailOutbox:
+    def __init__(self, path):
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY,
+                    key TEXT NOT NULL UNIQUE,
+                    meeting_key TEXT NOT NULL,
+                    recipient TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    html TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    gmail_id TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    lease_until REAL
+                );
+                CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status, id);
+                CREATE INDEX IF NOT EXISTS outbox_meeting ON outbox (meeting_key, status);
+            """)
+
+    def _connect(self):
+        # isolation_level=None so claim() can take the write lock up front with BEGIN IMMEDIATE
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    # Record messages (dicts with 'to', 'subject' and 'html') for sending. Messages
+    # already in the outbox, in any state, are left alone.
+    def enqueue(self, meeting_key, messages):
+        now = time.time()
+        rows = [
+            (message_key(meeting_key, m['to'], m['subject'], m['html']), meeting_key, m['to'], m['subject'], m['html'], now, now)
+            for m in messages
+        ]
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.total_changes
+            conn.executemany(
+                """INSERT OR IGNORE INTO outbox (key, meeting_key, recipient, subject, html, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+            queued = conn.total_changes - before
+            conn.execute("COMMIT")
+        return {'queued': queued, 'duplicates': len(rows) - queued}
+
+    # Atomically take up to `limit` messages that are pending, or whose sender's lease
+    # ran out, so concurrent senders (threads or processes) never get the same message.
+    # The latter come back with 'interrupted' set: they may have gone out already.
+    def claim(self, limit=OUTBOX_BATCH_SIZE, lease_seconds=OUTBOX_LEASE_SECONDS, meeting_key=None):
+        now = time.time()
+        condition = "(status = 'pending' OR (status = 'sending' AND lease_until < ?))"
+        params = [now]
+        if meeting_key is not None:
+            condition += " AND meeting_key = ?"
+            params.append(meeting_key)
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    f"SELECT id, key, meeting_key, recipient, subject, html, attempts, status FROM outbox WHERE {condition} ORDER BY id LIMIT ?",
+                    (*params, limit)
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE outbox SET status = 'sending', attempts = attempts + 1, lease_until = ?, updated_at = ? WHERE id = ?",
+                    [(now + lease_seconds, now, row[0]) for row in rows]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return [
+            {
+                'id': r[0], 'key': r[1], 'meeting_key': r[2], 'to': r[3], 'subject': r[4], 'html': r[5],
+                'message_id': message_id_for(r[1]), 'attempts': r[6] + 1, 'interrupted': r[7] == 'sending'
+            }
+            for r in rows
+        ]
+
+    # Settle a message returned by claim(). Each claim bumps attempts, so the claim's
+    # attempt number is its lease: once the lease ran out and another sender claimed
+    # the message, this one no longer owns it and nothing is changed. Returns whether
+    # the message was updated.
+    def mark_sent(self, message, gmail_id=None):
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                """UPDATE outbox SET status = 'sent', gmail_id = ?, last_error = NULL, lease_until = NULL, updated_at = ?
+                   WHERE id = ? AND status = 'sending' AND attempts = ?""",
+                (gmail_id, time.time(), message['id'], message['attempts'])
+            ).rowcount == 1
+
+    def mark_failed(self, message, error):
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                """UPDATE outbox SET status = 'failed', last_error = ?, lease_until = NULL, updated_at = ?
+                   WHERE id = ? AND status = 'sending' AND attempts = ?""",
+                (str(error)[:500], time.time(), message['id'], message['attempts'])
+            ).rowcount == 1
+
+    # Put failed messages back in the queue; returns how many. They are sent again
+    # without the Sent-folder lookup, which may be what kept failing.
+    def retry_failed(self, meeting_key=None):
+        query = "UPDATE outbox SET status = 'pending', updated_at = ? WHERE status = 'failed'"
+        params = [time.time()]
+        if meeting_key is not None:
+            query += " AND meeting_key = ?"
+            params.append(meeting_key)
+        with closing(self._connect()) as conn:
+            return conn.execute(query, params).rowcount
+
+    # Message counts by status ('pending', 'sending', 'sent', 'failed')
+    def status(self, meeting_key=None):
+        query = "SELECT status, COUNT(*) FROM outbox"
+        params = ()
+        if meeting_key is not None:
+            query += " WHERE meeting_key = ?"
+            params = (meeting_key,)
+        with closing(self._connect()) as conn:
+            counts = dict(conn.execute(query + " GROUP BY status", params).fetchall())
+        return {name: counts.get(name, 0) for name in ('pending', 'sending', 'sent', 'failed')}
+
+    def failures(self, meeting_key=None, limit=100):
+        query = "SELECT recipient, last_error, attempts FROM outbox WHERE status = 'failed'"
+        params = []
+        if meeting_key is not None:
+            query += " AND meeting_key = ?"
+            params.append(meeting_key)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query + " ORDER BY id LIMIT ?", (*params, limit)).fetchall()
+        return [{'to': r[0], 'error': r[1], 'attempts': r[2]} for r in rows]
+
+
+# Drains an EmailOutbox through the concurrent delivery engine, either inline with
+# drain() or on a background thread with start()/wake(). One sender per process,
+# so its token bucket paces every send against the Gmail user's quota.
+class OutboxSender:
+    def __init__(self, outbox, service_factory=None, max_workers=DEFAULT_MAX_WORKERS, rate_limiter=None,
+                 batch_size=OUTBOX_BATCH_SIZE, lease_seconds=OUTBOX_LEASE_SECONDS):
+        self.outbox = outbox
+        self.service_factory = service_factory
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter or TokenBucket(DEFAULT_SEND_RATE, DEFAULT_SEND_BURST)
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.last_error = None
+        self._wake = threading.Event()
+        self._thread = None
+
+    # Send everything claimable (only this meeting's messages if meeting_key is given)
+    def drain(self, meeting_key=None):
+        report = DeliveryReport(0)
+        start = time.perf_counter()
+        while True:
+            service_factory = self.service_factory
+            if service_factory is None:
+                break
+            batch = self.outbox.claim(self.batch_size, self.lease_seconds, meeting_key)
+            if not batch:
+                break
+            report.total += len(batch)
+            batch = self._skip_already_sent(batch, service_factory, report)
+
+            def on_result(done, total, message, success, result):
+                if success:
+                    self.outbox.mark_sent(message, (result or {}).get('id'))
+                else:
+                    self.outbox.mark_failed(message, result)
+
+            with span("outbox.batch", messages=len(batch)):
+                batch_report = deliver_messages(batch, service_factory, max_workers=self.max_workers,
+                                                rate_limiter=self.rate_limiter, on_result=on_result)
+            report.sent += batch_report.sent
+            report.failed += batch_report.failed
+            report.errors.extend(batch_report.errors)
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    # Messages whose last send was interrupted may have gone out just before a crash:
+    # look them up by Message-ID instead of sending them again
+    def _skip_already_sent(self, batch, service_factory, report):
+        retried = [message for message in batch if message['interrupted']]
+        if not retried:
+            return batch
+        skipped = set()
+        service = service_factory()
+        for message in retried:
+            try:
+                gmail_id = find_sent_message(service, message['message_id'])
+            except Exception:
+                gmail_id = None
+                self.outbox.mark_failed(message, UNKNOWN_DELIVERY_ERROR)
+                report.failed += 1
+                report.errors.append((message['to'], UNKNOWN_DELIVERY_ERROR))
+                skipped.add(message['id'])
+                continue
+            if gmail_id:
+                self.outbox.mark_sent(message, gmail_id)
+                report.sent += 1
+                skipped.add(message['id'])
+        return [message for message in batch if message['id'] not in skipped]
+
+    # Run drain() on a daemon thread whenever woken, and every OUTBOX_POLL_SECONDS
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="email-outbox-sender", daemon=True)
+            self._thread.start()
+        return self
+
+    # Ask the background thread to drain now, optionally with a new Gmail client factory
+    def wake(self, service_factory=None, max_workers=None):
+        if service_factory is not None:
+            self.service_factory = service_factory
+        if max_workers is not None:
+            self.max_workers = max_workers
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(OUTBOX_POLL_SECONDS)
+            self._wake.clear()
+            try:
+                self.drain()
+                self.last_error = None
+            except Exception as e:
+                # Keep the thread alive; claimed messages are picked up again once their lease expires
+                self.last_error = str(e)
+                print(f"Email outbox sender error: {str(e)}")
@@ -0,0 +1,180 @@
+import html
+from functools import lru_cache
+from string import Template
+
+# Email templates for meeting summaries and action items.
+# Templates are compiled once at import. The summary block is identical for every
+# recipient of a meeting, so it is escaped and rendered once and reused; only the
+# greeting and the task list are filled in per recipient. All LLM output is
+# HTML-escaped before it is placed in an email.
+
+EMAIL_STYLES = """
+            body {
+                font-family: Arial, sans-serif;
+                line-height: 1.6;
+                color: #333;
+                max-width: 650px;
+                margin: 0 auto;
+            }
+            .header {
+                background-color: #1E40AF;
+                color: white;
+                padding: 20px;
+                text-align: center;
+                border-radius: 5px 5px 0 0;
+            }
+            .content {
+                padding: 20px;
+                background-color: #f9f9f9;
+                border: 1px solid #ddd;
+            }
+            .summary {
+                background-color: #EFF6FF;
+                padding: 15px;
+                border-left: 5px solid #3B82F6;
+                margin-bottom: 20px;
+            }
+            .task {
+                background-color: #F3F4F6;
+                padding: 15px;
+                margin-bottom: 10px;
+                border-left: 5px solid #6B7280;
+            }
+            .footer {
+                text-align: center;
+                padding: 15px;
+                font-size: 0.8em;
+                color: #666;
+                border-top: 1px solid #ddd;
+            }"""
+
+EMAIL_TEMPLATE = Template("""
+    <html>
+    <head>
+        <style>$styles
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h2>$title</h2>
+        </div>
+        <div class="content">
+            <p>Hello $person_name,</p>
+
+            <p>$intro</p>
+
+            <h3>Meeting Summary</h3>
+            <div class="summary">
+                $summary_block
+            </div>
+            $body
+            <p>Best regards,<br>Meeting Coordinator</p>
+        </div>
+        <div class="footer">
+            This email was automatically generated by the Meeting Minutes Analyzer.
+        </div>
+    </body>
+    </html>
+    """)
+
+TASK_TEMPLATE = Template("""
+            <div class="task">
+                <strong>Task:</strong> $task<br>
+                <strong>Due Date:</strong> $due_date
+            </div>
+            """)
+
+NO_TASKS_HTML = "<p>No specific action items were assigned to you from this meeting.</p>"
+
+
+# Pre-fill the parts shared by every email of one kind, leaving the per-meeting
+# and per-recipient fields as placeholders
+def _partial(template, **values):
+    placeholders = {name: f"${name}" for name in ("person_name", "summary_block", "body")}
+    placeholders.update(values)
+    return Template(template.safe_substitute(placeholders))
+
+
+TASK_EMAIL_TEMPLATE = _partial(
+    EMAIL_TEMPLATE,
+    styles=EMAIL_STYLES,
+    title="Meeting Summary &amp; Action Items",
+    intro="Below you'll find a summary of our recent meeting and your assigned action items."
+)
+SUMMARY_EMAIL_TEMPLATE = _partial(
+    EMAIL_TEMPLATE,
+    styles=EMAIL_STYLES,
+    title="Meeting Summary",
+    intro="Below you'll find a summary of our recent meeting."
+)
+
+
+# Escaped summary HTML, rendered once per meeting and shared by every recipient
+@lru_cache(maxsize=32)
+def render_summary_block(summary):
+    return html.escape(summary or "").replace('\n', '<br>')
+
+
+def render_task_list(tasks):
+    if not tasks:
+        return NO_TASKS_HTML
+    return "".join(
+        TASK_TEMPLATE.substitute(
+            task=html.escape(str(task.get('task', 'No description'))),
+            due_date=html.escape(str(task.get('due_date', 'Not specified')))
+        )
+        for task in tasks
+    )
+
+
+def render_task_email(summary_block, tasks, person_name):
+    return TASK_EMAIL_TEMPLATE.substitute(
+        person_name=html.escape(person_name or ""),
+        summary_block=summary_block,
+        body="\n            <h3>Your Action Items</h3>\n            " + render_task_list(tasks)
+    )
+
+
+def render_summary_email(summary_block, person_name):
+    return SUMMARY_EMAIL_TEMPLATE.substitute(
+        person_name=html.escape(person_name or ""),
+        summary_block=summary_block,
+        body=""
+    )
+
+
+# Full task email for one recipient
+def generate_task_email(summary, tasks, person_name):
+    return render_task_email(render_summary_block(summary), tasks, person_name)
+
+
+# Summary-only email for recipients without assigned tasks
+def generate_summary_email(summary, person_name):
+    return render_summary_email(render_summary_block(summary), person_name)
+
+
+# Subject and HTML for one recipient: task email if they have tasks, otherwise summary only
+def build_participant_email(summary, tasks, person_name):
+    if tasks:
+        return "Meeting Action Items", generate_task_email(summary, tasks, person_name)
+    return "Meeting Summary", generate_summary_email(summary, person_name)
+
+
+# Map every valid participant email to their name, and group tasks by assignee email
+def group_recipients(participants, tasks_result):
+    email_to_name = {}
+    tasks_by_email = {}
+
+    for participant in participants or []:
+        email = participant.get("email", "")
+        if email and "@" in email:
+            email_to_name[email] = participant.get("name", "")
+
+    for task in (tasks_result or {}).get("tasks") or []:
+        email = task.get("email", "")
+        # Skip if email is empty or invalid
+        if not email or "@" not in email:
+            continue
+        tasks_by_email.setdefault(email, []).append(task)
+
+    return email_to_name, tasks_by_email
@@ -0,0 +1,184 @@
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+from transcript_model import Transcript
+
+# Local stand-in for the OpenAI chat completions API.
+# Responses are derived deterministically from the prompt, so batch runs and
+# benchmarks can exercise the whole pipeline without network access or cost.
+# Summaries echo the opening of the text; task extraction turns commitment
+# sentences ("I'll ...", "please ...") into tasks for the speaker or addressee.
+
+COMMITMENT_PATTERN = re.compile(r"\b(I'll|I will|we will|please|need to|can you)\b", re.IGNORECASE)
+ROSTER_LINE_PATTERN = re.compile(r"^\s*-\s*([^:]+):")
+DONE_PATTERN = re.compile(r"\b(I'm done with|I finished|I've finished|is done|is finished)\b", re.IGNORECASE)
+OPEN_TASK_PATTERN = re.compile(r"^\s*-\s*\[([^\]]+)\].*\(assignee: ([^,]+),")
+
+
+# (speaker, what was said) for each speaker turn, with the turn's lines joined
+def _speaker_turns(text):
+    transcript = Transcript(text)
+    for index in range(len(transcript)):
+        if transcript.speaker(index):
+            yield transcript.speaker(index), " ".join(transcript.body_text(index).split())
+
+
+def _section(text, start_marker, end_marker):
+    start = text.find(start_marker)
+    if start < 0:
+        return text
+    start += len(start_marker)
+    end = text.find(end_marker, start)
+    return text[start:end if end >= 0 else len(text)]
+
+
+# Map first names and full names in the prompt's team list to the full name
+def _roster_lookup(prompt):
+    lookup = {}
+    for line in _section(prompt, "Team Members", "If someone is mentioned").splitlines():
+        match = ROSTER_LINE_PATTERN.match(line)
+        if match:
+            name = match.group(1).strip()
+            lookup[name.lower()] = name
+            lookup.setdefault(name.split()[0].lower(), name)
+    return lookup
+
+
+def fake_tasks(prompt, transcript_marker="Meeting Transcript:"):
+    roster = _roster_lookup(prompt)
+    transcript = _section(prompt, transcript_marker, "Team Members")
+    # A continuation after a cut-off response lists the tasks already returned
+    extracted = _section(prompt, "These tasks were already extracted:", "Return a JSON") if "already extracted:" in prompt else ""
+    tasks = []
+    for speaker, text in _speaker_turns(transcript):
+        if not COMMITMENT_PATTERN.search(text):
+            continue
+        # "Name, please ..." is addressed to Name; otherwise the speaker committed
+        addressee = text.split(",")[0].strip().lower()
+        assignee = roster.get(addressee) or roster.get(speaker.lower()) or "Unassigned"
+        sentence = COMMITMENT_PATTERN.split(text, maxsplit=1)
+        task = (sentence[-1] if len(sentence) > 1 else text).strip(" .") or text
+        if extracted and f"- {task} ({assignee})" in extracted:
+            continue
+        tasks.append({
+            "task": task,
+            "assignee": assignee,
+            "due_date": "Not specified",
+            "context": text[:120]
+        })
+    return tasks
+
+
+def fake_summary(prompt, max_tokens):
+    body = prompt.split("\n\n", 1)[-1]
+    words = body.split()[:max(20, min(max_tokens or 200, 200))]
+    return "Summary: " + " ".join(words)
+
+
+# Rolling update for live_meeting: the summary keeps the most recent words, new
+# commitments become tasks, and a speaker saying they finished closes their oldest open task
+def fake_live_update(prompt):
+    segment = _section(prompt, "New Transcript Segment:", "Team Members")
+    previous = _section(prompt, "Summary So Far:", "Open Tasks:").replace("(meeting just started)", "")
+    summary_words = (previous.replace("Summary:", "") + " " + segment).split()[-150:]
+    open_by_assignee = {}
+    for line in _section(prompt, "Open Tasks:", "New Transcript Segment:").splitlines():
+        match = OPEN_TASK_PATTERN.match(line)
+        if match:
+            open_by_assignee.setdefault(match.group(2).strip(), []).append(match.group(1))
+    updated = []
+    for speaker, text in _speaker_turns(segment):
+        if DONE_PATTERN.search(text):
+            for assignee, ids in open_by_assignee.items():
+                if ids and (assignee == speaker or assignee.split()[0] == speaker):
+                    updated.append({"id": ids.pop(0), "status": "done"})
+                    break
+    return {
+        "summary": "Summary: " + " ".join(summary_words),
+        "new_tasks": fake_tasks(prompt, "New Transcript Segment:"),
+        "updated_tasks": updated
+    }
+
+
+# Build the completion text for a list of chat messages
+def fake_completion_content(messages, max_tokens=None, response_format=None):
+    prompt = "\n".join(message.get("content", "") for message in messages if message.get("role") == "user")
+    if response_format and response_format.get("type") == "json_object":
+        if "New Transcript Segment:" in prompt:
+            return json.dumps(fake_live_update(prompt))
+        return json.dumps({"tasks": fake_tasks(prompt)})
+    return fake_summary(prompt, max_tokens)
+
+
+# Cut the content at max_tokens (~4 characters each) like a real model, with its finish_reason
+def truncate_to_budget(content, max_tokens):
+    if max_tokens and len(content) > max_tokens * 4:
+        return content[:max_tokens * 4], "length"
+    return content, "stop"
+
+
+def fake_usage(messages, content):
+    prompt_tokens = sum(len(message.get("content", "")) for message in messages) // 4 + 1
+    completion_tokens = len(content) // 4 + 1
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens
+    )
+
+
+class FakeLLMError(Exception):
+    pass
+
+
+# Drop-in replacement for openai.OpenAI() covering chat.completions.create
+class FakeLLMClient:
+    def __init__(self, latency=0.0, error_rate=0.0, seed=None, token_latency=0.0):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.error_rate = error_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, max_tokens=None, response_format=None, stream=False, **kwargs):
+        with self._lock:
+            self.calls += 1
+            fail = self.error_rate and self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise FakeLLMError("Simulated LLM failure")
+
+        content, finish_reason = truncate_to_budget(fake_completion_content(messages, max_tokens, response_format), max_tokens)
+        if stream:
+            include_usage = bool((kwargs.get("stream_options") or {}).get("include_usage"))
+            return self._stream(model, content, fake_usage(messages, content) if include_usage else None, finish_reason)
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(
+                index=0,
+                message=SimpleNamespace(role="assistant", content=content),
+                finish_reason=finish_reason
+            )],
+            usage=fake_usage(messages, content)
+        )
+
+    # Chunks shaped like the OpenAI stream: one word per delta, a finish chunk, then usage if requested
+    def _stream(self, model, content, usage=None, finish_reason="stop"):
+        for word in re.findall(r"\S+\s*", content):
+            if self.token_latency:
+                time.sleep(self.token_latency)
+            yield SimpleNamespace(model=model, choices=[SimpleNamespace(
+                index=0, delta=SimpleNamespace(content=word), finish_reason=None
+            )])
+        yield SimpleNamespace(model=model, choices=[SimpleNamespace(
+            index=0, delta=SimpleNamespace(content=None), finish_reason=finish_reason
+        )])
+        if usage is not None:
+            yield SimpleNamespace(model=model, choices=[], usage=usage)
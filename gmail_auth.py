@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+from telemetry import span
+
+# Process-wide holder for the Gmail OAuth credentials stored in the token file.
+# The parsed credentials are kept in memory and shared by every session. Tokens
+# close to expiry are refreshed in a background thread with the stored refresh
+# token; already-expired tokens are refreshed inline, which costs a single call
+# to the token endpoint instead of a new OAuth login. Writes to the token file
+# are serialized with a lock file, so concurrent sessions and processes never
+# interleave writes or refresh the same token twice.
+
+# Start a background refresh this long before expiry. google-auth already treats
+# tokens as expired a few minutes early, so this has to be comfortably larger.
+REFRESH_MARGIN = timedelta(minutes=10)
+
+
+def utcnow():
+    # google-auth stores expiry as a naive UTC datetime
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# True if get() failed because the stored token can't be used and a new login is
+# needed: the token file can't be parsed or the refresh token was rejected
+def is_token_unusable(error):
+    if isinstance(error, ValueError):
+        return True
+    try:
+        from google.auth.exceptions import RefreshError
+    except ImportError:
+        return False
+    return isinstance(error, RefreshError)
+
+
+class CredentialStore:
+    def __init__(self, token_file, scopes=None, refresh_margin=REFRESH_MARGIN):
+        self.token_file = token_file
+        self.scopes = scopes
+        self.refresh_margin = refresh_margin
+        self._creds = None
+        self._mtime = None
+        # _lock guards the in-memory state; _write_lock serializes refreshes and
+        # writes, so a slow refresh never blocks readers of the current token
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._refresh_thread = None
+
+    @contextmanager
+    def _file_lock(self):
+        with self._write_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.token_file + ".lock", "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # Reload from disk only when the file changed, e.g. another process refreshed it
+    def _load(self):
+        if not os.path.exists(self.token_file):
+            self._creds, self._mtime = None, None
+            return
+        mtime = os.path.getmtime(self.token_file)
+        if self._creds is not None and mtime == self._mtime:
+            return
+        from google.oauth2.credentials import Credentials
+        with open(self.token_file) as f:
+            self._creds = Credentials.from_authorized_user_info(json.load(f), self.scopes)
+        self._mtime = mtime
+
+    def _write(self, creds):
+        tmp_path = self.token_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(creds.to_json())
+        os.replace(tmp_path, self.token_file)
+        with self._lock:
+            self._creds = creds
+            self._mtime = os.path.getmtime(self.token_file)
+
+    def _expires_soon(self, creds):
+        return creds.expiry is not None and creds.expiry - utcnow() < self.refresh_margin
+
+    def _needs_refresh(self, creds):
+        return creds.expired or not creds.token or self._expires_soon(creds)
+
+    def _refresh(self):
+        from google.auth.transport.requests import Request
+        with self._file_lock():
+            with self._lock:
+                self._load()
+                creds = self._creds
+            # Someone else may have refreshed while we waited for the lock
+            if creds is None or not self._needs_refresh(creds):
+                return creds
+            with span("oauth.refresh"):
+                creds.refresh(Request())
+            self._write(creds)
+            return creds
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+
+            def run():
+                try:
+                    self._refresh()
+                except Exception as e:
+                    print(f"Background token refresh failed: {str(e)}")
+
+            self._refresh_thread = threading.Thread(target=run, name="gmail-token-refresh", daemon=True)
+            self._refresh_thread.start()
+
+    # Valid credentials, or None if there is no usable token and a login is needed.
+    # Raises if the token file can't be parsed or the refresh token was rejected.
+    def get(self):
+        with self._lock:
+            self._load()
+            creds = self._creds
+        if creds is None:
+            return None
+
+        if creds.expired or not creds.token:
+            if not creds.refresh_token:
+                return None
+            return self._refresh()
+
+        if self._expires_soon(creds) and creds.refresh_token:
+            self._refresh_in_background()
+        return creds
+
+    def save(self, creds):
+        with self._file_lock():
+            self._write(creds)
+
+    def clear(self):
+        with self._file_lock():
+            if os.path.exists(self.token_file):
+                os.remove(self.token_file)
+            with self._lock:
+                self._creds, self._mtime = None, None
@@ -0,0 +1,246 @@
+import base64
+import itertools
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.mime.multipart import MIMEMultipart
+from email.parser import BytesParser
+from email.mime.text import MIMEText
+from functools import lru_cache
+
+from telemetry import span
+
+# Concurrent Gmail delivery engine.
+# Messages are sent from a bounded worker pool, paced by a token bucket sized to
+# Gmail's per-user quota, and retried with exponential backoff on 429/5xx errors.
+# Anything that looks like a Gmail service (users().messages().send().execute())
+# can be used, which lets the engine run against FakeGmailService locally.
+
+# Gmail allows 250 quota units per user per second and messages.send costs 100 units
+GMAIL_QUOTA_UNITS_PER_SECOND = 250
+GMAIL_SEND_COST_UNITS = 100
+DEFAULT_SEND_RATE = GMAIL_QUOTA_UNITS_PER_SECOND / GMAIL_SEND_COST_UNITS
+DEFAULT_SEND_BURST = 10
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_RETRIES = 5
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+# Parsed once per process from the discovery document bundled with googleapiclient,
+# so building a Gmail client needs neither a network fetch nor re-parsing the JSON
+@lru_cache(maxsize=1)
+def load_gmail_discovery_document():
+    from googleapiclient.discovery_cache import get_static_doc
+    return json.loads(get_static_doc('gmail', 'v1'))
+
+
+def build_gmail_service(credentials):
+    from googleapiclient.discovery import build_from_document
+    return build_from_document(load_gmail_discovery_document(), credentials=credentials)
+
+
+# Build the base64url-encoded MIME message Gmail expects. message_id (without angle
+# brackets) sets a known Message-ID, so the message can be found in Sent later.
+def build_raw_message(to, subject, body_html, message_id=None):
+    message = MIMEMultipart('alternative')
+    message['to'] = to
+    message['subject'] = subject
+    if message_id:
+        message['Message-ID'] = f"<{message_id}>"
+
+    # Create HTML part
+    html_part = MIMEText(body_html, 'html')
+    message.attach(html_part)
+
+    return base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
+
+
+# Thread-safe token bucket: acquire() blocks until a token is available
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Pull an HTTP status out of googleapiclient's HttpError (or anything shaped like it)
+def get_error_status(error):
+    resp = getattr(error, 'resp', None)
+    status = getattr(resp, 'status', None) or getattr(error, 'status_code', None)
+    try:
+        return int(status)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable_error(error):
+    status = get_error_status(error)
+    if status in RETRYABLE_STATUSES:
+        return True
+    # Gmail reports some quota errors as 403 with a rate limit reason
+    return status == 403 and 'ratelimitexceeded' in str(error).lower()
+
+
+def send_with_backoff(service, raw_message, max_retries=DEFAULT_MAX_RETRIES, base_delay=1.0, max_delay=32.0):
+    attempt = 0
+    with span("gmail.send") as current:
+        while True:
+            try:
+                result = service.users().messages().send(
+                    userId='me',
+                    body={'raw': raw_message}
+                ).execute()
+                current.set(retries=attempt)
+                return result
+            except Exception as e:
+                if attempt >= max_retries or not is_retryable_error(e):
+                    current.set(retries=attempt, status=get_error_status(e))
+                    raise
+                delay = min(max_delay, base_delay * (2 ** attempt))
+                time.sleep(delay + random.uniform(0, delay / 2))
+                attempt += 1
+
+
+class DeliveryReport:
+    def __init__(self, total):
+        self.total = total
+        self.sent = 0
+        self.failed = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self):
+        # Messages per second over the whole run
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+
+# Send every message in `messages` (dicts with 'to', 'subject', 'html' and optionally 'message_id').
+# service_factory is called once per worker thread, because googleapiclient
+# service objects are not safe to share between threads. on_result is called on
+# the calling thread as each message completes, so it can drive Streamlit widgets.
+def deliver_messages(messages, service_factory, max_workers=DEFAULT_MAX_WORKERS, rate_limiter=None,
+                     max_retries=DEFAULT_MAX_RETRIES, on_result=None):
+    report = DeliveryReport(len(messages))
+    if not messages:
+        return report
+
+    if rate_limiter is None:
+        rate_limiter = TokenBucket(DEFAULT_SEND_RATE, DEFAULT_SEND_BURST)
+
+    local = threading.local()
+
+    def worker(message):
+        if not hasattr(local, 'service'):
+            local.service = service_factory()
+        raw_message = build_raw_message(message['to'], message['subject'], message['html'], message.get('message_id'))
+        rate_limiter.acquire()
+        return send_with_backoff(local.service, raw_message, max_retries=max_retries)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(messages)))) as executor:
+        futures = {executor.submit(worker, message): message for message in messages}
+        for done, future in enumerate(as_completed(futures), start=1):
+            message = futures[future]
+            try:
+                result = future.result()
+                success = True
+                report.sent += 1
+            except Exception as e:
+                result = str(e)
+                success = False
+                report.failed += 1
+                report.errors.append((message['to'], result))
+            report.elapsed = time.perf_counter() - start
+            if on_result:
+                on_result(done, report.total, message, success, result)
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+# Local stand-in for the Gmail API service, for tests, benchmarks and offline runs
+class FakeHttpError(Exception):
+    def __init__(self, status, message="Fake Gmail error"):
+        super().__init__(f"<HttpError {status}: {message}>")
+        self.resp = type('FakeResponse', (), {'status': status})()
+
+
+class FakeGmailService:
+    def __init__(self, latency=0.0, error_rate=0.0, error_status=429, seed=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.sent = []
+        self._random = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def send(self, userId, body):
+        return _FakeSendRequest(self, userId, body)
+
+    # Only the rfc822msgid: search the outbox uses is supported
+    def list(self, userId, q=""):
+        return _FakeListRequest(self, q)
+
+    def _list(self, query):
+        wanted = query.split("rfc822msgid:", 1)[-1].strip().strip("<>")
+        with self._lock:
+            sent = list(self.sent)
+        messages = []
+        for message in sent:
+            headers = BytesParser().parsebytes(base64.urlsafe_b64decode(message['raw']), headersonly=True)
+            if "".join((headers['Message-ID'] or "").split()).strip("<>") == wanted:
+                messages.append({'id': message['id']})
+        return {'messages': messages} if messages else {'resultSizeEstimate': 0}
+
+    def _execute(self, user_id, body):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            if self.error_rate and self._random.random() < self.error_rate:
+                raise FakeHttpError(self.error_status)
+            message_id = f"fake-{next(self._ids)}"
+            self.sent.append({'id': message_id, 'userId': user_id, 'raw': body['raw']})
+        return {'id': message_id, 'labelIds': ['SENT']}
+
+
+class _FakeSendRequest:
+    def __init__(self, service, user_id, body):
+        self._service = service
+        self._user_id = user_id
+        self._body = body
+
+    def execute(self):
+        return self._service._execute(self._user_id, self._body)
+
+
+class _FakeListRequest:
+    def __init__(self, service, query):
+        self._service = service
+        self._query = query
+
+    def execute(self):
+        return self._service._list(self._query)
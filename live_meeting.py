@@ -0,0 +1,298 @@
+import argparse
+import codecs
+import json
+import os
+import sys
+import time
+
+import meeting_analysis
+from meeting_analysis import (SUMMARY_MODEL, estimate_tokens, format_participant_info, model_for, split_long_turn,
+                              validate_tasks)
+from roster_index import RosterIndex
+from telemetry import span
+from transcript_model import Transcript
+
+# Incremental analysis of a meeting that is still going on.
+# A LiveMeeting is fed the transcript as it grows and remembers how much of it
+# has been processed. Each update sends the model only the new segment plus a
+# compact rolling state (the summary so far and the open tasks), and gets back
+# the revised summary with task additions and updates, which are returned as
+# deltas. Segments, the summary and the open-task list are all capped, so the
+# cost of an update stays flat however long the meeting runs.
+#
+#   python live_meeting.py transcript.txt --participants team.csv --llm fake
+#
+# follows a transcript file that another process keeps appending to and prints
+# one JSON delta per update.
+
+LIVE_PROMPT_VERSION = "live-v1"
+# Wait for this much new text before calling the model, unless flushing
+LIVE_MIN_NEW_TOKENS = 150
+# Longer backlogs are processed in several calls of at most this size
+LIVE_SEGMENT_TOKENS = 1500
+LIVE_SUMMARY_TOKENS = 400
+# Only the most recent open tasks are shown to the model for updates
+LIVE_MAX_OPEN_TASKS = 25
+# Characters kept from before the processed offset to detect a replaced transcript
+TAIL_CHECK_CHARS = 64
+TASK_STATUSES = {"open", "done", "cancelled"}
+UPDATABLE_FIELDS = ("task", "assignee", "due_date", "context", "status")
+
+
+class LiveMeeting:
+    def __init__(self, participants, roster_index=None):
+        self.participants = participants or []
+        self.roster_index = roster_index or RosterIndex(self.participants)
+        self.summary = ""
+        self.tasks = []
+        self.received = 0
+        self.buffer = ""
+        self.updates = 0
+        self.prompt_tokens = []
+        self._tail = ""
+        self._next_id = 1
+
+    # Characters of the transcript already sent to the model
+    @property
+    def processed_offset(self):
+        return self.received - len(self.buffer)
+
+    def open_tasks(self):
+        return [task for task in self.tasks if task.get("status", "open") == "open"]
+
+    # Append newly arrived transcript text
+    def feed(self, text):
+        if text:
+            self.buffer += text
+            self.received += len(text)
+            self._tail = (self._tail + text)[-TAIL_CHECK_CHARS:]
+
+    # Feed whatever the full transcript has gained since the last call
+    def sync(self, transcript):
+        if len(transcript) < self.received or transcript[max(0, self.received - TAIL_CHECK_CHARS):self.received] != self._tail:
+            raise ValueError("The transcript no longer starts with the text already processed")
+        self.feed(transcript[self.received:])
+
+    # Next segment to send: whole speaker turns (the last one may still be being said),
+    # at most LIVE_SEGMENT_TOKENS, or None when there is not enough new text yet. A turn
+    # still being said is only split, at a line end, when there is nothing else to send.
+    def _next_segment(self, final):
+        if not self.buffer.strip():
+            return None
+        max_chars = LIVE_SEGMENT_TOKENS * meeting_analysis.CHARS_PER_TOKEN
+        if len(self.buffer) > max_chars:
+            # More text follows, so everything up to the cut is complete
+            end = self._turn_boundary(max_chars) or self.buffer.rfind("\n", 0, max_chars) + 1
+            return self.buffer[:end or len(split_long_turn(self.buffer[:max_chars], LIVE_SEGMENT_TOKENS)[0])]
+        if final:
+            end = len(self.buffer)
+        else:
+            # Whole turns when they add up to enough text, else whole lines
+            end = self._turn_boundary(len(self.buffer))
+            if estimate_tokens(self.buffer[:end]) < LIVE_MIN_NEW_TOKENS:
+                end = self.buffer.rfind("\n") + 1
+        if end <= 0 or (not final and estimate_tokens(self.buffer[:end]) < LIVE_MIN_NEW_TOKENS):
+            return None
+        return self.buffer[:end]
+
+    # Start of the last speaker turn in the first `limit` characters of the buffer, or 0
+    def _turn_boundary(self, limit):
+        turns = Transcript(self.buffer[:limit])
+        return turns.starts[-1] if len(turns) else 0
+
+    # Process everything that is ready. final=True also takes a trailing partial line
+    # and segments below LIVE_MIN_NEW_TOKENS, for the end of the meeting.
+    def process(self, final=False):
+        delta = {"added": [], "updated": [], "calls": 0}
+        while True:
+            segment = self._next_segment(final)
+            if segment is None:
+                break
+            try:
+                added, updated = self._update(segment)
+            except Exception as e:
+                # The segment stays buffered and is retried on the next call
+                delta["error"] = str(e)
+                break
+            self.buffer = self.buffer[len(segment):]
+            delta["added"].extend(added)
+            delta["updated"].extend(updated)
+            delta["calls"] += 1
+        delta["summary"] = self.summary
+        delta["offset"] = self.processed_offset
+        delta["pending_chars"] = len(self.buffer)
+        return delta
+
+    def _prompt(self, segment):
+        open_tasks = self.open_tasks()[-LIVE_MAX_OPEN_TASKS:]
+        # People named in the new segment, plus whoever already owns an open task
+        mentioned = {id(p): p for p in self.roster_index.find_mentioned(segment)}
+        for task in open_tasks:
+            participant = self.roster_index.resolve(task.get("assignee") or "")
+            if participant is not None:
+                mentioned[id(participant)] = participant
+        open_task_lines = "\n".join(
+            f"- [{task['id']}] {task['task']} (assignee: {task.get('assignee') or 'Unassigned'}, "
+            f"due: {task.get('due_date') or 'Not specified'})"
+            for task in open_tasks
+        ) or "(none)"
+        return [
+            {"role": "system", "content": "You are a professional assistant that keeps running notes of a meeting that is still in progress. Only record tasks that are explicitly stated."},
+            {"role": "user", "content": f"""You are given your notes so far and the newest part of the meeting transcript.
+
+Return a JSON object with:
+- 'summary': the summary so far, revised to include the new segment (under 250 words)
+- 'new_tasks': tasks explicitly stated in the new segment, each with 'task', 'assignee' (a name from the team list or 'Unassigned'), 'due_date' ('Not specified' unless a date is stated) and 'context' (a short quote)
+- 'updated_tasks': open tasks the new segment changes, each with its 'id' and only the changed fields among 'task', 'assignee', 'due_date', 'status' ('open', 'done' or 'cancelled')
+Do not repeat open tasks as new tasks.
+
+Summary So Far:
+{self.summary or "(meeting just started)"}
+
+Open Tasks:
+{open_task_lines}
+
+New Transcript Segment:
+{segment}
+
+Team Members (ONLY these people can be assigned tasks):
+{format_participant_info(mentioned.values())}"""}
+        ]
+
+    def _update(self, segment):
+        messages = self._prompt(segment)
+        self.prompt_tokens.append(sum(estimate_tokens(message["content"]) for message in messages))
+        with span("live.update", segment_tokens=estimate_tokens(segment)):
+            response = meeting_analysis.client.chat.completions.create(
+                model=model_for(SUMMARY_MODEL),
+                messages=messages,
+                max_tokens=LIVE_SUMMARY_TOKENS + 600,
+                response_format={"type": "json_object"}
+            )
+        result = json.loads(response.choices[0].message.content)
+        self.updates += 1
+        if isinstance(result.get("summary"), str) and result["summary"].strip():
+            self.summary = result["summary"].strip()
+
+        added = []
+        for task in validate_tasks(result.get("new_tasks") or [], self.roster_index):
+            task["id"] = f"t{self._next_id}"
+            task["status"] = "open"
+            self._next_id += 1
+            self.tasks.append(task)
+            added.append(dict(task))
+
+        updated = []
+        tasks_by_id = {task["id"]: task for task in self.tasks}
+        for change in result.get("updated_tasks") or []:
+            task = tasks_by_id.get(change.get("id")) if isinstance(change, dict) else None
+            if task is None:
+                continue
+            changes = {field: change[field] for field in UPDATABLE_FIELDS if field in change and change[field]}
+            if changes.get("status") not in TASK_STATUSES:
+                changes.pop("status", None)
+            if "assignee" in changes:
+                # Reassignments go through the same roster validation as new tasks
+                validated = validate_tasks([{"task": task["task"], "assignee": changes["assignee"]}], self.roster_index)
+                if not validated:
+                    changes.pop("assignee")
+                else:
+                    changes["assignee"], changes["email"] = validated[0]["assignee"], validated[0]["email"]
+            changes = {field: value for field, value in changes.items() if task.get(field) != value}
+            if changes:
+                task.update(changes)
+                updated.append({"id": task["id"], "changes": changes})
+        return added, updated
+
+    # Same shape as extract_tasks_and_assign's result, for the rest of the app
+    def tasks_result(self):
+        return {"tasks": [dict(task) for task in self.tasks if task.get("status", "open") != "cancelled"]}
+
+    def state(self):
+        return {
+            "version": LIVE_PROMPT_VERSION,
+            "summary": self.summary,
+            "tasks": self.tasks,
+            "received": self.received,
+            "buffer": self.buffer,
+            "tail": self._tail,
+            "next_id": self._next_id,
+            "updates": self.updates
+        }
+
+    @classmethod
+    def from_state(cls, state, participants, roster_index=None):
+        live = cls(participants, roster_index)
+        live.summary = state.get("summary", "")
+        live.tasks = state.get("tasks", [])
+        live.received = state.get("received", 0)
+        live.buffer = state.get("buffer", "")
+        live._tail = state.get("tail", "")
+        live._next_id = state.get("next_id", len(live.tasks) + 1)
+        live.updates = state.get("updates", 0)
+        return live
+
+
+# Poll a growing transcript file, feeding appended text to the meeting.
+# Text is decoded incrementally, so a multi-byte character split across writes is
+# fine, and the characters the meeting already received (when resuming) are skipped.
+def follow_file(path, live, on_delta, interval=5.0, stop_after_idle=None):
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    position = 0
+    skip = live.received
+    idle_since = time.monotonic()
+    while True:
+        with open(path, "rb") as f:
+            f.seek(position)
+            data = f.read()
+        position += len(data)
+        text = decoder.decode(data)
+        if skip:
+            skipped = min(skip, len(text))
+            text, skip = text[skipped:], skip - skipped
+        live.feed(text)
+        if data:
+            idle_since = time.monotonic()
+        delta = live.process()
+        if delta["added"] or delta["updated"] or delta.get("error"):
+            on_delta(delta)
+        if stop_after_idle is not None and time.monotonic() - idle_since > stop_after_idle:
+            on_delta(live.process(final=True))
+            return live
+        time.sleep(interval)
+
+
+def main(argv=None):
+    from llm_backend import create_backend
+    from meeting_files import get_file_extension, read_participants_bytes
+
+    parser = argparse.ArgumentParser(description="Follow a growing transcript file and print task deltas")
+    parser.add_argument('transcript', help="plain-text transcript that is being appended to")
+    parser.add_argument('--participants', required=True, help="participant roster (.csv, .txt or .docx)")
+    parser.add_argument('--llm', choices=['openai', 'fake'], default='openai', help="LLM backend")
+    parser.add_argument('--interval', type=float, default=5.0, help="seconds between checks for new text")
+    parser.add_argument('--stop-after-idle', type=float, help="finish once the file hasn't grown for this many seconds")
+    parser.add_argument('--state', help="JSON file to resume from and save progress to")
+    args = parser.parse_args(argv)
+
+    with open(args.participants, 'rb') as f:
+        participants = read_participants_bytes(get_file_extension(args.participants), f.read())
+    meeting_analysis.configure(create_backend(args.llm, api_key=os.environ.get('OPENAI_API_KEY')))
+
+    live = LiveMeeting(participants)
+    if args.state and os.path.exists(args.state):
+        with open(args.state, encoding='utf-8') as f:
+            live = LiveMeeting.from_state(json.load(f), participants)
+
+    def on_delta(delta):
+        print(json.dumps(delta), flush=True)
+        if args.state:
+            with open(args.state, 'w', encoding='utf-8') as f:
+                json.dump(live.state(), f)
+
+    follow_file(args.transcript, live, on_delta, args.interval, args.stop_after_idle)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+from telemetry import record_usage, span
+
+# Pluggable LLM backend for meeting analysis.
+# An LLMBackend wraps any OpenAI-compatible client (the hosted API, a self-hosted
+# server behind a different base URL, the local stub server in llm_stub_server.py,
+# or the in-process FakeLLMClient) and adds a model override and a cap on requests
+# in flight. It exposes chat.completions.create itself, so meeting_analysis talks
+# to every backend the same way.
+# One backend is shared by the whole process (the app keeps it in st.cache_resource),
+# so it is also where identical requests from different sessions meet: a request
+# identical to one already in flight waits for that call and gets its response,
+# and a streamed one replays the same chunks, instead of paying for another
+# completion. meeting_analysis coalesces whole summaries and task extractions the
+# same way through coalesce().
+#
+# Settings come from arguments, or from the environment:
+#   LLM_BACKEND          openai (default) or fake
+#   LLM_BASE_URL         OpenAI-compatible endpoint, e.g. http://127.0.0.1:8001/v1
+#   LLM_MODEL            model used for every call instead of the per-call default
+#   LLM_MAX_CONCURRENCY  requests in flight across the process
+#   LLM_API_KEY          falls back to OPENAI_API_KEY
+#   LLM_COALESCE         off to send every request upstream, even identical ones
+
+DEFAULT_MAX_CONCURRENCY = 8
+BACKEND_KINDS = ('openai', 'fake')
+
+
+# Identifies a request by everything sent upstream
+def request_key(kwargs):
+    payload = json.dumps(kwargs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+# Runs one call per key at a time; callers that arrive while it is running wait for
+# it and share its result (or its exception)
+class SingleFlight:
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    # Returns (result, shared); shared is True for callers that reused another's call
+    def do(self, key, func):
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = func()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+
+
+# A streamed response read upstream once, on its own thread, and replayed to every
+# reader; late readers get the chunks already received, then the rest as they arrive
+class SharedStream:
+    def __init__(self, source, on_done):
+        self.chunks = []
+        self.finished = False
+        self.error = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._pump, args=(source, on_done), name="llm-shared-stream", daemon=True)
+        self._thread.start()
+
+    def _pump(self, source, on_done):
+        try:
+            for chunk in source:
+                with self._condition:
+                    self.chunks.append(chunk)
+                    self._condition.notify_all()
+        except BaseException as e:
+            self.error = e
+        finally:
+            on_done()
+            with self._condition:
+                self.finished = True
+                self._condition.notify_all()
+
+    def __iter__(self):
+        position = 0
+        while True:
+            with self._condition:
+                while position >= len(self.chunks) and not self.finished:
+                    self._condition.wait()
+                if position < len(self.chunks):
+                    chunk = self.chunks[position]
+                elif self.error is not None:
+                    raise self.error
+                else:
+                    return
+            position += 1
+            yield chunk
+
+
+class LLMBackend:
+    def __init__(self, client, model=None, max_concurrency=DEFAULT_MAX_CONCURRENCY, name="openai", coalesce=True):
+        self.client = client
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.name = name
+        self.coalesce_requests = coalesce
+        self.shared_streams = 0
+        self._semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._requests = SingleFlight()
+        self._work = SingleFlight()
+        self._streams = {}
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    # The configured model wins over the caller's default, so one setting retargets every prompt
+    def model_for(self, default):
+        return self.model or default
+
+    # Run func once for concurrent callers with the same key (e.g. an LLM cache key) and
+    # share its result; returns (result, shared)
+    def coalesce(self, key, func):
+        if not self.coalesce_requests:
+            return func(), False
+        return self._work.do(key, func)
+
+    def create(self, model=None, stream=False, **kwargs):
+        kwargs['model'] = self.model_for(model)
+        if stream:
+            return self._stream(kwargs)
+        if not self.coalesce_requests:
+            return self._create(kwargs)
+        response, _ = self._requests.do(request_key(kwargs), lambda: self._create(kwargs))
+        return response
+
+    def _create(self, kwargs):
+        with span("llm.call", model=kwargs['model'], backend=self.name) as current:
+            if self._semaphore is None:
+                response = self.client.chat.completions.create(**kwargs)
+            else:
+                with self._semaphore:
+                    response = self.client.chat.completions.create(**kwargs)
+            usage = getattr(response, 'usage', None)
+            record_usage(kwargs['model'], usage)
+            if usage is not None:
+                current.set(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+            return response
+
+    # Identical streams in flight share one upstream response. A shared stream is read
+    # to the end even if its readers stop early, so a late reader still gets all of it.
+    def _stream(self, kwargs):
+        if not self.coalesce_requests:
+            return self._stream_upstream(kwargs)
+        key = request_key(kwargs)
+
+        def finished():
+            with self._lock:
+                self._streams.pop(key, None)
+
+        with self._lock:
+            shared = self._streams.get(key)
+            if shared is None:
+                shared = self._streams[key] = SharedStream(self._stream_upstream(kwargs), finished)
+            else:
+                self.shared_streams += 1
+        return iter(shared)
+
+    # A streamed response keeps its slot until the last chunk has been read
+    def _stream_upstream(self, kwargs):
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        try:
+            with span("llm.call", model=kwargs['model'], backend=self.name, stream=True) as current:
+                start = time.perf_counter()
+                chunks = 0
+                for chunk in self.client.chat.completions.create(stream=True, **kwargs):
+                    if chunks == 0:
+                        current.set(first_chunk_seconds=round(time.perf_counter() - start, 6))
+                    chunks += 1
+                    # Only sent when the server supports stream_options={"include_usage": True}
+                    usage = getattr(chunk, 'usage', None)
+                    if usage is not None:
+                        record_usage(kwargs['model'], usage)
+                        current.set(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+                    yield chunk
+                current.set(chunks=chunks)
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    # Upstream calls made and calls saved by coalescing, for diagnostics
+    def stats(self):
+        return {
+            'upstream_requests': self._requests.calls,
+            'coalesced_requests': self._requests.shared,
+            'coalesced_streams': self.shared_streams,
+            'coalesced_analyses': self._work.shared
+        }
+
+
+def create_backend(kind='openai', base_url=None, api_key=None, model=None,
+                   max_concurrency=DEFAULT_MAX_CONCURRENCY, timeout=None, fake_latency=0.0, coalesce=True):
+    if kind == 'fake':
+        from fake_llm import FakeLLMClient
+        return LLMBackend(FakeLLMClient(latency=fake_latency), model, max_concurrency, name="fake", coalesce=coalesce)
+    if kind != 'openai':
+        raise ValueError(f"Unknown LLM backend: {kind}")
+
+    import openai
+    options = {'api_key': api_key or "not-needed"} if base_url else {'api_key': api_key}
+    if base_url:
+        options['base_url'] = base_url
+    if timeout:
+        options['timeout'] = timeout
+    try:
+        import httpx
+    except ImportError:
+        httpx = None
+    if max_concurrency and httpx is not None:
+        # Never more connections than requests allowed in flight, all kept alive for reuse
+        options['http_client'] = openai.DefaultHttpxClient(
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+        )
+    return LLMBackend(openai.OpenAI(**options), model, max_concurrency, name=base_url or "openai", coalesce=coalesce)
+
+
+# Environment variables override the given defaults
+def backend_from_env(api_key=None, environ=None, **defaults):
+    environ = os.environ if environ is None else environ
+    max_concurrency = environ.get('LLM_MAX_CONCURRENCY')
+    return create_backend(
+        kind=environ.get('LLM_BACKEND') or defaults.get('kind', 'openai'),
+        base_url=environ.get('LLM_BASE_URL') or defaults.get('base_url'),
+        api_key=environ.get('LLM_API_KEY') or api_key or environ.get('OPENAI_API_KEY'),
+        model=environ.get('LLM_MODEL') or defaults.get('model'),
+        max_concurrency=int(max_concurrency) if max_concurrency else defaults.get('max_concurrency', DEFAULT_MAX_CONCURRENCY),
+        fake_latency=defaults.get('fake_latency', 0.0),
+        # Secrets can hold a TOML boolean rather than a string
+        coalesce=str(environ.get('LLM_COALESCE', 'on')).lower() not in ('off', '0', 'false', 'no')
+    )
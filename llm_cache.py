@@ -0,0 +1,117 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+# Persistent, content-addressed cache for LLM results.
+# Backed by SQLite so it survives restarts and can be shared by every Streamlit
+# session (and process) pointed at the same file. Entries expire after a TTL and
+# the least recently used ones are evicted once the cache grows past max_entries.
+
+
+# Build a cache key from everything that changes the model's answer
+def make_cache_key(kind, transcript, participants, prompt_version, model, backend=None):
+    # Whitespace differences between uploads of the same transcript shouldn't miss the cache
+    normalized_transcript = " ".join((transcript or "").split())
+    roster = sorted(
+        (p.get('name', '').strip().lower(), p.get('email', '').strip().lower(), p.get('expertise', '').strip().lower())
+        for p in (participants or [])
+    )
+    payload = json.dumps({
+        "kind": kind,
+        "transcript": normalized_transcript,
+        "participants": roster,
+        "prompt_version": prompt_version,
+        "model": model,
+        # Different servers can serve different weights under the same model name
+        "backend": backend
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, path, max_entries=500, ttl_seconds=7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+
+    def _connect(self):
+        # One short-lived connection per operation keeps this safe across threads
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._record(False)
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._record(False)
+                return None
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        self._record(True)
+        return json.loads(value)
+
+    def set(self, key, value):
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            # Drop expired entries, then trim to the size bound by least recent access
+            conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute("""
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+    def clear(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM llm_cache")
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with closing(self._connect()) as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
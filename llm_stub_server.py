@@ -0,0 +1,218 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fake_llm import fake_completion_content, fake_usage, truncate_to_budget
+
+# Local OpenAI-compatible server for offline load tests and benchmarks.
+# Serves POST /v1/chat/completions (plain and streamed) with the same
+# deterministic responses as fake_llm.FakeLLMClient, but over real HTTP, so the
+# whole pipeline runs through the openai client, its connection pool and the
+# LLMBackend concurrency cap exactly as it would against the hosted API.
+#
+#   python llm_stub_server.py --port 8001 --latency 0.5 --error-rate 0.05
+#   LLM_BASE_URL=http://127.0.0.1:8001/v1 streamlit run app.py
+#
+# GET /v1/stats reports request counts and peak concurrency seen by the server.
+
+
+class StubState:
+    def __init__(self, latency=0.0, token_latency=0.0, error_rate=0.0, error_status=429, seed=None):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def begin(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            fail = self.error_rate and self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            return fail
+
+    def end(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'in_flight': self.in_flight,
+                'peak_in_flight': self.peak_in_flight
+            }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server.state
+        if self.path.rstrip('/') in ('/v1/models', '/models'):
+            self._send_json(200, {'object': 'list', 'data': [{'id': 'stub', 'object': 'model', 'owned_by': 'local'}]})
+        elif self.path.rstrip('/') in ('/v1/stats', '/stats'):
+            self._send_json(200, state.stats())
+        elif self.path.rstrip('/') == '/health':
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': {'message': f"Unknown path {self.path}", 'type': 'invalid_request_error'}})
+
+    def do_POST(self):
+        if self.path.rstrip('/') not in ('/v1/chat/completions', '/chat/completions'):
+            self._send_json(404, {'error': {'message': f"Unknown path {self.path}", 'type': 'invalid_request_error'}})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {'error': {'message': "Request body is not JSON", 'type': 'invalid_request_error'}})
+            return
+
+        state = self.server.state
+        fail = state.begin()
+        try:
+            if state.latency:
+                time.sleep(state.latency)
+            if fail:
+                self._send_json(
+                    state.error_status,
+                    {'error': {'message': "Simulated failure from the stub server", 'type': 'server_error'}},
+                    {'Retry-After': '1'} if state.error_status == 429 else None
+                )
+                return
+
+            messages = request.get('messages') or []
+            content, finish_reason = truncate_to_budget(
+                fake_completion_content(messages, request.get('max_tokens'), request.get('response_format')),
+                request.get('max_tokens')
+            )
+            completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+            model = request.get('model') or 'stub'
+            if request.get('stream'):
+                include_usage = (request.get('stream_options') or {}).get('include_usage')
+                usage = fake_usage(messages, content) if include_usage else None
+                self._stream(completion_id, model, content, state.token_latency, usage, finish_reason)
+            else:
+                usage = fake_usage(messages, content)
+                self._send_json(200, {
+                    'id': completion_id,
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': model,
+                    'choices': [{
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': content},
+                        'finish_reason': finish_reason
+                    }],
+                    'usage': vars(usage)
+                })
+        finally:
+            state.end()
+
+    # Server-sent events in the chat.completion.chunk format, one word per chunk
+    def _stream(self, completion_id, model, content, token_latency, usage=None, finish_reason='stop'):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        def event(delta, finish_reason=None, usage=None):
+            chunk = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [] if usage else [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+            }
+            if usage:
+                chunk['usage'] = vars(usage)
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+
+        event({'role': 'assistant', 'content': ''})
+        for word in re.findall(r"\S+\s*", content):
+            if token_latency:
+                time.sleep(token_latency)
+            event({'content': word})
+        event({}, finish_reason)
+        if usage is not None:
+            event({}, usage=usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, state):
+        super().__init__(address, StubHandler)
+        self.state = state
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+# Start a server on a background thread; port 0 picks a free port. Call shutdown() when done.
+def start_stub_server(host='127.0.0.1', port=0, **options):
+    server = StubServer((host, port), StubState(**options))
+    thread = threading.Thread(target=server.serve_forever, name="llm-stub-server", daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub server for offline testing")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds before each response starts")
+    parser.add_argument('--token-latency', type=float, default=0.0, help="seconds between streamed chunks")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument('--error-status', type=int, default=429, help="HTTP status of simulated failures")
+    parser.add_argument('--seed', type=int, help="seed for the error sequence")
+    args = parser.parse_args()
+
+    state = StubState(args.latency, args.token_latency, args.error_rate, args.error_status, args.seed)
+    server = StubServer((args.host, args.port), state)
+    print(f"LLM stub server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,552 @@
+import copy
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_cache import make_cache_key
+from roster_index import RosterIndex
+from telemetry import span, traced
+from transcript_model import Transcript, prefilter_transcript
+
+# Meeting summarization and task extraction.
+# The LLM client and result cache are module-level and set through configure(),
+# so the Streamlit app, the batch runner and benchmarks can each plug in their own.
+
+# OpenAI-compatible client (anything with chat.completions.create, usually an
+# llm_backend.LLMBackend) and optional LLMCache
+client = None
+llm_cache = None
+
+def configure(llm_client, cache=None):
+    global client, llm_cache
+    client = llm_client
+    llm_cache = cache
+
+def cache_get(key):
+    if llm_cache is None:
+        return None
+    return llm_cache.get(key)
+
+def cache_set(key, value):
+    if llm_cache is not None:
+        llm_cache.set(key, value)
+
+# The backend may pin one model for every call (see llm_backend.LLMBackend.model_for)
+def model_for(default):
+    resolve = getattr(client, "model_for", None)
+    return resolve(default) if resolve else default
+
+# Which server answered (llm_backend.LLMBackend.name, the base URL for custom
+# endpoints), so results from one backend are never served for another
+def backend_name():
+    return getattr(client, "name", None)
+
+# Concurrent identical analyses (same cache key) share one run when the backend
+# supports it (see llm_backend.LLMBackend.coalesce); each caller gets its own copy
+def coalesce(key, func):
+    run = getattr(client, "coalesce", None)
+    if run is None:
+        return func()
+    result, shared = run(key, func)
+    return copy.deepcopy(result) if shared else result
+
+# Summarization settings. Token counts are estimated at ~4 characters per token,
+# which is close enough for budgeting gpt-3.5-turbo's context window.
+SUMMARY_MODEL = "gpt-3.5-turbo"
+TASK_MODEL = "gpt-3.5-turbo"
+# Bump these whenever a prompt changes so stale cached results are not reused
+SUMMARY_PROMPT_VERSION = "summary-v1"
+TASK_PROMPT_VERSION = "tasks-v3"
+CHARS_PER_TOKEN = 4
+SINGLE_PASS_TOKEN_LIMIT = 12000
+SUMMARY_CHUNK_TOKENS = 3000
+SUMMARY_CHUNK_OVERLAP_TOKENS = 200
+SUMMARY_MAX_WORKERS = 8
+# Task extraction pre-filters transcripts longer than this down to candidate spans
+PREFILTER_MIN_TOKENS = 2000
+# Task extraction's output budget grows with the transcript sent, within these bounds.
+# When a busy meeting still fills it, the complete tasks already returned are kept and
+# the model is asked only for the rest, up to TASK_MAX_CONTINUATIONS more times.
+TASK_MIN_OUTPUT_TOKENS = 500
+TASK_MAX_OUTPUT_TOKENS = 4000
+TASK_OUTPUT_TOKENS_PER_INPUT = 0.1
+TASK_MAX_CONTINUATIONS = 4
+
+# Start of the tasks array in a (possibly cut off) task extraction response
+TASKS_ARRAY_PATTERN = re.compile(r'"tasks"\s*:\s*\[')
+JSON_SEPARATOR_PATTERN = re.compile(r"[\s,]*")
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+# Split a transcript into speaker turns, keeping any untagged lines with the turn before them.
+# Turn boundaries are transcript_model's, the same ones the task pre-filter and live mode use.
+def split_speaker_turns(transcript):
+    model = Transcript(transcript)
+    turns = (model.turn_text(index).rstrip() for index in range(len(model)))
+    return [turn for turn in turns if turn.strip()]
+
+# Hard-split a single oversized turn on whitespace so no chunk exceeds the budget
+def split_long_turn(turn, max_tokens):
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces = []
+    while len(turn) > max_chars:
+        cut = turn.rfind(" ", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(turn[:cut])
+        turn = turn[cut:].lstrip()
+    if turn:
+        pieces.append(turn)
+    return pieces
+
+# Group speaker turns into token-bounded chunks that overlap by a few trailing turns
+def chunk_transcript(transcript, max_tokens=SUMMARY_CHUNK_TOKENS, overlap_tokens=SUMMARY_CHUNK_OVERLAP_TOKENS):
+    turns = []
+    for turn in split_speaker_turns(transcript):
+        if estimate_tokens(turn) > max_tokens:
+            turns.extend(split_long_turn(turn, max_tokens))
+        else:
+            turns.append(turn)
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for turn in turns:
+        turn_tokens = estimate_tokens(turn)
+        if current and current_tokens + turn_tokens > max_tokens:
+            chunks.append("\n".join(current))
+            # Carry the last few turns forward so context spanning the boundary isn't lost
+            overlap = []
+            overlap_size = 0
+            for previous in reversed(current):
+                previous_tokens = estimate_tokens(previous)
+                if overlap_size + previous_tokens > overlap_tokens:
+                    break
+                overlap.insert(0, previous)
+                overlap_size += previous_tokens
+            if overlap_size + turn_tokens > max_tokens:
+                overlap, overlap_size = [], 0
+            current = overlap
+            current_tokens = overlap_size
+        current.append(turn)
+        current_tokens += turn_tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+def summarize_chunk_messages(chunk, index, total):
+    return [
+        {"role": "system", "content": "You are a professional assistant that summarizes sections of long meeting transcripts."},
+        {"role": "user", "content": f"This is part {index + 1} of {total} of a meeting transcript. Summarize the key points, decisions and action items discussed in this part:\n\n{chunk}"}
+    ]
+
+def summarize_chunk(chunk, index, total):
+    response = client.chat.completions.create(
+        model=model_for(SUMMARY_MODEL),
+        messages=summarize_chunk_messages(chunk, index, total),
+        max_tokens=400
+    )
+    return response.choices[0].message.content
+
+def combine_summaries_messages(partial_summaries):
+    joined = "\n\n".join(f"Part {i + 1}:\n{text}" for i, text in enumerate(partial_summaries))
+    return [
+        {"role": "system", "content": "You are a professional assistant that creates concise yet comprehensive summaries of meeting transcripts."},
+        {"role": "user", "content": f"The following are summaries of consecutive parts of one meeting. Combine them into a single summary that captures the key points, decisions, and overall purpose:\n\n{joined}"}
+    ]
+
+def combine_summaries(partial_summaries):
+    response = client.chat.completions.create(
+        model=model_for(SUMMARY_MODEL),
+        messages=combine_summaries_messages(partial_summaries),
+        max_tokens=500
+    )
+    return response.choices[0].message.content
+
+# Combine partial summaries in groups until what is left fits a single call, and return that
+def reduce_to_final_group(partial_summaries, executor):
+    while True:
+        groups = []
+        group = []
+        group_tokens = 0
+        for text in partial_summaries:
+            text_tokens = estimate_tokens(text)
+            if group and group_tokens + text_tokens > SINGLE_PASS_TOKEN_LIMIT:
+                groups.append(group)
+                group, group_tokens = [], 0
+            group.append(text)
+            group_tokens += text_tokens
+        groups.append(group)
+
+        if len(groups) == 1:
+            return groups[0]
+        partial_summaries = list(executor.map(combine_summaries, groups))
+
+# Reduce partial summaries into one, combining in groups first if they don't fit a single call
+def reduce_summaries(partial_summaries, executor):
+    return combine_summaries(reduce_to_final_group(partial_summaries, executor))
+
+# Map step: summarize every chunk concurrently, then reduce to the partials the final call combines
+def summarize_chunks(chunks):
+    if not chunks:
+        return []
+    with ThreadPoolExecutor(max_workers=min(SUMMARY_MAX_WORKERS, len(chunks))) as executor:
+        partial_summaries = list(executor.map(
+            lambda item: summarize_chunk(item[1], item[0], len(chunks)),
+            enumerate(chunks)
+        ))
+        return reduce_to_final_group(partial_summaries, executor)
+
+# Map-reduce summarization: summarize chunks concurrently, then merge the partial summaries
+def generate_chunked_summary(transcript):
+    chunks = chunk_transcript(transcript)
+    if len(chunks) == 1:
+        return summarize_chunk(chunks[0], 0, 1)
+    return combine_summaries(summarize_chunks(chunks))
+
+def summary_messages(transcript):
+    return [
+        {"role": "system", "content": "You are a professional assistant that creates concise yet comprehensive summaries of meeting transcripts."},
+        {"role": "user", "content": f"Please provide a summarized version of this meeting transcript that captures the key points, decisions, and overall purpose:\n\n{transcript}"}
+    ]
+
+# On failure the error text is returned and, if given, metrics["error"] is set, so
+# callers can check the flag rather than the text (as with stream_meeting_summary)
+@traced("analysis.summary")
+def generate_meeting_summary(transcript, chunked=None, metrics=None):
+    # Whitespace-only transcripts have no speaker turns, so there would be nothing to chunk
+    if not transcript or not transcript.strip():
+        return "No transcript provided for summarization."
+    
+    cache_key = make_cache_key("summary", transcript, None, SUMMARY_PROMPT_VERSION, model_for(SUMMARY_MODEL), backend_name())
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Long transcripts go through map-reduce so they never overflow the context window
+    if chunked is None:
+        chunked = estimate_tokens(transcript) > SINGLE_PASS_TOKEN_LIMIT
+    
+    def summarize():
+        if chunked:
+            summary = generate_chunked_summary(transcript)
+        else:
+            response = client.chat.completions.create(
+                model=model_for(SUMMARY_MODEL),
+                messages=summary_messages(transcript),
+                max_tokens=500
+            )
+            summary = response.choices[0].message.content
+        
+        cache_set(cache_key, summary)
+        return summary
+    
+    try:
+        return coalesce(cache_key, summarize)
+    except Exception as e:
+        if metrics is not None:
+            metrics["error"] = str(e)
+        return f"Error generating meeting summary: {str(e)}"
+
+# Text deltas from a streamed chat completion
+def stream_completion(model, messages, max_tokens):
+    stream = client.chat.completions.create(
+        model=model, messages=messages, max_tokens=max_tokens, stream=True,
+        stream_options={"include_usage": True}
+    )
+    for chunk in stream:
+        # The final chunk of a stream can carry usage only, with no choices
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+# Streaming variant of generate_meeting_summary: yields the summary as it is generated,
+# so it can be fed straight to st.write_stream. For chunked transcripts the map step
+# runs first and only the final combine call is streamed. Timings are written into
+# `metrics`: "first_token" (seconds until the first text arrived) and "total". If
+# generation fails, metrics["error"] is set; the error text is still streamed, so
+# callers must check the flag rather than the text, which may be a partial summary.
+def stream_meeting_summary(transcript, chunked=None, metrics=None):
+    metrics = metrics if metrics is not None else {}
+    start = time.perf_counter()
+    if not transcript or not transcript.strip():
+        metrics["first_token"] = metrics["total"] = 0.0
+        yield "No transcript provided for summarization."
+        return
+    
+    cache_key = make_cache_key("summary", transcript, None, SUMMARY_PROMPT_VERSION, model_for(SUMMARY_MODEL), backend_name())
+    cached = cache_get(cache_key)
+    if cached is not None:
+        metrics["first_token"] = metrics["total"] = time.perf_counter() - start
+        yield cached
+        return
+    
+    if chunked is None:
+        chunked = estimate_tokens(transcript) > SINGLE_PASS_TOKEN_LIMIT
+    
+    pieces = []
+    try:
+        if chunked:
+            chunks = chunk_transcript(transcript)
+            if len(chunks) == 1:
+                messages, max_tokens = summarize_chunk_messages(chunks[0], 0, 1), 400
+            else:
+                messages, max_tokens = combine_summaries_messages(summarize_chunks(chunks)), 500
+        else:
+            messages, max_tokens = summary_messages(transcript), 500
+        
+        for piece in stream_completion(model_for(SUMMARY_MODEL), messages, max_tokens):
+            if not pieces:
+                metrics["first_token"] = time.perf_counter() - start
+            pieces.append(piece)
+            yield piece
+    except Exception as e:
+        metrics.setdefault("first_token", time.perf_counter() - start)
+        metrics["total"] = time.perf_counter() - start
+        metrics["error"] = str(e)
+        yield ("\n\n" if pieces else "") + f"Error generating meeting summary: {str(e)}"
+        return
+    
+    metrics.setdefault("first_token", time.perf_counter() - start)
+    metrics["total"] = time.perf_counter() - start
+    cache_set(cache_key, "".join(pieces))
+
+def format_participant_info(participants):
+    return "".join(f"- {p['name']}: {p['expertise']}, Email: {p['email']}\n" for p in participants)
+
+# Validation step: only keep tasks assigned to actual participants
+def validate_tasks(tasks, roster_index):
+    validated_tasks = []
+    for task in tasks:
+        if not isinstance(task, dict):
+            continue
+        assignee = task.get("assignee") or ""
+        participant = roster_index.resolve(assignee)
+        
+        # Check if:
+        # 1. The task has actual content
+        # 2. Either the assignee is "Unassigned" or matches someone in our participant list
+        if str(task.get("task", "")).strip() and (
+            assignee.lower() == "unassigned" or participant is not None
+        ):
+            # Use the roster's spelling of the name and add their email
+            if participant is not None:
+                task["assignee"] = participant['name']
+                task["email"] = participant['email']
+            else:
+                task["email"] = ""
+            
+            validated_tasks.append(task)
+    return validated_tasks
+
+def task_output_budget(transcript_tokens):
+    budget = TASK_MIN_OUTPUT_TOKENS + int(transcript_tokens * TASK_OUTPUT_TOKENS_PER_INPUT)
+    return min(TASK_MAX_OUTPUT_TOKENS, budget)
+
+# Complete task objects from a response that was cut off mid-array
+def salvage_tasks(content):
+    match = TASKS_ARRAY_PATTERN.search(content or "")
+    if not match:
+        return []
+    decoder = json.JSONDecoder()
+    tasks = []
+    position = match.end()
+    while True:
+        position = JSON_SEPARATOR_PATTERN.match(content, position).end()
+        if position >= len(content) or content[position] == "]":
+            break
+        try:
+            task, position = decoder.raw_decode(content, position)
+        except ValueError:
+            break
+        tasks.append(task)
+    return tasks
+
+def continuation_message(tasks):
+    extracted = "\n".join(f"- {task.get('task', '')} ({task.get('assignee') or 'Unassigned'})" for task in tasks if isinstance(task, dict))
+    return {"role": "user", "content": f"""Your previous response was cut off. These tasks were already extracted:
+{extracted}
+
+Return a JSON object with a 'tasks' array containing only the remaining tasks that are not listed above, in the same format. Return an empty array if there are none."""}
+
+# Ask for tasks, continuing past truncated responses instead of starting over.
+# Returns the tasks and how the output budget was used.
+def request_tasks(messages, max_tokens):
+    tasks = []
+    seen = set()
+    output = {"max_tokens": max_tokens, "continuations": 0, "truncated": False}
+    request_messages = messages
+    while True:
+        response = client.chat.completions.create(
+            model=model_for(TASK_MODEL),
+            messages=request_messages,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}
+        )
+        choice = response.choices[0]
+        truncated = getattr(choice, "finish_reason", None) == "length"
+        if truncated:
+            new_tasks = salvage_tasks(choice.message.content)
+        else:
+            result = json.loads(choice.message.content)
+            # Ensure we have a "tasks" property that is a list
+            new_tasks = result.get("tasks") if isinstance(result.get("tasks"), list) else []
+        
+        # A continuation may repeat a task it was told about
+        for task in new_tasks:
+            key = (str(task.get("task", "")).strip().lower(), task.get("assignee")) if isinstance(task, dict) else None
+            if key not in seen:
+                seen.add(key)
+                tasks.append(task)
+        
+        if not truncated:
+            return tasks, output
+        if output["continuations"] >= TASK_MAX_CONTINUATIONS:
+            output["truncated"] = True
+            return tasks, output
+        if not new_tasks:
+            # Not even one task fit, so the budget itself is too small
+            if max_tokens >= TASK_MAX_OUTPUT_TOKENS:
+                output["truncated"] = True
+                return tasks, output
+            max_tokens = min(TASK_MAX_OUTPUT_TOKENS, max_tokens * 2)
+            output["max_tokens"] = max_tokens
+        output["continuations"] += 1
+        request_messages = messages + [continuation_message(tasks)] if tasks else messages
+
+# Modified task extraction to avoid creating artificial tasks
+@traced("analysis.tasks")
+def extract_tasks_and_assign(transcript, participants, roster_index=None, prefilter=None):
+    if not transcript or not participants:
+        return {"tasks": []}
+    
+    # Long meetings only send the turns that look like action items, plus a turn of context either side
+    if prefilter is None:
+        prefilter = estimate_tokens(transcript) > PREFILTER_MIN_TOKENS
+    
+    cache_kind = "tasks-prefiltered" if prefilter else "tasks"
+    cache_key = make_cache_key(cache_kind, transcript, participants, TASK_PROMPT_VERSION, model_for(TASK_MODEL), backend_name())
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
+    return coalesce(cache_key, lambda: run_task_extraction(transcript, participants, roster_index, prefilter, cache_key))
+
+# Everything extract_tasks_and_assign does after a cache miss
+def run_task_extraction(transcript, participants, roster_index, prefilter, cache_key):
+    if roster_index is None:
+        roster_index = RosterIndex(participants)
+    
+    if prefilter:
+        with span("analysis.prefilter"):
+            model_transcript = prefilter_transcript(transcript, roster_index)
+    else:
+        model_transcript = transcript
+    transcript_stats = {
+        "prefiltered": prefilter,
+        "tokens": estimate_tokens(transcript),
+        "tokens_sent": estimate_tokens(model_transcript)
+    }
+    omitted_note = "\n                - Parts of the transcript without action items were omitted and are marked [...]." if prefilter else ""
+    
+    # Only people named in the transcript can be assigned tasks, so the model only needs to see them
+    mentioned = roster_index.find_mentioned(model_transcript)
+    participant_info = format_participant_info(mentioned)
+    roster_stats = {
+        "participants": len(participants),
+        "included": len(mentioned),
+        "tokens_saved": estimate_tokens(format_participant_info(participants)) - estimate_tokens(participant_info)
+    }
+    
+    # Nothing in the meeting looked like an action item, so there is nothing to ask the model
+    if prefilter and not model_transcript.replace("[...]", "").strip():
+        result = {"tasks": [], "roster": roster_stats, "transcript": transcript_stats}
+        cache_set(cache_key, result)
+        return result
+    
+    messages = [
+        {"role": "system", "content": """You are a professional assistant that identifies ONLY explicitly mentioned tasks from meeting transcripts.
+                
+                STRICT RULES:
+                1. ONLY extract tasks that are EXPLICITLY mentioned in the transcript.
+                2. NEVER invent, infer, or create tasks that aren't clearly stated in the transcript.
+                3. ONLY assign tasks to people who are EXPLICITLY mentioned as responsible in the transcript AND appear in the provided participant list.
+                4. If a task exists but has no clear assignee, mark it as 'Unassigned'.
+                5. If no tasks are mentioned at all, return an empty tasks array.
+                6. Do not try to be helpful by creating tasks - only report what's in the transcript."""},
+                
+        {"role": "user", "content": f"""Based on the meeting transcript below, identify ONLY explicitly mentioned tasks and action items.
+                
+                IMPORTANT CONSTRAINTS:
+                - Task extraction should be CONSERVATIVE - only include tasks with clear action verbs and deliverables.
+                - A person can only be assigned a task if they are EXPLICITLY mentioned as responsible AND they appear in the team member list below.
+                - Return a COMPLETELY EMPTY tasks array if no explicit tasks are mentioned.{omitted_note}
+                
+                Format your response as a JSON object with a 'tasks' array. Each task should include:
+                - 'task': The specific action item mentioned (verbatim from transcript when possible)
+                - 'assignee': The person explicitly assigned (must match a name in team list) or 'Unassigned'
+                - 'due_date': Only if explicitly mentioned with a specific date, otherwise 'Not specified'
+                - 'context': Short quote from transcript showing where task was mentioned
+                
+                Meeting Transcript:
+                {model_transcript}
+                
+                Team Members (ONLY these people can be assigned tasks):
+                {participant_info}
+                
+                If someone is mentioned in the transcript but isn't in this team list, DO NOT assign tasks to them."""}
+    ]
+    
+    try:
+        tasks, output = request_tasks(messages, task_output_budget(transcript_stats["tokens_sent"]))
+        validated_tasks = validate_tasks(tasks, roster_index)
+        
+        # The same action item restated later in the meeting becomes one task.
+        # Imported here so numpy isn't loaded until the first extraction.
+        from task_dedup import merge_duplicate_tasks
+        with span("analysis.dedup", tasks=len(validated_tasks)):
+            try:
+                validated_tasks, duplicates_merged = merge_duplicate_tasks(validated_tasks)
+            except Exception as e:
+                # Merging is a nicety; keep the unmerged tasks rather than losing them all
+                print(f"Error merging duplicate tasks: {str(e)}")
+                duplicates_merged = 0
+        
+        # Only complete, successful extractions are cached; errors fall through to the except below
+        result = {
+            "tasks": validated_tasks,
+            "roster": roster_stats,
+            "transcript": transcript_stats,
+            "output": output,
+            "duplicates_merged": duplicates_merged
+        }
+        if not output["truncated"]:
+            cache_set(cache_key, result)
+        return result
+    
+    except Exception as e:
+        print(f"Error extracting tasks: {str(e)}")
+        # Callers check "error" so a failed extraction isn't stored as a meeting with no tasks
+        return {"tasks": [], "error": str(e)}
+
+# Run summarization and task extraction at the same time, timing each stage
+def analyze_meeting(transcript, participants, roster_index=None, summary_metrics=None):
+    def timed(func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        return result, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        summary_future = executor.submit(timed, generate_meeting_summary, transcript, metrics=summary_metrics)
+        tasks_future = executor.submit(timed, extract_tasks_and_assign, transcript, participants, roster_index)
+        summary, summary_seconds = summary_future.result()
+        tasks_result, tasks_seconds = tasks_future.result()
+
+    timings = {
+        "summary": summary_seconds,
+        "tasks": tasks_seconds,
+        "total": time.perf_counter() - start
+    }
+    return summary, tasks_result, timings
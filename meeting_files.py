@@ -0,0 +1,117 @@
+import csv
+
+from docx_extract import extract_docx_text, iter_docx_blocks
+from telemetry import span
+
+# Parsing of transcript and participant files from raw bytes.
+# Shared by the Streamlit app and the batch runner; neither function touches the UI.
+# Unsupported extensions return None and format problems raise ValueError with a
+# message meant for the user.
+
+
+def get_file_extension(filename):
+    return filename.split('.')[-1].lower()
+
+
+def read_transcript_bytes(file_extension, data):
+    with span("parse.transcript", format=file_extension, bytes=len(data)):
+        return _read_transcript_bytes(file_extension, data)
+
+
+def _read_transcript_bytes(file_extension, data):
+    if file_extension == 'txt':
+        content = data.decode('utf-8')
+    elif file_extension == 'docx':
+        # Streams word/document.xml, including transcripts kept in tables
+        content = extract_docx_text(data)
+    elif file_extension == 'pdf':
+        # PyPDF2 is only imported once someone actually uploads a PDF
+        from pdf_extract import extract_pdf_text
+        # Pages are extracted in a process pool for long documents and joined once
+        content = extract_pdf_text(data)
+    else:
+        return None
+    
+    return content
+
+
+def read_participants_bytes(file_extension, data):
+    with span("parse.participants", format=file_extension, bytes=len(data)) as current:
+        participants = _read_participants_bytes(file_extension, data)
+        current.set(rows=len(participants) if participants is not None else 0)
+        return participants
+
+
+def _read_participants_bytes(file_extension, data):
+    participants = []
+    
+    if file_extension == 'csv':
+        # Read CSV data and skip any initial blank rows
+        csv_data = data.decode('utf-8').splitlines()
+        # Use Python's CSV reader for more robust parsing
+        reader = csv.DictReader(csv_data)
+        
+        required_columns = ['name', 'email', 'expertise']
+        
+        # Check if all required columns are present (case-insensitive)
+        header_lower = [col.lower() for col in reader.fieldnames]
+        if not all(col.lower() in header_lower for col in required_columns):
+            raise ValueError("CSV file must contain 'name', 'email', and 'expertise' columns")
+        
+        # Map actual column names to expected column names (handling case differences)
+        col_mapping = {}
+        for req_col in required_columns:
+            for actual_col in reader.fieldnames:
+                if actual_col.lower() == req_col.lower():
+                    col_mapping[req_col] = actual_col
+        
+        # Convert CSV rows to list of dictionaries
+        for row in reader:
+            if any(row.values()):  # Skip completely empty rows
+                participant = {
+                    'name': row[col_mapping['name']].strip(),
+                    'email': row[col_mapping['email']].strip(),
+                    'expertise': row[col_mapping['expertise']].strip()
+                }
+                participants.append(participant)
+            
+    elif file_extension == 'txt':
+        content = data.decode('utf-8')
+        lines = content.split('\n')
+        for line in lines:
+            if line.strip():  # Skip empty lines
+                parts = line.split(',')
+                if len(parts) >= 3:
+                    participants.append({
+                        'name': parts[0].strip(),
+                        'email': parts[1].strip(),
+                        'expertise': parts[2].strip()
+                    })
+                else:
+                    raise ValueError(f"Invalid format in line: {line}. Expected 'name, email, expertise'")
+                    
+    elif file_extension == 'docx':
+        for kind, value in iter_docx_blocks(data):
+            # Table rows already come split into cells; paragraphs are comma separated
+            if kind == 'row':
+                parts = value
+                line = "\t".join(value)
+            else:
+                parts = value.split(',')
+                line = value
+            if not line.strip():  # Skip empty lines
+                continue
+            if kind == 'row' and parts[0].strip().lower() == 'name':  # Skip table header row
+                continue
+            if len(parts) >= 3:
+                participants.append({
+                    'name': parts[0].strip(),
+                    'email': parts[1].strip(),
+                    'expertise': parts[2].strip()
+                })
+            else:
+                raise ValueError(f"Invalid format in line: {line}. Expected 'name, email, expertise'")
+    else:
+        return None
+    
+    return participants
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from contextlib import closing
+
+# Persistent history of analyzed meetings.
+# Every analysis is stored with its transcript, participants, summary and the
+# validated tasks (assignee, email, due date, context quote), so a past meeting
+# can be reopened without calling the model again. Tasks are indexed with SQLite
+# FTS5 for instant search across meetings, optionally narrowed to one assignee
+# and a date range ("what did I commit to last month").
+# Same connection-per-operation SQLite approach as llm_cache.LLMCache.
+
+TITLE_PATTERN = re.compile(r"^\s*(?:meeting\s+)?title\s*:\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+DATE_PATTERN = re.compile(r"^\s*date\s*:\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+SEARCH_TOKEN = re.compile(r"\w+", re.UNICODE)
+MAX_TITLE_LENGTH = 120
+
+
+# Identifies a meeting by its content, so re-analyzing the same upload updates it in place
+def meeting_key(transcript):
+    normalized = " ".join((transcript or "").split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+# "Meeting Title:" line if the transcript has one, else the fallback, else the first line
+def guess_title(transcript, fallback=None):
+    match = TITLE_PATTERN.search(transcript or "")
+    if match:
+        return match.group(1).strip()[:MAX_TITLE_LENGTH]
+    if fallback:
+        return fallback
+    first_line = next((line.strip() for line in (transcript or "").splitlines() if line.strip()), "")
+    return first_line[:MAX_TITLE_LENGTH] or "Untitled meeting"
+
+
+def guess_meeting_date(transcript):
+    match = DATE_PATTERN.search(transcript or "")
+    return match.group(1).strip()[:60] if match else None
+
+
+# Turn free text into an FTS5 query: every word must match, as a prefix, and no
+# user input is ever interpreted as FTS syntax
+def build_match_query(text):
+    tokens = SEARCH_TOKEN.findall(text or "")
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class MeetingHistory:
+    def __init__(self, path):
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS meetings (
+                    id INTEGER PRIMARY KEY,
+                    key TEXT NOT NULL UNIQUE,
+                    title TEXT NOT NULL,
+                    meeting_date TEXT,
+                    analyzed_at REAL NOT NULL,
+                    transcript TEXT NOT NULL,
+                    participants TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    result TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS meetings_analyzed_at ON meetings (analyzed_at);
+
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    meeting_id INTEGER NOT NULL REFERENCES meetings (id) ON DELETE CASCADE,
+                    position INTEGER NOT NULL,
+                    task TEXT NOT NULL,
+                    assignee TEXT,
+                    email TEXT,
+                    due_date TEXT,
+                    context TEXT
+                );
+                CREATE INDEX IF NOT EXISTS tasks_meeting ON tasks (meeting_id, position);
+                CREATE INDEX IF NOT EXISTS tasks_email ON tasks (email);
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                    task, assignee, due_date, context, title, tokenize='porter unicode61'
+                );
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    # Store (or replace) an analyzed meeting and index its tasks; returns the meeting id
+    def save_meeting(self, transcript, participants, summary, tasks_result, title=None, analyzed_at=None):
+        key = meeting_key(transcript)
+        title = guess_title(transcript, title)
+        tasks = (tasks_result or {}).get('tasks', [])
+        analyzed_at = analyzed_at or time.time()
+        with closing(self._connect()) as conn, conn:
+            previous = conn.execute("SELECT id FROM meetings WHERE key = ?", (key,)).fetchone()
+            if previous:
+                self._delete_tasks(conn, previous[0])
+                conn.execute("DELETE FROM meetings WHERE id = ?", (previous[0],))
+            meeting_id = conn.execute(
+                """INSERT INTO meetings (key, title, meeting_date, analyzed_at, transcript, participants, summary, result)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (key, title, guess_meeting_date(transcript), analyzed_at, transcript,
+                 json.dumps(participants or []), summary or "", json.dumps(tasks_result or {}))
+            ).lastrowid
+            for position, task in enumerate(tasks):
+                task_id = conn.execute(
+                    """INSERT INTO tasks (meeting_id, position, task, assignee, email, due_date, context)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (meeting_id, position, task.get('task', ''), task.get('assignee'), task.get('email'),
+                     task.get('due_date'), task.get('context'))
+                ).lastrowid
+                conn.execute(
+                    "INSERT INTO tasks_fts (rowid, task, assignee, due_date, context, title) VALUES (?, ?, ?, ?, ?, ?)",
+                    (task_id, task.get('task', ''), task.get('assignee') or "", task.get('due_date') or "",
+                     task.get('context') or "", title)
+                )
+        return meeting_id
+
+    def _delete_tasks(self, conn, meeting_id):
+        conn.execute(
+            "DELETE FROM tasks_fts WHERE rowid IN (SELECT id FROM tasks WHERE meeting_id = ?)", (meeting_id,)
+        )
+        conn.execute("DELETE FROM tasks WHERE meeting_id = ?", (meeting_id,))
+
+    def delete_meeting(self, meeting_id):
+        with closing(self._connect()) as conn, conn:
+            self._delete_tasks(conn, meeting_id)
+            conn.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+
+    # Everything needed to restore a meeting in the app, without touching the model
+    def load_meeting(self, meeting_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                """SELECT id, title, meeting_date, analyzed_at, transcript, participants, summary, result
+                   FROM meetings WHERE id = ?""",
+                (meeting_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'id': row[0],
+            'title': row[1],
+            'meeting_date': row[2],
+            'analyzed_at': row[3],
+            'transcript': row[4],
+            'participants': json.loads(row[5]),
+            'summary': row[6],
+            'tasks': json.loads(row[7])
+        }
+
+    def find_by_transcript(self, transcript):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT id FROM meetings WHERE key = ?", (meeting_key(transcript),)).fetchone()
+        return row[0] if row else None
+
+    def list_meetings(self, limit=50, offset=0):
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                """SELECT m.id, m.title, m.meeting_date, m.analyzed_at,
+                          (SELECT COUNT(*) FROM tasks t WHERE t.meeting_id = m.id)
+                   FROM meetings m ORDER BY m.analyzed_at DESC LIMIT ? OFFSET ?""",
+                (limit, offset)
+            ).fetchall()
+        return [
+            {'id': r[0], 'title': r[1], 'meeting_date': r[2], 'analyzed_at': r[3], 'task_count': r[4]}
+            for r in rows
+        ]
+
+    # Assignees seen across all meetings, most frequent first, for a filter dropdown
+    def assignees(self, limit=500):
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                """SELECT assignee, email, COUNT(*) FROM tasks WHERE assignee IS NOT NULL AND assignee != ''
+                   GROUP BY assignee, email ORDER BY COUNT(*) DESC, assignee LIMIT ?""",
+                (limit,)
+            ).fetchall()
+        return [{'name': r[0], 'email': r[1], 'tasks': r[2]} for r in rows]
+
+    # Tasks matching `text` (all words, prefix match, best first), optionally only
+    # for one assignee (name or email) and meetings analyzed in [since, until)
+    def search_tasks(self, text="", assignee=None, since=None, until=None, limit=100):
+        conditions, params = [], []
+        match_query = build_match_query(text)
+        if match_query:
+            source = "tasks_fts JOIN tasks t ON t.id = tasks_fts.rowid JOIN meetings m ON m.id = t.meeting_id"
+            conditions.append("tasks_fts MATCH ?")
+            params.append(match_query)
+            order = "bm25(tasks_fts), m.analyzed_at DESC"
+        else:
+            source = "tasks t JOIN meetings m ON m.id = t.meeting_id"
+            order = "m.analyzed_at DESC, t.position"
+        if assignee:
+            conditions.append("(t.email = ? COLLATE NOCASE OR t.assignee = ? COLLATE NOCASE)")
+            params.extend([assignee, assignee])
+        if since is not None:
+            conditions.append("m.analyzed_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("m.analyzed_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"""SELECT t.id, m.id, m.title, m.meeting_date, m.analyzed_at,
+                           t.task, t.assignee, t.email, t.due_date, t.context
+                    FROM {source} {where} ORDER BY {order} LIMIT ?""",
+                (*params, limit)
+            ).fetchall()
+        return [
+            {
+                'task_id': r[0], 'meeting_id': r[1], 'title': r[2], 'meeting_date': r[3], 'analyzed_at': r[4],
+                'task': r[5], 'assignee': r[6], 'email': r[7], 'due_date': r[8], 'context': r[9]
+            }
+            for r in rows
+        ]
+
+    def stats(self):
+        with closing(self._connect()) as conn:
+            meetings = conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+            tasks = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        return {'meetings': meetings, 'tasks': tasks}
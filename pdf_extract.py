@@ -0,0 +1,64 @@
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+
+# Page-parallel PDF text extraction.
+# PyPDF2 text extraction is pure Python and CPU bound, so long PDFs are split
+# into page ranges and extracted in a process pool. Pages are yielded in order as
+# their range finishes, and extract_pdf_text joins them once at the end.
+
+# Below this many pages the process pool costs more than it saves
+PARALLEL_PAGE_THRESHOLD = 64
+PAGES_PER_TASK = 16
+
+# Each worker process keeps its own parsed copy of the document
+_worker_reader = None
+
+
+def _init_worker(data):
+    global _worker_reader
+    _worker_reader = PyPDF2.PdfReader(io.BytesIO(data))
+
+
+def _extract_page_range(page_range):
+    start, stop = page_range
+    return [_worker_reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+# Yield the text of each page in order, extracting in parallel for large documents
+def iter_pdf_pages(data, max_workers=None, pages_per_task=PAGES_PER_TASK):
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+    page_count = len(pdf_reader.pages)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if page_count < PARALLEL_PAGE_THRESHOLD or max_workers == 1:
+        for page in pdf_reader.pages:
+            yield page.extract_text() or ""
+        return
+
+    page_ranges = [
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+    # Spawned workers avoid forking Streamlit's threads; the bytes are sent once per worker
+    executor = ProcessPoolExecutor(
+        max_workers=min(max_workers, len(page_ranges)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(data,)
+    )
+    try:
+        for pages in executor.map(_extract_page_range, page_ranges):
+            yield from pages
+    finally:
+        # A consumer that stops early shouldn't wait for the remaining ranges
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def extract_pdf_text(data, max_workers=None):
+    pages = list(iter_pdf_pages(data, max_workers=max_workers))
+    # Same layout as before: every page followed by a newline
+    return "\n".join(pages) + "\n" if pages else ""
@@ -0,0 +1,62 @@
+import re
+import unicodedata
+
+# Name index over a participant roster.
+# Every participant is indexed by normalized full name, first name and surname.
+# Task extraction uses it to send the model only the people actually mentioned
+# in the transcript, and to map the assignee names the model returns back to
+# roster entries.
+
+NON_ALNUM = re.compile(r"[^a-z0-9]+")
+# Single letters and initials match far too much text to count as a mention
+MIN_NAME_TOKEN_LENGTH = 2
+
+
+# Lowercase, strip accents and punctuation: "José O'Brien-Smith" -> "jose obrien smith"
+def normalize_name(text):
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.lower().replace("'", "").replace("’", "")
+    return NON_ALNUM.sub(" ", text).strip()
+
+
+class RosterIndex:
+    def __init__(self, participants):
+        self.participants = list(participants or [])
+        self.by_full_name = {}
+        self.by_token = {}
+
+        for position, participant in enumerate(self.participants):
+            normalized = normalize_name(participant.get('name', ''))
+            if not normalized:
+                continue
+            self.by_full_name.setdefault(normalized, []).append(position)
+            tokens = normalized.split()
+            # First name and surname are the forms people use in conversation
+            for token in {tokens[0], tokens[-1]}:
+                if len(token) >= MIN_NAME_TOKEN_LENGTH:
+                    self.by_token.setdefault(token, []).append(position)
+
+    # Participants whose first name, surname or full name appears in the text, in roster order
+    def find_mentioned(self, text):
+        words = set(normalize_name(text).split())
+        positions = set()
+        for word in words:
+            positions.update(self.by_token.get(word, ()))
+        return [self.participants[position] for position in sorted(positions)]
+
+    # Map a name returned by the model to exactly one participant, or None.
+    # Full names must match; a bare first name or surname only counts if it is unambiguous.
+    def resolve(self, name):
+        normalized = normalize_name(name)
+        if not normalized:
+            return None
+        matches = self.by_full_name.get(normalized)
+        if matches:
+            # Repeated roster rows for the same full name are the same person
+            return self.participants[matches[0]]
+        if len(normalized.split()) == 1:
+            matches = self.by_token.get(normalized)
+            if matches and len(matches) == 1:
+                return self.participants[matches[0]]
+        return None
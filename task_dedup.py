@@ -0,0 +1,216 @@
+import re
+
+import numpy as np
+
+from roster_index import NON_ALNUM, normalize_name
+
+# Near-duplicate merging for extracted tasks.
+# Meetings restate action items ("Ahmed will do the projections" ... "Ahmed, we
+# need those projections before Monday"), and the model often returns each
+# mention as its own task. Tasks are compared within each assignee's list by the
+# character trigrams of their descriptions (without filler and date words),
+# weighted by IDF and hashed into a fixed number of features, so the whole list
+# is vectorized with NumPy; a few thousand tasks take milliseconds. Two tasks
+# match when most of the shorter description's weight is shared with the longer
+# one, since a restatement usually adds detail rather than rewording; numbers and
+# other identifiers in the descriptions must match exactly. Each group
+# of matches becomes one task that keeps the most specific due date and the
+# most detailed context.
+
+SHINGLE_SIZE = 3
+FEATURE_BITS = 12
+FEATURES = 1 << FEATURE_BITS
+# Share of the shorter description's trigram weight found in the other one
+DUPLICATE_THRESHOLD = 0.7
+# Words that carry no meaning of their own in a task description
+STOP_WORDS = {
+    "a", "an", "the", "and", "or", "to", "of", "for", "on", "in", "at", "by", "with", "from", "up",
+    "will", "shall", "should", "must", "need", "needs", "please", "can", "could", "would",
+    "i", "we", "you", "he", "she", "they", "it", "this", "that", "these", "those", "our", "your", "their",
+    "is", "are", "be", "been", "do", "does", "get", "make", "sure", "also", "all",
+    # Deadlines are compared through due_date, not the description
+    "before", "after", "until", "next", "week", "today", "tomorrow", "tonight", "end", "eod", "asap"
+}
+UNSPECIFIED_DUE_DATES = {"", "not specified", "none", "n/a", "na", "unspecified", "tbd"}
+MONTHS = [
+    "jan", "january", "feb", "february", "mar", "march", "apr", "april", "may", "jun", "june", "jul", "july",
+    "aug", "august", "sep", "sept", "september", "oct", "october", "nov", "november", "dec", "december"
+]
+MONTH_WORDS = set(MONTHS)
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+DATE_WORDS = re.compile(r"\b(" + "|".join(MONTHS + [f"{day}s?" for day in WEEKDAYS]) + r")\b", re.IGNORECASE)
+# Everything dropped from a description before comparing
+DESCRIPTION_STOP_WORDS = STOP_WORDS | set(MONTHS) | set(WEEKDAYS) | {f"{day}s" for day in WEEKDAYS}
+# Knuth's multiplicative hash spreads trigram codes over the feature buckets
+HASH_MULTIPLIER = 2654435761
+
+
+# How precisely a due date pins down the deadline: unspecified < "soon" < "Friday" < "May 12"
+def due_date_specificity(due_date):
+    text = str(due_date or "").strip()
+    if text.lower() in UNSPECIFIED_DUE_DATES:
+        return (0, 0)
+    score = 1
+    if DATE_WORDS.search(text):
+        score += 1
+    if any(ch.isdigit() for ch in text):
+        score += 2
+    return (score, len(text))
+
+
+# A task's description for comparison, and the identifiers in it: words with a
+# digit ("q3", "1041", "v2"), except the day and year of a date like "May 12".
+# Identifiers barely change the trigram score, so tasks only match when theirs are
+# identical ("Review the Q3 budget" is not "Review the Q4 budget").
+def _description(task, name_words):
+    # Plain lowercasing is enough here: accents only change the trigrams consistently
+    words = NON_ALNUM.sub(" ", str(task.get("task", "")).lower().replace("'", "")).split()
+    near_month = set()
+    for position, word in enumerate(words):
+        if word in MONTH_WORDS:
+            near_month.update(range(position - 1, position + 3))
+    identifiers = tuple(sorted({
+        word for position, word in enumerate(words)
+        if position not in near_month and any(ch.isdigit() for ch in word)
+    }))
+    description = " ".join(word for word in words if word not in DESCRIPTION_STOP_WORDS and word not in name_words)
+    return description, identifiers
+
+
+# Hashed character trigrams of each text as the non-zero entries (rows, columns, values)
+# of a matrix sorted by row, with values sqrt(IDF) so a row's dot product with another
+# row is the IDF weight of the trigrams they share
+def shingle_vectors(texts):
+    encoded = [f" {text} ".encode("utf-8") for text in texts]
+    lengths = np.fromiter((len(data) for data in encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+    rows = np.repeat(np.arange(len(texts)), lengths)
+    row_ends = np.repeat(np.cumsum(lengths), lengths)
+
+    # Every window of SHINGLE_SIZE bytes that doesn't run into the next text
+    count = len(data) - SHINGLE_SIZE + 1
+    if count <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    codes = np.zeros(count, dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        codes = (codes << np.uint64(8)) | data[offset:offset + count]
+    valid = np.arange(count) + SHINGLE_SIZE <= row_ends[:count]
+    buckets = ((codes[valid] * np.uint64(HASH_MULTIPLIER)) & np.uint64(0xFFFFFFFF)) >> np.uint64(32 - FEATURE_BITS)
+
+    # Sort and drop repeats rather than np.unique, which is several times slower here
+    keys = np.sort(rows[:count][valid] * FEATURES + buckets.astype(np.int64))
+    if not len(keys):
+        # Every text was too short for a single shingle
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    entry_rows, entry_columns = keys // FEATURES, keys % FEATURES
+    document_frequency = np.bincount(entry_columns, minlength=FEATURES)
+    idf = np.log((1 + len(texts)) / (1 + document_frequency)) + 1
+    return entry_rows, entry_columns, np.sqrt(idf[entry_columns])
+
+
+# Pairs of tasks in the same group (same assignee and identifiers) whose overlap
+# reaches the threshold, as arrays (first, second, overlap) with first < second.
+# Pairs are found by joining the entries on (group, feature), so the work grows
+# with the number of shared trigrams rather than with the square of each
+# assignee's task count.
+def similar_pairs(owners, entry_rows, entry_columns, values, threshold):
+    count = len(owners)
+    keys = owners[entry_rows] * FEATURES + entry_columns
+    # Sorted by (group, feature, task); one int64 sort key is much faster than lexsort
+    order = np.argsort(keys * count + entry_rows)
+    keys, rows, weighted = keys[order], entry_rows[order], values[order]
+
+    # Entries `distance` apart in a run of equal keys are pairs; a pair at distance
+    # d + 1 implies one at distance d, so each round only checks the previous survivors
+    firsts, seconds, products = [], [], []
+    candidates = np.arange(len(keys) - 1)
+    distance = 1
+    while len(candidates):
+        candidates = candidates[candidates + distance < len(keys)]
+        candidates = candidates[keys[candidates + distance] == keys[candidates]]
+        firsts.append(rows[candidates])
+        seconds.append(rows[candidates + distance])
+        products.append(weighted[candidates] * weighted[candidates + distance])
+        distance += 1
+    if not firsts or not sum(len(first) for first in firsts):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    pair_keys = np.concatenate(firsts) * count + np.concatenate(seconds)
+    products = np.concatenate(products)
+    order = np.argsort(pair_keys, kind="stable")
+    pair_keys, products = pair_keys[order], products[order]
+    starts = np.flatnonzero(np.concatenate(([True], pair_keys[1:] != pair_keys[:-1])))
+    shared = np.add.reduceat(products, starts)
+    first, second = pair_keys[starts] // count, pair_keys[starts] % count
+
+    weights = np.bincount(entry_rows, weights=values * values, minlength=count)
+    overlap = shared / np.maximum(np.minimum(weights[first], weights[second]), 1e-12)
+    keep = overlap >= threshold
+    return first[keep], second[keep], overlap[keep]
+
+
+# Each task joins the best-matching earlier cluster leader, so matches don't
+# chain across unrelated tasks. Returns the clusters with more than one task.
+def _cluster(first, second, overlap):
+    earlier = {}
+    for a, b, score in zip(first.tolist(), second.tolist(), overlap.tolist()):
+        earlier.setdefault(b, []).append((score, -a))
+    clusters = {}
+    followers = set()
+    for position in sorted(earlier):
+        matches = [match for match in earlier[position] if -match[1] not in followers]
+        if matches:
+            leader = -max(matches)[1]
+            clusters.setdefault(leader, [leader]).append(position)
+            followers.add(position)
+    return list(clusters.values())
+
+
+# One task from a group of mentions: the wording with the most content once filler
+# is stripped, the most specific due date and the most detailed context
+def _merge(group, descriptions):
+    merged = dict(group[0])
+    merged["task"] = max(zip(descriptions, group), key=lambda pair: len(pair[0]))[1].get("task", "")
+    merged["due_date"] = max((task.get("due_date") for task in group), key=due_date_specificity)
+    merged["context"] = max((task.get("context") or "" for task in group), key=len)
+    merged["mentions"] = sum(task.get("mentions", 1) for task in group)
+    return merged
+
+
+# Merge near-duplicate tasks of the same assignee. Returns the tasks in their original
+# order (a merged task takes the place of its first mention) and how many were merged away.
+def merge_duplicate_tasks(tasks, threshold=DUPLICATE_THRESHOLD):
+    tasks = [task for task in tasks if isinstance(task, dict)]
+    if len(tasks) < 2:
+        return tasks, 0
+
+    owners = {}
+    names = {}
+    descriptions = []
+    owner_ids = np.zeros(len(tasks), dtype=np.int64)
+    for position, task in enumerate(tasks):
+        assignee = task.get("assignee") or ""
+        if assignee not in names:
+            names[assignee] = normalize_name(assignee)
+        owner = (task.get("email") or names[assignee] or "unassigned").lower()
+        description, identifiers = _description(task, set(names[assignee].split()))
+        # Only tasks of the same person with the same identifiers are ever compared
+        owner_ids[position] = owners.setdefault((owner, identifiers), len(owners))
+        descriptions.append(description)
+    entry_rows, entry_columns, values = shingle_vectors(descriptions)
+
+    merged_at = {}
+    for members in _cluster(*similar_pairs(owner_ids, entry_rows, entry_columns, values, threshold)):
+        merged_at[members[0]] = members
+        for position in members[1:]:
+            merged_at[position] = None
+
+    result = []
+    for position, task in enumerate(tasks):
+        if position not in merged_at:
+            result.append(task)
+        elif merged_at[position] is not None:
+            members = merged_at[position]
+            result.append(_merge([tasks[member] for member in members], [descriptions[member] for member in members]))
+    return result, len(tasks) - len(result)
@@ -0,0 +1,118 @@
+import re
+
+import pandas as pd
+
+from task_dedup import UNSPECIFIED_DUE_DATES
+
+# Extracted tasks as a pandas DataFrame, for the task table in the app.
+# The frame is indexed by each task's position in the extraction result, so rows
+# edited in a sorted or filtered view map straight back to their task. Due dates
+# are free text ("Friday", "May 12", "next week"); the ones that name a date are
+# parsed into a `due` column relative to the meeting date, which is what overdue
+# counts are based on. Everything here is column operations, so hundreds or
+# thousands of tasks cost about the same as ten.
+
+UNASSIGNED = "Unassigned"
+TASK_COLUMNS = ["task", "assignee", "email", "due_date", "context", "mentions"]
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+WEEKDAY_PATTERN = re.compile(r"\b(" + "|".join(WEEKDAYS) + r")\b", re.IGNORECASE)
+YEAR_PATTERN = re.compile(r"\b\d{4}\b")
+MONTHS = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+# A date inside a longer phrase: "by Friday, May 12", "before 12 May 2023", "due 2023-06-01"
+DATE_PATTERN = re.compile(
+    r"(\d{4}-\d{1,2}-\d{1,2}"
+    rf"|{MONTHS}\s+\d{{1,2}}(?:st|nd|rd|th)?\b(?:,?\s+\d{{4}})?"
+    rf"|\d{{1,2}}(?:st|nd|rd|th)?\s+(?:of\s+)?{MONTHS}(?:,?\s+\d{{4}})?"
+    r"|\d{1,2}/\d{1,2}(?:/\d{2,4})?)",
+    re.IGNORECASE
+)
+
+
+# Dates without a year take the reference year
+def _to_datetime(text, reference):
+    dated = text.where(text.str.contains(YEAR_PATTERN) | text.eq(""), text + f" {reference.year}")
+    return pd.to_datetime(dated, errors="coerce", format="mixed")
+
+
+# Parse free-text due dates. Dates without a year take the meeting's year. A date
+# named anywhere in the text wins over a weekday ("by Friday, May 12" is May 12),
+# and a bare weekday means the first such day after the meeting; anything else is NaT.
+def parse_due_dates(due_dates, meeting_date=None):
+    text = due_dates.fillna("").astype(str).str.strip()
+    # "" and "Not specified" would otherwise parse as January 1 once the year is added
+    text = text.mask(text.str.lower().isin(UNSPECIFIED_DUE_DATES), "")
+    reference = pd.to_datetime(meeting_date, errors="coerce") if meeting_date else pd.NaT
+    if pd.isna(reference):
+        reference = pd.Timestamp.now().normalize()
+
+    due = _to_datetime(text, reference)
+    due = due.fillna(_to_datetime(text.str.extract(DATE_PATTERN, expand=False).fillna(""), reference))
+
+    weekday = text.str.extract(WEEKDAY_PATTERN, expand=False).str.lower().map({day: i for i, day in enumerate(WEEKDAYS)})
+    days_ahead = (weekday - reference.dayofweek - 1) % 7 + 1
+    return due.fillna(reference + pd.to_timedelta(days_ahead, unit="D"))
+
+
+def tasks_frame(tasks, meeting_date=None):
+    frame = pd.DataFrame([task for task in tasks or [] if isinstance(task, dict)], columns=TASK_COLUMNS)
+    frame["task"] = frame["task"].fillna("").astype(str)
+    frame["assignee"] = frame["assignee"].fillna(UNASSIGNED).replace("", UNASSIGNED)
+    frame["email"] = frame["email"].fillna("")
+    frame["due_date"] = frame["due_date"].fillna("").replace("", "Not specified")
+    frame["context"] = frame["context"].fillna("")
+    frame["mentions"] = frame["mentions"].fillna(1).astype(int)
+    frame["due"] = parse_due_dates(frame["due_date"], meeting_date)
+    return frame
+
+
+# Totals and a per-person breakdown (tasks, overdue, next due date), busiest first
+def task_stats(frame, today=None):
+    today = pd.Timestamp(today or pd.Timestamp.now()).normalize()
+    unassigned = frame["assignee"].str.lower().eq(UNASSIGNED.lower())
+    overdue = frame["due"].lt(today)
+    per_person = (
+        frame.assign(overdue=overdue)
+        .groupby("assignee", sort=False)
+        .agg(tasks=("task", "size"), overdue=("overdue", "sum"), next_due=("due", "min"))
+        .sort_values(["tasks", "overdue"], ascending=False)
+        .reset_index()
+    )
+    return {
+        "tasks": len(frame),
+        "people": int(per_person["assignee"].str.lower().ne(UNASSIGNED.lower()).sum()),
+        "overdue": int(overdue.sum()),
+        "with_due_date": int(frame["due"].notna().sum()),
+        "unassigned": int(unassigned.sum()),
+        "unassigned_ratio": float(unassigned.mean()) if len(frame) else 0.0,
+        "per_person": per_person
+    }
+
+
+def filter_tasks(frame, assignees=None, text="", overdue_only=False, today=None):
+    mask = pd.Series(True, index=frame.index)
+    if assignees:
+        mask &= frame["assignee"].isin(assignees)
+    if text:
+        needle = text.strip()
+        mask &= (
+            frame["task"].str.contains(needle, case=False, regex=False)
+            | frame["context"].str.contains(needle, case=False, regex=False)
+        )
+    if overdue_only:
+        mask &= frame["due"].lt(pd.Timestamp(today or pd.Timestamp.now()).normalize())
+    return frame[mask]
+
+
+# Apply assignee edits ({position: new name}) to a copy of the task list, taking the
+# roster's spelling and email. Returns the new list and how many tasks changed.
+def reassign_tasks(tasks, assignees, roster_index):
+    tasks = list(tasks)
+    changed = 0
+    for position, name in assignees.items():
+        participant = None if name == UNASSIGNED else roster_index.resolve(name)
+        assignee, email = (participant["name"], participant["email"]) if participant else (UNASSIGNED, "")
+        task = tasks[position]
+        if (task.get("assignee"), task.get("email") or "") != (assignee, email):
+            tasks[position] = {**task, "assignee": assignee, "email": email}
+            changed += 1
+    return tasks, changed
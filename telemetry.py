@@ -0,0 +1,282 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Lightweight tracing and metrics.
+# span() times a block of work (upload parsing, an LLM call, rendering, a Gmail
+# send, an OAuth step) and record_usage() counts tokens from response.usage.
+# Every finished span updates in-process aggregates, exported in Prometheus text
+# format by prometheus_text(), and is appended as one JSON line to the trace file
+# when one is configured. A span costs ~5us, or ~15us when it is also written to
+# the trace file, so spans go around calls and loops rather than inner loops.
+# With telemetry disabled span() returns a shared no-op context manager.
+#
+# Defaults come from the environment:
+#   MEETING_TELEMETRY=off   disable spans and token counting
+#   MEETING_TRACE_FILE      JSON-lines trace file (no file unless set)
+
+# Histogram buckets in seconds, from parsing a small file to a long LLM call
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Trace lines are flushed in batches; the file is rotated to <path>.1 past this size
+TRACE_FLUSH_LINES = 50
+TRACE_FLUSH_SECONDS = 1.0
+TRACE_MAX_BYTES = 50 * 1024 * 1024
+METRIC_PREFIX = "meeting_monitor"
+
+
+class SpanStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(DURATION_BUCKETS) + 1)
+
+    def add(self, seconds, ok):
+        self.count += 1
+        self.errors += 0 if ok else 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.buckets[bisect_left(DURATION_BUCKETS, seconds)] += 1
+
+
+class Span:
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+
+    # Attach details only known once the work is under way, e.g. a status code
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+class _NullSpan:
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Telemetry:
+    def __init__(self, enabled=True, trace_path=None, max_trace_bytes=TRACE_MAX_BYTES):
+        self.enabled = enabled
+        self.trace_path = trace_path
+        self.max_trace_bytes = max_trace_bytes
+        self.spans = {}
+        self.tokens = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def span(self, name, **attributes):
+        if not self.enabled:
+            return NULL_SPAN
+        return self._span(name, attributes)
+
+    @contextmanager
+    def _span(self, name, attributes):
+        span = Span(name, attributes)
+        start_time = time.time()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._finish(span, start_time, time.perf_counter() - start, error)
+
+    def _finish(self, span, start_time, seconds, error):
+        record = None
+        if self.trace_path:
+            record = {'ts': round(start_time, 6), 'span': span.name, 'seconds': round(seconds, 6), 'ok': error is None}
+            if span.attributes:
+                record.update(span.attributes)
+            if error is not None:
+                record['error'] = f"{type(error).__name__}: {error}"[:300]
+        with self._lock:
+            stats = self.spans.get(span.name)
+            if stats is None:
+                stats = self.spans[span.name] = SpanStats()
+            stats.add(seconds, error is None)
+            if record is not None:
+                self._pending.append(record)
+                if len(self._pending) >= TRACE_FLUSH_LINES or time.monotonic() - self._last_flush > TRACE_FLUSH_SECONDS:
+                    self._flush_locked()
+
+    # Token counts from an OpenAI-style usage object (or dict); missing usage is ignored
+    def record_usage(self, model, usage):
+        if not self.enabled or usage is None:
+            return
+        if isinstance(usage, dict):
+            prompt, completion = usage.get('prompt_tokens'), usage.get('completion_tokens')
+        else:
+            prompt, completion = getattr(usage, 'prompt_tokens', None), getattr(usage, 'completion_tokens', None)
+        with self._lock:
+            counts = self.tokens.setdefault(model or "unknown", {'prompt': 0, 'completion': 0, 'calls': 0})
+            counts['prompt'] += prompt or 0
+            counts['completion'] += completion or 0
+            counts['calls'] += 1
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if not self._pending or not self.trace_path:
+            self._pending = []
+            return
+        lines = "".join(json.dumps(record, default=str) + "\n" for record in self._pending)
+        self._pending = []
+        try:
+            if os.path.exists(self.trace_path) and os.path.getsize(self.trace_path) > self.max_trace_bytes:
+                os.replace(self.trace_path, self.trace_path + ".1")
+            with open(self.trace_path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+        except OSError as e:
+            # Tracing must never take the app down
+            print(f"Could not write trace file: {str(e)}")
+
+    def reset(self):
+        with self._lock:
+            self.spans = {}
+            self.tokens = {}
+            self._pending = []
+
+    # Plain-dict view of the aggregates, for the diagnostics panel and batch output
+    def snapshot(self):
+        with self._lock:
+            spans = {
+                name: {
+                    'count': stats.count,
+                    'errors': stats.errors,
+                    'total_seconds': stats.seconds,
+                    'mean_seconds': stats.seconds / stats.count if stats.count else 0.0,
+                    'max_seconds': stats.max_seconds
+                }
+                for name, stats in sorted(self.spans.items())
+            }
+            tokens = {model: dict(counts) for model, counts in sorted(self.tokens.items())}
+        return {'enabled': self.enabled, 'spans': spans, 'tokens': tokens}
+
+    def prometheus_text(self):
+        lines = []
+        with self._lock:
+            spans = sorted(
+                (name, stats.count, stats.errors, stats.seconds, list(stats.buckets)) for name, stats in self.spans.items()
+            )
+            tokens = sorted((model, dict(counts)) for model, counts in self.tokens.items())
+
+        duration = f"{METRIC_PREFIX}_span_duration_seconds"
+        lines.append(f"# HELP {duration} Duration of traced operations.")
+        lines.append(f"# TYPE {duration} histogram")
+        for name, count, _, seconds, buckets in spans:
+            label = f'span="{escape_label(name)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(DURATION_BUCKETS, buckets):
+                cumulative += bucket_count
+                lines.append(f'{duration}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{duration}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"{duration}_sum{{{label}}} {seconds:.6f}")
+            lines.append(f"{duration}_count{{{label}}} {count}")
+
+        errors = f"{METRIC_PREFIX}_span_errors_total"
+        lines.append(f"# HELP {errors} Traced operations that raised.")
+        lines.append(f"# TYPE {errors} counter")
+        for name, _, error_count, _, _ in spans:
+            lines.append(f'{errors}{{span="{escape_label(name)}"}} {error_count}')
+
+        token_metric = f"{METRIC_PREFIX}_llm_tokens_total"
+        lines.append(f"# HELP {token_metric} LLM tokens reported in response usage.")
+        lines.append(f"# TYPE {token_metric} counter")
+        for model, counts in tokens:
+            for kind in ('prompt', 'completion'):
+                lines.append(f'{token_metric}{{model="{escape_label(model)}",kind="{kind}"}} {counts[kind]}')
+
+        calls = f"{METRIC_PREFIX}_llm_calls_total"
+        lines.append(f"# HELP {calls} LLM calls that reported usage.")
+        lines.append(f"# TYPE {calls} counter")
+        for model, counts in tokens:
+            lines.append(f'{calls}{{model="{escape_label(model)}"}} {counts["calls"]}')
+        return "\n".join(lines) + "\n"
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# Process-wide instance used by the module-level helpers below
+telemetry = Telemetry(
+    enabled=os.environ.get('MEETING_TELEMETRY', 'on').lower() not in ('off', '0', 'false', 'no'),
+    trace_path=os.environ.get('MEETING_TRACE_FILE') or None
+)
+# Buffered trace lines are written on the next span after TRACE_FLUSH_SECONDS, or at exit
+atexit.register(telemetry.flush)
+
+
+def configure(enabled=None, trace_path=None):
+    if enabled is not None:
+        telemetry.enabled = enabled
+    if trace_path is not None:
+        telemetry.flush()
+        telemetry.trace_path = trace_path or None
+
+
+def span(name, **attributes):
+    return telemetry.span(name, **attributes)
+
+
+def record_usage(model, usage):
+    telemetry.record_usage(model, usage)
+
+
+# Decorator form of span() for functions that are traced as a whole
+def traced(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with telemetry.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Serve prometheus_text() at /metrics on a background thread, for deployments
+# where the app itself can't expose an HTTP route (Streamlit can't)
+def start_metrics_server(port, host='127.0.0.1'):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.rstrip('/') != '/metrics':
+                self.send_error(404)
+                return
+            body = telemetry.prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
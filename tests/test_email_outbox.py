@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+from email_outbox import UNKNOWN_DELIVERY_ERROR, EmailOutbox, OutboxSender
+from gmail_delivery import FakeGmailService, FakeHttpError, TokenBucket, build_raw_message
+
+# Run from the repository root: python -m unittest discover tests
+
+MEETING = "meeting-1"
+MESSAGES = [
+    {"to": "ahmed@example.com", "subject": "Your tasks", "html": "<p>Projections</p>"},
+    {"to": "sarah@example.com", "subject": "Your tasks", "html": "<p>Budget</p>"}
+]
+
+
+# Gmail whose Sent-folder search is down
+class LookupFailingGmailService(FakeGmailService):
+    def list(self, userId, q=""):
+        raise FakeHttpError(503)
+
+
+class EmailOutboxTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.outbox = EmailOutbox(os.path.join(self.tmp.name, "outbox.sqlite3"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sender(self, service):
+        return OutboxSender(self.outbox, lambda: service, max_workers=2, rate_limiter=TokenBucket(1000, 1000))
+
+    # Claim everything with a lease that has already run out, as if the sender died mid-send
+    def claim_and_crash(self, service=None):
+        batch = self.outbox.claim(lease_seconds=-1)
+        if service is not None:
+            for message in batch:
+                raw = build_raw_message(message["to"], message["subject"], message["html"], message["message_id"])
+                service.users().messages().send(userId="me", body={"raw": raw}).execute()
+        return batch
+
+    def test_double_enqueue_sends_once(self):
+        self.assertEqual(self.outbox.enqueue(MEETING, MESSAGES), {"queued": 2, "duplicates": 0})
+        self.assertEqual(self.outbox.enqueue(MEETING, MESSAGES), {"queued": 0, "duplicates": 2})
+        service = FakeGmailService()
+        self.assertEqual(self.sender(service).drain().sent, 2)
+        self.assertEqual(self.sender(service).drain().total, 0)
+        self.assertEqual(len(service.sent), 2)
+        self.assertEqual(self.outbox.status(MEETING)["sent"], 2)
+
+    def test_reclaimed_message_found_in_sent_is_not_resent(self):
+        self.outbox.enqueue(MEETING, MESSAGES)
+        service = FakeGmailService()
+        self.claim_and_crash(service)
+        report = self.sender(service).drain()
+        self.assertEqual((report.sent, report.failed), (2, 0))
+        self.assertEqual(len(service.sent), 2)
+        self.assertEqual(self.outbox.status(MEETING)["sent"], 2)
+
+    def test_reclaim_with_failed_lookup_is_marked_failed_not_resent(self):
+        self.outbox.enqueue(MEETING, MESSAGES)
+        self.claim_and_crash()
+        service = LookupFailingGmailService()
+        report = self.sender(service).drain()
+        self.assertEqual((report.sent, report.failed), (0, 2))
+        self.assertEqual(service.sent, [])
+        self.assertEqual(self.outbox.status(MEETING)["failed"], 2)
+        self.assertEqual({f["error"] for f in self.outbox.failures(MEETING)}, {UNKNOWN_DELIVERY_ERROR})
+
+    def test_manual_retry_sends_without_lookup(self):
+        self.outbox.enqueue(MEETING, MESSAGES)
+        self.claim_and_crash()
+        service = LookupFailingGmailService()
+        self.sender(service).drain()
+        self.assertEqual(self.outbox.retry_failed(MEETING), 2)
+        report = self.sender(service).drain()
+        self.assertEqual((report.sent, report.failed), (2, 0))
+        self.assertEqual(len(service.sent), 2)
+        self.assertEqual(self.outbox.status(MEETING)["sent"], 2)
+
+    def test_sender_whose_lease_was_taken_over_cannot_settle(self):
+        self.outbox.enqueue(MEETING, MESSAGES[:1])
+        [stale] = self.outbox.claim(lease_seconds=-1)
+        [current] = self.outbox.claim()
+        self.assertFalse(self.outbox.mark_failed(stale, "timed out"))
+        self.assertFalse(self.outbox.mark_sent(stale, "gmail-1"))
+        self.assertEqual(self.outbox.status(MEETING)["sending"], 1)
+        self.assertTrue(self.outbox.mark_sent(current, "gmail-2"))
+        self.assertFalse(self.outbox.mark_failed(current, "late error"))
+        self.assertEqual(self.outbox.status(MEETING)["sent"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from llm_backend import LLMBackend, backend_from_env
+
+# Run from the repository root: python -m unittest discover tests
+
+READERS = 4
+MESSAGES = [{"role": "user", "content": "Summarize the meeting"}]
+
+
+# Upstream client whose calls block until released, so concurrent callers overlap
+class GatedClient:
+    def __init__(self, chunks=("a", "b", "c"), error=None):
+        self.chunks = chunks
+        self.error = error
+        self.calls = 0
+        self.first_chunk_sent = threading.Event()
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, stream=False, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if stream:
+            return self._stream()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(text="response", usage=None)
+
+    def _stream(self):
+        for position, chunk in enumerate(self.chunks):
+            if position == 1:
+                self.first_chunk_sent.set()
+                self.release.wait(5)
+            yield chunk
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for callers to overlap")
+        time.sleep(0.001)
+
+
+# Call func from READERS threads at once; returns each thread's result or exception
+def run_concurrently(func):
+    outcomes = [None] * READERS
+
+    def run(index):
+        try:
+            outcomes[index] = func()
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(READERS)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def join(threads):
+    for thread in threads:
+        thread.join(5)
+
+
+class LLMBackendCoalescingTest(unittest.TestCase):
+    def test_concurrent_identical_calls_share_one_upstream_call(self):
+        client = GatedClient()
+        backend = LLMBackend(client)
+        threads, outcomes = run_concurrently(lambda: backend.chat.completions.create(model="m", messages=MESSAGES))
+        wait_until(lambda: backend.stats()["coalesced_requests"] == READERS - 1)
+        client.release.set()
+        join(threads)
+        self.assertEqual(client.calls, 1)
+        self.assertTrue(all(outcome is outcomes[0] for outcome in outcomes))
+        self.assertEqual(outcomes[0].text, "response")
+
+    def test_upstream_error_reaches_every_waiter(self):
+        client = GatedClient(error=RuntimeError("rate limited"))
+        backend = LLMBackend(client)
+        threads, outcomes = run_concurrently(lambda: backend.chat.completions.create(model="m", messages=MESSAGES))
+        wait_until(lambda: backend.stats()["coalesced_requests"] == READERS - 1)
+        client.release.set()
+        join(threads)
+        self.assertEqual(client.calls, 1)
+        self.assertTrue(all(isinstance(outcome, RuntimeError) for outcome in outcomes))
+
+    def test_late_stream_reader_gets_every_chunk(self):
+        client = GatedClient()
+        backend = LLMBackend(client)
+        first = backend.chat.completions.create(model="m", messages=MESSAGES, stream=True)
+        self.assertEqual(next(first), "a")
+        client.first_chunk_sent.wait(5)
+        late = backend.chat.completions.create(model="m", messages=MESSAGES, stream=True)
+        client.release.set()
+        self.assertEqual(["a"] + list(first), ["a", "b", "c"])
+        self.assertEqual(list(late), ["a", "b", "c"])
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(backend.stats()["coalesced_streams"], 1)
+
+    def test_coalescing_off_sends_every_call_upstream(self):
+        client = GatedClient()
+        backend = LLMBackend(client, coalesce=False)
+        threads, outcomes = run_concurrently(lambda: backend.chat.completions.create(model="m", messages=MESSAGES))
+        wait_until(lambda: client.calls == READERS)
+        client.release.set()
+        join(threads)
+        self.assertEqual(backend.stats()["coalesced_requests"], 0)
+        self.assertEqual(backend.coalesce("key", lambda: "work"), ("work", False))
+
+    def test_coalesce_setting_from_environment(self):
+        for value, expected in [(None, True), ("off", False), ("OFF", False), (False, False), ("on", True)]:
+            environ = {"LLM_BACKEND": "fake"} if value is None else {"LLM_BACKEND": "fake", "LLM_COALESCE": value}
+            self.assertEqual(backend_from_env(environ=environ).coalesce_requests, expected, value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+import meeting_analysis
+from fake_llm import FakeLLMClient
+from meeting_analysis import chunk_transcript, generate_meeting_summary, stream_meeting_summary, summarize_chunks
+
+# Run from the repository root: python -m unittest discover tests
+
+NO_TRANSCRIPT = "No transcript provided for summarization."
+
+
+class SummaryChunkingTest(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeLLMClient()
+        meeting_analysis.configure(self.client)
+
+    def tearDown(self):
+        meeting_analysis.configure(None)
+
+    def test_whitespace_transcript_has_no_chunks(self):
+        self.assertEqual(chunk_transcript("  \n\t\n "), [])
+        self.assertEqual(summarize_chunks([]), [])
+
+    def test_whitespace_transcript_is_not_summarized(self):
+        metrics = {}
+        self.assertEqual(generate_meeting_summary(" \n ", chunked=True), NO_TRANSCRIPT)
+        self.assertEqual("".join(stream_meeting_summary(" \n ", chunked=True, metrics=metrics)), NO_TRANSCRIPT)
+        self.assertNotIn("error", metrics)
+        self.assertEqual(self.client.calls, 0)
+
+    def test_long_transcript_is_chunked_with_every_turn(self):
+        turns = [f"Speaker {i % 3}: point number {i} " + "detail " * 40 for i in range(200)]
+        chunks = chunk_transcript("\n".join(turns), max_tokens=500, overlap_tokens=50)
+        self.assertGreater(len(chunks), 1)
+        joined = "\n".join(chunks)
+        self.assertTrue(all(f"point number {i} " in joined for i in range(200)))
+
+
+if __name__ == "__main__":
+    unittest.main()
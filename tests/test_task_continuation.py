@@ -0,0 +1,87 @@
+import json
+import unittest
+from unittest import mock
+
+import meeting_analysis
+from fake_llm import FakeLLMClient
+from meeting_analysis import request_tasks, salvage_tasks
+
+# Run from the repository root: python -m unittest discover tests
+
+REPORTS = 12
+TRANSCRIPT = "\n".join(f"Alex: Ahmed, please prepare report number {i} for the board." for i in range(REPORTS))
+MESSAGES = [{"role": "user", "content": f"""Meeting Transcript:
+{TRANSCRIPT}
+
+Team Members (ONLY these people can be assigned tasks):
+- Ahmed Khan: ahmed@example.com (Finance)
+- Alex Lee: alex@example.com (Management)
+
+If someone is mentioned in the transcript but isn't in this team list, DO NOT assign tasks to them."""}]
+
+
+def task(i):
+    return {"task": f"prepare report number {i}", "assignee": "Ahmed Khan", "due_date": "Not specified", "context": ""}
+
+
+class SalvageTasksTest(unittest.TestCase):
+    def test_keeps_complete_tasks_before_the_cut(self):
+        content = json.dumps({"tasks": [task(0), task(1), task(2)]})
+        cut = content[:content.index('"prepare report number 2"') + 5]
+        self.assertEqual(salvage_tasks(cut), [task(0), task(1)])
+
+    def test_cut_between_tasks(self):
+        content = json.dumps({"tasks": [task(0), task(1)]})
+        self.assertEqual(salvage_tasks(content[:content.index("}") + 2]), [task(0)])
+
+    def test_nothing_to_salvage(self):
+        for content in ['{"tas', '{"tasks": [', '{"tasks": [{"task": "prep', "", None]:
+            self.assertEqual(salvage_tasks(content), [], content)
+
+    def test_complete_response(self):
+        self.assertEqual(salvage_tasks(json.dumps({"tasks": [task(0)]})), [task(0)])
+
+
+class RequestTasksTest(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeLLMClient()
+        meeting_analysis.configure(self.client)
+
+    def tearDown(self):
+        meeting_analysis.configure(None)
+
+    def reports(self, tasks):
+        return [t["task"] for t in tasks]
+
+    def test_large_budget_needs_one_call(self):
+        tasks, output = request_tasks(MESSAGES, 4000)
+        self.assertEqual(self.reports(tasks), [f"prepare report number {i} for the board" for i in range(REPORTS)])
+        self.assertEqual((output["continuations"], output["truncated"]), (0, False))
+        self.assertEqual(self.client.calls, 1)
+
+    def test_cut_off_responses_are_continued(self):
+        expected, _ = request_tasks(MESSAGES, 4000)
+        tasks, output = request_tasks(MESSAGES, 150)
+        self.assertEqual(tasks, expected)
+        self.assertGreater(output["continuations"], 0)
+        self.assertFalse(output["truncated"])
+        self.assertEqual(output["max_tokens"], 150)
+
+    def test_budget_too_small_for_one_task_is_raised(self):
+        expected, _ = request_tasks(MESSAGES, 4000)
+        tasks, output = request_tasks(MESSAGES, 20)
+        self.assertGreater(output["max_tokens"], 20)
+        self.assertTrue(tasks)
+        self.assertEqual(tasks, expected[:len(tasks)])
+
+    def test_continuation_limit_keeps_what_was_salvaged(self):
+        with mock.patch.object(meeting_analysis, "TASK_MAX_CONTINUATIONS", 1):
+            tasks, output = request_tasks(MESSAGES, 150)
+        self.assertTrue(output["truncated"])
+        self.assertEqual(output["continuations"], 1)
+        self.assertTrue(0 < len(tasks) < REPORTS)
+        self.assertEqual(len({t["task"] for t in tasks}), len(tasks))
+
+
+if __name__ == "__main__":
+    unittest.main()
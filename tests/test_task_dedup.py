@@ -0,0 +1,64 @@
+import unittest
+
+from task_dedup import merge_duplicate_tasks
+
+# Run from the repository root: python -m unittest discover tests
+
+
+def task(text, assignee="Ahmed Khan", due_date="Not specified", context=""):
+    return {
+        "task": text,
+        "assignee": assignee,
+        "email": f"{assignee.split()[0].lower()}@example.com",
+        "due_date": due_date,
+        "context": context
+    }
+
+
+class MergeDuplicateTasksTest(unittest.TestCase):
+    def test_restatements_merge_keeping_most_specific_details(self):
+        tasks = [
+            task("Prepare the financial projections"),
+            task("Share the campaign budget with the team", assignee="Sarah Smith"),
+            task("Ahmed, we need those projections before Monday", due_date="May 12", context="Asked again at the end")
+        ]
+        merged, count = merge_duplicate_tasks(tasks)
+        self.assertEqual(count, 1)
+        self.assertEqual([t["assignee"] for t in merged], ["Ahmed Khan", "Sarah Smith"])
+        self.assertEqual(merged[0]["due_date"], "May 12")
+        self.assertEqual(merged[0]["context"], "Asked again at the end")
+        self.assertEqual(merged[0]["mentions"], 2)
+
+    def test_same_task_for_different_assignees_is_kept(self):
+        tasks = [task("Review the hiring plan"), task("Review the hiring plan", assignee="Sarah Smith")]
+        self.assertEqual(merge_duplicate_tasks(tasks)[1], 0)
+
+    def test_tasks_without_any_shingle(self):
+        tasks = [{"task": "Do it", "assignee": "Ahmed"}, {"task": "Do this by Friday", "assignee": "Sarah"}]
+        self.assertEqual(merge_duplicate_tasks(tasks), (tasks, 0))
+
+    def test_different_quarters_are_not_merged(self):
+        tasks = [task("Review the Q3 budget"), task("Review the Q4 budget")]
+        self.assertEqual(merge_duplicate_tasks(tasks)[1], 0)
+
+    def test_different_invoice_numbers_are_not_merged(self):
+        tasks = [task(f"Send invoice #{number} to the client") for number in (1041, 1042, 1043)]
+        self.assertEqual(merge_duplicate_tasks(tasks)[1], 0)
+
+    def test_numbered_reports_are_not_merged(self):
+        tasks = [task(f"Prepare report number {i}") for i in range(120)]
+        self.assertEqual(len(merge_duplicate_tasks(tasks)[0]), 120)
+
+    def test_same_identifier_still_merges(self):
+        tasks = [task("Send invoice #1041 to the client"), task("Ahmed, please send invoice 1041", due_date="Friday")]
+        merged, count = merge_duplicate_tasks(tasks)
+        self.assertEqual(count, 1)
+        self.assertEqual(merged[0]["due_date"], "Friday")
+
+    def test_date_numbers_are_not_identifiers(self):
+        tasks = [task("Send the updated roadmap"), task("Send the updated roadmap by May 12")]
+        self.assertEqual(merge_duplicate_tasks(tasks)[1], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from task_table import task_stats, tasks_frame
+
+# Run from the repository root: python -m unittest discover tests
+
+MEETING_DATE = "May 4, 2023"
+
+
+class TaskTableTest(unittest.TestCase):
+    def test_due_dates_relative_to_meeting(self):
+        frame = tasks_frame(
+            [{"task": "a", "due_date": "May 12"}, {"task": "b", "due_date": "Friday"}, {"task": "c", "due_date": "2023-06-01"}],
+            MEETING_DATE
+        )
+        self.assertEqual([str(due.date()) for due in frame["due"]], ["2023-05-12", "2023-05-05", "2023-06-01"])
+
+    def test_explicit_date_wins_over_weekday(self):
+        frame = tasks_frame(
+            [{"task": "a", "due_date": "by Friday, May 12"}, {"task": "b", "due_date": "before 20 May 2023"}, {"task": "c", "due_date": "by Monday"}],
+            MEETING_DATE
+        )
+        self.assertEqual([str(due.date()) for due in frame["due"]], ["2023-05-12", "2023-05-20", "2023-05-08"])
+
+    def test_unspecified_due_dates_are_never_overdue(self):
+        frame = tasks_frame(
+            [{"task": "a", "due_date": ""}, {"task": "b", "due_date": "Not specified"}, {"task": "c"}],
+            MEETING_DATE
+        )
+        self.assertTrue(frame["due"].isna().all())
+        self.assertEqual(task_stats(frame, "2023-05-05")["overdue"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import re
+import unicodedata
+from array import array
+
+# Compact speaker-turn model of a transcript, plus a local pre-filter that picks
+# out the turns likely to contain action items.
+#
+# Turns are stored column-wise in arrays (speaker id, start/end offsets into the
+# original text, timestamp) rather than as one object per turn, so a 500k-word
+# transcript costs a few bytes per turn on top of the text itself.
+
+# Optional "[00:12:34]" / "00:12:34" / "12:34" timestamp, then "Name:" or "Name (Role):"
+TURN_PATTERN = re.compile(
+    r"^[ \t]*(?:\[?(?P<ts>\d{1,2}:\d{2}(?::\d{2})?)\]?[ \t]+)?"
+    r"(?P<speaker>[A-Z][\w .'\-]{0,60}?)(?:[ \t]*\([^)\n]{0,60}\))?:[ \t]+",
+    re.MULTILINE
+)
+NO_TIMESTAMP = -1.0
+
+
+def parse_timestamp(value):
+    seconds = 0
+    for part in value.split(':'):
+        seconds = seconds * 60 + int(part)
+    return float(seconds)
+
+
+class Transcript:
+    def __init__(self, text):
+        self.text = text
+        self.speaker_names = []
+        self.speaker_ids = array('i')
+        self.starts = array('q')
+        self.body_starts = array('q')
+        self.ends = array('q')
+        self.timestamps = array('d')
+
+        speaker_lookup = {}
+        matches = list(TURN_PATTERN.finditer(text))
+        # Anything before the first speaker line (title, date, attendees) is an unattributed turn
+        first_start = matches[0].start() if matches else len(text)
+        if text[:first_start].strip():
+            self._append(speaker_lookup, "", 0, 0, first_start, NO_TIMESTAMP)
+
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            timestamp = parse_timestamp(match.group('ts')) if match.group('ts') else NO_TIMESTAMP
+            self._append(speaker_lookup, match.group('speaker').strip(), match.start(), match.end(), end, timestamp)
+
+    def _append(self, speaker_lookup, speaker, start, body_start, end, timestamp):
+        if speaker not in speaker_lookup:
+            speaker_lookup[speaker] = len(self.speaker_names)
+            self.speaker_names.append(speaker)
+        self.speaker_ids.append(speaker_lookup[speaker])
+        self.starts.append(start)
+        self.body_starts.append(body_start)
+        self.ends.append(end)
+        self.timestamps.append(timestamp)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def speaker(self, index):
+        return self.speaker_names[self.speaker_ids[index]]
+
+    def timestamp(self, index):
+        value = self.timestamps[index]
+        return None if value == NO_TIMESTAMP else value
+
+    # Full text of the turn, including the "Name:" prefix
+    def turn_text(self, index):
+        return self.text[self.starts[index]:self.ends[index]]
+
+    # What was said, without the timestamp and "Name:" prefix
+    def body_text(self, index):
+        return self.text[self.body_starts[index]:self.ends[index]]
+
+    def turns(self):
+        for index in range(len(self)):
+            yield self.speaker(index), self.starts[index], self.timestamp(index), self.turn_text(index)
+
+
+# Signals used by the pre-filter, matched as lowercase words and word pairs rather
+# than regexes so the whole transcript is scored with a handful of set operations
+# per turn. Commitments and requests make a turn a candidate; dates and roster
+# mentions only add weight.
+COMMITMENT_WORDS = {"i'll", "we'll", "must", "deadline", "deliver", "deliverable", "owner", "assign", "assigned"}
+COMMITMENT_PAIRS = {
+    ("i", "will"), ("we", "will"), ("going", "to"), ("need", "to"), ("needs", "to"), ("have", "to"),
+    ("action", "item"), ("action", "items"), ("follow", "up"), ("take", "care"), ("responsible", "for"),
+    ("will", "send"), ("will", "prepare"), ("will", "share"), ("will", "finalize"), ("will", "review"),
+    ("will", "draft"), ("will", "update"), ("will", "schedule"), ("will", "handle"), ("will", "own")
+}
+REQUEST_WORDS = {"please", "you'll"}
+REQUEST_PAIRS = {
+    ("can", "you"), ("could", "you"), ("would", "you"), ("will", "you"), ("you", "will"), ("you", "need"),
+    ("you", "should"), ("make", "sure"), ("need", "you"), ("let's", "have")
+}
+# "may" and "march" are left out: as verbs they are far more common than as months
+DATE_WORDS = {
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday", "today", "tonight",
+    "tomorrow", "eod", "eow", "asap", "january", "february", "april", "june", "july", "august",
+    "september", "october", "november", "december", "q1", "q2", "q3", "q4"
+}
+DATE_PAIRS = {
+    ("next", "week"), ("next", "month"), ("next", "quarter"), ("end", "of"), ("by", "the")
+}
+NUMERIC_DATE_PATTERN = re.compile(r"\b\d{1,2}/\d{1,2}\b")
+# Punctuation becomes whitespace, except apostrophes which are part of "I'll" and "you'll"
+WORD_TRANSLATION = str.maketrans({ch: " " for ch in "!\"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\u201c\u201d"})
+WORD_TRANSLATION[ord("\u2019")] = "'"
+
+CANDIDATE_SCORE = 2
+CONTEXT_TURNS = 1
+
+
+def turn_words(text):
+    if not text.isascii():
+        # Strip accents the same way roster names are normalized: "José" -> "jose"
+        text = "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+    return text.lower().translate(WORD_TRANSLATION).split()
+
+
+def score_words(words, roster_tokens=None):
+    word_set = set(words)
+    pairs = set(zip(words, words[1:]))
+    score = 0
+    if not COMMITMENT_WORDS.isdisjoint(word_set) or not COMMITMENT_PAIRS.isdisjoint(pairs):
+        score += 2
+    if not REQUEST_WORDS.isdisjoint(word_set) or not REQUEST_PAIRS.isdisjoint(pairs):
+        score += 2
+    if not DATE_WORDS.isdisjoint(word_set) or not DATE_PAIRS.isdisjoint(pairs):
+        score += 1
+    if roster_tokens and not roster_tokens.isdisjoint(word.replace("'", "") for word in word_set):
+        score += 1
+    return score
+
+
+# Score what was said in a turn. Callers pass the body without the "Name:" prefix,
+# so speaking doesn't count as being mentioned.
+def score_turn(text, roster_index=None):
+    roster_tokens = roster_index.by_token.keys() if roster_index is not None else None
+    score = score_words(turn_words(text), roster_tokens)
+    if score < 1 and NUMERIC_DATE_PATTERN.search(text):
+        score += 1
+    return score
+
+
+# Turn ranges [start, end) around candidate turns, with context, merged where they overlap
+def select_candidate_spans(transcript, roster_index=None, context_turns=CONTEXT_TURNS, min_score=CANDIDATE_SCORE):
+    spans = []
+    for index in range(len(transcript)):
+        if score_turn(transcript.body_text(index), roster_index) < min_score:
+            continue
+        start = max(0, index - context_turns)
+        end = min(len(transcript), index + context_turns + 1)
+        if spans and start <= spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], end)
+        else:
+            spans.append([start, end])
+    return [tuple(span) for span in spans]
+
+
+# Reassemble the selected spans, marking skipped stretches of the meeting
+def build_candidate_text(transcript, spans):
+    parts = []
+    previous_end = 0
+    for start, end in spans:
+        if start > previous_end:
+            parts.append("[...]")
+        parts.append(transcript.text[transcript.starts[start]:transcript.ends[end - 1]].strip())
+        previous_end = end
+    if previous_end < len(transcript):
+        parts.append("[...]")
+    return "\n".join(parts)
+
+
+def prefilter_transcript(text, roster_index=None):
+    transcript = Transcript(text)
+    return build_candidate_text(transcript, select_candidate_spans(transcript, roster_index))